@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import inspect
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+from .cases import CASES
+
+# Results of a reference run; a case fails when its ops/sec drops below baseline * (1 - tolerance)
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_ITERATIONS = 20_000
+DEFAULT_MAX_TIME = 2.0 # seconds per case
+WARMUP = 100
+
+# Time each call individually (after a warm-up), returning the latencies in nanoseconds.
+# Slow cases stop early once they have used up their time budget.
+async def measure(op, iterations: int, max_time: float) -> list[int]:
+    clock = time.perf_counter_ns
+    deadline = clock() + int(max_time * 1e9)
+    samples = []
+    append = samples.append
+
+    if inspect.iscoroutinefunction(op):
+        for _ in range(WARMUP):
+            await op()
+        for _ in range(iterations):
+            start = clock()
+            await op()
+            end = clock()
+            append(end - start)
+            if end > deadline:
+                break
+    else:
+        for _ in range(WARMUP):
+            op()
+        for _ in range(iterations):
+            start = clock()
+            op()
+            end = clock()
+            append(end - start)
+            if end > deadline:
+                break
+    return samples
+
+def percentile(samples: list[int], q: float) -> float:
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+def summarize(samples: list[int]) -> dict:
+    samples.sort()
+    return {
+        "ops_per_sec": round(len(samples) / (sum(samples) / 1e9), 1),
+        "p50_us": round(percentile(samples, 0.50) / 1e3, 3),
+        "p99_us": round(percentile(samples, 0.99) / 1e3, 3),
+    }
+
+# Results of a baseline file (None if it is missing or unreadable)
+def load_baseline(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text())["results"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+async def run(args) -> int:
+    # Baselines are machine-specific, so none is committed: comparing without one is an error
+    baseline = {}
+    if not args.save and not args.no_compare:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(
+                f"No usable baseline at {args.baseline}. Record one on this machine with "
+                "`python -m benchmarks --save`, or pass --no-compare to only report results.", file=sys.stderr)
+            return 2
+
+    results = {}
+    regressions = []
+    unmatched = []
+
+    print(f"{'case':<36} {'ops/sec':>12} {'p50 µs':>10} {'p99 µs':>10} {'vs baseline':>12}")
+    for name, setup in CASES.items():
+        if args.filter and args.filter not in name:
+            continue
+
+        result = summarize(await measure(setup(), args.iterations, args.max_time))
+        results[name] = result
+
+        change = ""
+        if baseline and name not in baseline:
+            unmatched.append(name)
+            change = "new"
+        elif name in baseline:
+            ratio = result["ops_per_sec"] / baseline[name]["ops_per_sec"]
+            change = f"{ratio - 1:+.1%}"
+            if ratio < 1 - args.tolerance:
+                regressions.append(name)
+                change += " !"
+        print(f"{name:<36} {result['ops_per_sec']:>12,.0f} {result['p50_us']:>10.2f} {result['p99_us']:>10.2f} {change:>12}")
+
+    if args.save:
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "iterations": args.iterations,
+            "results": results,
+        }, indent=2) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+    elif unmatched:
+        print(f"\n{len(unmatched)} case(s) not in the baseline (run with --save to add them): " + ", ".join(unmatched))
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}: " + ", ".join(regressions))
+        return 1
+    return 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Micro-benchmarks for the tourney and PUG hot paths")
+    parser.add_argument("-k", "--filter", help="only run cases whose name contains this string")
+    parser.add_argument("-n", "--iterations", type=int, default=DEFAULT_ITERATIONS, help="timed calls per case")
+    parser.add_argument("--max-time", type=float, default=DEFAULT_MAX_TIME, help="time budget per case in seconds")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline results file")
+    parser.add_argument("--save", action="store_true", help="record this run as the new baseline")
+    parser.add_argument("--no-compare", action="store_true", help="only report results, without a baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown before a case fails")
+    return asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    sys.exit(main())
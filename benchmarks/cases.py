@@ -0,0 +1,203 @@
+import itertools
+import random
+import tempfile
+from pathlib import Path
+
+import cogs.pug as pug
+import cogs.tourney as tourney
+from cogs.utils.selection import BAN, SelectionState
+from cogs.utils.store import StateStore
+
+from .fakes import Interaction, next_id
+from .synthetic import member_with_roles, synthetic_tournament
+
+# Size of the synthetic data the cases run against
+MAPS = 500
+TEAMS = 300
+MEMBER_ROLES = 200
+QUEUE_SIZE = 1000
+
+# Benchmark cases by name; each setup function returns the operation to time (a function or coroutine function)
+CASES = {}
+
+def case(name: str):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+# Registry stand-in that serves the synthetic tournament for every pool name
+class SyntheticRegistry:
+    def __init__(self, tournament):
+        self.tournament = tournament
+        self.pool_choices = tournament.pool_choices
+
+    def get(self, name):
+        return self.tournament
+
+_tournament = None
+
+def tournament():
+    global _tournament
+    if _tournament is None:
+        _tournament = synthetic_tournament(MAPS, TEAMS)
+    return _tournament
+
+# Cycle through inputs so every call does not hit the same dict slot
+def cycle(values):
+    values = list(values)
+    random.Random(0).shuffle(values)
+    return itertools.cycle(values).__next__
+
+# Selection state that has reached the given number of turns (1 = ban phase, 3 = pick phase)
+def selection_channel(turns: int) -> int:
+    t = tournament()
+    team1, team2 = list(t.teams)[:2]
+    selection_state = SelectionState.start(t, team1, team2, team1)
+    selection_state.set_ban_order(team1)
+    standard_maps = [key for key, info in t.maps.items() if info.map_pool == "Standard"]
+    for map_key in standard_maps[:turns - 1]:
+        if selection_state.phase == BAN:
+            selection_state.ban(map_key)
+        else:
+            selection_state.pick(map_key)
+
+    channel_id = next_id()
+    tourney.state_handler[channel_id] = selection_state
+    return channel_id
+
+# Queue channel with `size` players already queued
+def queue_channel(size: int) -> int:
+    if pug.store is None:
+        pug.store = StateStore(Path(tempfile.mkdtemp()) / "bench.db")
+    channel_id = next_id()
+    queue = pug.get_state(channel_id)
+    for user_id in range(1, size + 1):
+        queue.add(user_id)
+    return channel_id
+
+@case("resolve_map_name/alias")
+def resolve_map_alias():
+    t = tournament()
+    names = cycle(alias.upper() for info in t.maps.values() for alias in info.aliases)
+    return lambda: tourney.resolve_map_name(t, names())
+
+@case("resolve_map_name/miss")
+def resolve_map_miss():
+    t = tournament()
+    names = cycle(f"unknown map {i}" for i in range(1000))
+    return lambda: tourney.resolve_map_name(t, names())
+
+@case("resolve_team_name/tag")
+def resolve_team_tag():
+    t = tournament()
+    names = cycle(info.tag.lower() for info in t.teams.values())
+    return lambda: tourney.resolve_team_name(t, names())
+
+@case("user_is_on_team/role_name")
+def user_on_team_by_name():
+    t = tournament()
+    team = list(t.teams.values())[-1]
+    member = member_with_roles(MEMBER_ROLES, team)
+    return lambda: tourney.user_is_on_team(t, member, team.full_name)
+
+@case("user_is_on_team/role_id")
+def user_on_team_by_id():
+    t = tournament()
+    team = list(t.teams.values())[-1]
+    member = member_with_roles(MEMBER_ROLES, team, role_name="Renamed team role")
+    return lambda: tourney.user_is_on_team(t, member, team.full_name)
+
+@case("user_is_on_team/miss")
+def user_not_on_team():
+    t = tournament()
+    team = list(t.teams.values())[-1]
+    member = member_with_roles(MEMBER_ROLES)
+    return lambda: tourney.user_is_on_team(t, member, team.full_name)
+
+# Resolving a member again after their roles changed (the guild's role tables stay indexed)
+@case("user_is_on_team/invalidated")
+def user_on_team_invalidated():
+    t = tournament()
+    team = list(t.teams.values())[-1]
+    member = member_with_roles(MEMBER_ROLES, team)
+
+    def op():
+        tourney.role_index.invalidate_member(member.guild.id, member.id)
+        tourney.user_is_on_team(t, member, team.full_name)
+    return op
+
+@case("has_admin_privileges/miss")
+def admin_miss():
+    member = member_with_roles(MEMBER_ROLES)
+    return lambda: tourney.has_admin_privileges(member)
+
+def _autocomplete(handler, channel_id: int, queries, warm: bool, **namespace):
+    cog = tourney.Tourney(None)
+    interaction = Interaction(member_with_roles(10), channel_id, **namespace)
+    queries = cycle(queries)
+
+    async def op():
+        if not warm:
+            tourney.autocomplete_cache.invalidate(channel_id)
+        await handler(cog, interaction, queries())
+    return op
+
+MAP_QUERIES = ("", "ka", "to", "shi", "nt_", "ri1", "zazaza")
+TEAM_QUERIES = ("", "team", "t1", "[t2", "ka", "mo", "zzz")
+
+@case("autocomplete/map_ban/cold")
+def map_ban_cold():
+    return _autocomplete(tourney.Tourney.map_ban_autocomplete, selection_channel(1), MAP_QUERIES, warm=False)
+
+@case("autocomplete/map_ban/warm")
+def map_ban_warm():
+    return _autocomplete(tourney.Tourney.map_ban_autocomplete, selection_channel(1), MAP_QUERIES, warm=True)
+
+@case("autocomplete/map_pick/cold")
+def map_pick_cold():
+    return _autocomplete(tourney.Tourney.map_pick_autocomplete, selection_channel(3), MAP_QUERIES, warm=False)
+
+@case("autocomplete/team/cold")
+def team_cold():
+    tourney.registry = SyntheticRegistry(tournament())
+    return _autocomplete(tourney.Tourney.match_team1_autocomplete, next_id(), TEAM_QUERIES, warm=False, pool="bench")
+
+@case("pug/build_main_panel_embed/10")
+def panel_embed_small():
+    channel_id = queue_channel(10)
+    return lambda: pug.build_main_panel_embed(channel_id)
+
+@case("pug/build_main_panel_embed/200")
+def panel_embed_large():
+    channel_id = queue_channel(200)
+    return lambda: pug.build_main_panel_embed(channel_id)
+
+@case(f"pug/queue_add_remove/{QUEUE_SIZE}")
+def queue_add_remove():
+    channel_id = queue_channel(QUEUE_SIZE)
+    user_ids = cycle(range(QUEUE_SIZE + 1, QUEUE_SIZE + 1001))
+
+    async def op():
+        user_id = user_ids()
+        await pug.queue_add(user_id, channel_id)
+        await pug.queue_remove(user_id, channel_id)
+    return op
+
+@case(f"pug/queue_position_churn/{QUEUE_SIZE}")
+def queue_position_churn():
+    queue = pug.get_state(queue_channel(QUEUE_SIZE))
+    user_ids = cycle(range(QUEUE_SIZE + 1, QUEUE_SIZE + 1001))
+
+    def op():
+        user_id = user_ids()
+        queue.add(user_id)
+        queue.position(user_id)
+        queue.remove(user_id)
+    return op
+
+@case(f"pug/queue_contains/{QUEUE_SIZE}")
+def queue_contains():
+    queue = pug.get_state(queue_channel(QUEUE_SIZE))
+    user_ids = cycle(range(1, QUEUE_SIZE * 2))
+    return lambda: user_ids() in queue
@@ -0,0 +1,46 @@
+import itertools
+from types import SimpleNamespace
+
+# Lightweight stand-ins for the discord.py objects the hot paths touch (attributes only, no HTTP)
+_ids = itertools.count(10_000)
+
+def next_id() -> int:
+    return next(_ids)
+
+class Permissions:
+    __slots__ = ("administrator",)
+
+    def __init__(self, administrator: bool = False):
+        self.administrator = administrator
+
+class Role:
+    __slots__ = ("id", "name", "permissions")
+
+    def __init__(self, name: str, id: int | None = None, administrator: bool = False):
+        self.id = id or next_id()
+        self.name = name
+        self.permissions = Permissions(administrator)
+
+class Guild:
+    __slots__ = ("id", "roles")
+
+    def __init__(self, roles=()):
+        self.id = next_id()
+        self.roles = list(roles)
+
+class Member:
+    __slots__ = ("id", "name", "roles", "guild")
+
+    def __init__(self, name: str, roles=(), guild: Guild | None = None):
+        self.id = next_id()
+        self.name = name
+        self.roles = list(roles)
+        self.guild = guild or Guild(roles)
+
+class Interaction:
+    __slots__ = ("user", "channel_id", "namespace")
+
+    def __init__(self, user: Member, channel_id: int, **namespace):
+        self.user = user
+        self.channel_id = channel_id
+        self.namespace = SimpleNamespace(**namespace)
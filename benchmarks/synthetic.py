@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from cogs.utils.selection import default_sequences
+from cogs.utils.tournament import MapInfo, TeamInfo, Tournament, TournamentInfo, compile_tournament
+
+from .fakes import Member, Role, next_id
+
+# Syllables for generated map and team names (names must be unique, aliases must not collide)
+SYLLABLES = ("ka", "to", "ri", "nu", "se", "mo", "ya", "shi", "ten", "ro", "gi", "za")
+
+def _word(i: int) -> str:
+    word = ""
+    while True:
+        i, r = divmod(i, len(SYLLABLES))
+        word += SYLLABLES[r]
+        if not i:
+            return word
+
+# Build a compiled tournament with the given number of maps and teams (a fifth of the maps are Wildcard)
+def synthetic_tournament(maps: int, teams: int, key: str = "bench") -> Tournament:
+    ban_sequence, pick_sequence = default_sequences(True, 1, 1)
+    info = TournamentInfo(
+        f"Benchmark {maps}x{teams}", datetime(2025, 1, 1), True, 3, 1, 1,
+        ("Standard", "Wildcard"), ban_sequence, pick_sequence)
+
+    map_records = tuple(
+        MapInfo(f"nt_{_word(i)}_ctg_b{i}", (_word(i).capitalize(),), (f"{_word(i)}{i}",),
+                "Wildcard" if i % 5 == 0 else "Standard")
+        for i in range(maps))
+    team_records = tuple(
+        TeamInfo(f"[T{i}] Team {_word(i).capitalize()}", next_id(), f"T{i}", f"Team {_word(i).capitalize()}")
+        for i in range(teams))
+    return compile_tournament(key, info, map_records, team_records)
+
+# A member holding `roles` unrelated roles, plus the role of `team` last (the worst case for a scan).
+# Giving the team role another name forces the lookup by role ID.
+def member_with_roles(roles: int, team: TeamInfo | None = None, role_name: str | None = None) -> Member:
+    member_roles = [Role(f"Role {i}") for i in range(roles)]
+    if team is not None:
+        member_roles.append(Role(role_name or team.full_name, team.id))
+    return Member("bench", member_roles)
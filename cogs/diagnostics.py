@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from pathlib import Path
+
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+from .utils.metrics import instrumented
+from .utils.profiler import ProfileSession
+
+log = logging.getLogger(__name__)
+
+# Profile reports go next to the bot's logs
+PROFILE_DIR = Path("logs")
+
+# Bounds of a profiling window in seconds (followups must be sent within 15 minutes of the command)
+MIN_PROFILE_SECONDS = 5
+MAX_PROFILE_SECONDS = 300
+
+# Debug tools for organizers
+class Diagnostics(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.session = None
+        self.task = None
+
+    async def cog_unload(self):
+        if self.task is not None:
+            self.task.cancel()
+
+    # Function to check organizers through the loaded Tourney cog, which keeps the role index
+    def is_organizer(self, member: discord.abc.User) -> bool:
+        tourney = self.bot.get_cog("Tourney")
+        return tourney is not None and tourney.is_organizer(member)
+
+    # Command to sample the event loop and trace allocations for a while, then write a report to logs/
+    @app_commands.command(name="profile", description="Organizers only: profile the bot for a while and write a report")
+    @discord.app_commands.describe(seconds=f"Length of the profiling window ({MIN_PROFILE_SECONDS}-{MAX_PROFILE_SECONDS} seconds)")
+    @instrumented("command")
+    async def profile_command(
+        self, interaction: discord.Interaction,
+        seconds: app_commands.Range[int, MIN_PROFILE_SECONDS, MAX_PROFILE_SECONDS] = 30,
+    ):
+        if not self.is_organizer(interaction.user):
+            await interaction.response.send_message("Only organizers can profile the bot.", ephemeral=True)
+            return
+
+        if self.session is not None:
+            await interaction.response.send_message("A profiling window is already running.", ephemeral=True)
+            return
+
+        await interaction.response.send_message(f"Profiling the bot for {seconds} seconds...", ephemeral=True)
+        log.info("%s started a %ds profiling window", interaction.user, seconds)
+
+        # The window runs detached, so the command's latency sample covers only the acknowledgement
+        self.session = ProfileSession(PROFILE_DIR, seconds)
+        self.task = asyncio.create_task(self.run_session(interaction))
+
+    # Run the profiling window, then send the report's location and the busiest cog functions
+    async def run_session(self, interaction: discord.Interaction):
+        try:
+            report = await self.session.run()
+        except Exception:
+            log.exception("Profiling window failed")
+            await interaction.followup.send("Profiling failed, see the bot's logs.", ephemeral=True)
+            return
+        finally:
+            self.session = None
+            self.task = None
+
+        hottest = "\n".join(f"- `{share:.1%}` {name}" for name, share in report.hottest) or "- (no cog code sampled)"
+        await interaction.followup.send(
+            f"Profile written to `{report.report}` ({report.samples} samples), "
+            f"collapsed stacks in `{report.stacks}`.\n"
+            f"**Busiest cog functions**\n{hottest}",
+            ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Diagnostics(bot))
@@ -48,6 +48,7 @@ class Help(commands.Cog):
             "3. **`/map_ban`** - Select a map to ban from the map pool.\n"
             "4. **`/map_pick`** - Select a map to pick from the map pool. In some tournaments, you can also select from a wildcard map pool.\n"
             "5. **`/map_final`** (optional) - Randomly select the final map from the map pool of choice.\n\n"
+            "- **`/stats`** - Pick and ban rates of finished matches per tournament, team or map.\n\n"
             "**The bot can load other tournaments not listed by the `/match` command**.\n"
             "Simply input its name (e.g. \"WW25\") when using the command.")
         tourney_embed.add_field(name="", value=tourney_embed_field, inline=False)
@@ -56,5 +57,22 @@ class Help(commands.Cog):
 
         await interaction.response.send_message(embed=tourney_embed)
 
+    @help_group.command(name="organizer", description="Help options for organizer tools")
+    async def help_organizer(self, interaction: discord.Interaction):
+        organizer_embed = discord.Embed(title="**Organizer Tools Help**", color=0x2F3136)
+
+        organizer_embed_field = (
+            "These commands are only available to members with the **Organizer** role or administrator permissions.\n\n"
+            "- **`/round`** - Start the map selection of every matchup of a round, each in its own thread or channel.\n"
+            "- **`/replay`** - Show the logged events of a past match and rebuild its map selection at any point.\n"
+            "- **`/role_audit`** - List the team roles of a tournament that are missing from the server.\n"
+            "- **`/pacing`** - Set the pauses before coin toss and map reveals in this server (Dramatic, Normal or Instant).\n"
+            "- **`/profile`** - Profile the bot for a while (30 seconds by default) and write a report to the bot's `logs/` directory.")
+        organizer_embed.add_field(name="", value=organizer_embed_field, inline=False)
+
+        organizer_embed.set_footer(text="Created by Muffin-Dono")
+
+        await interaction.response.send_message(embed=organizer_embed)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(Help(bot))
\ No newline at end of file
@@ -1,4 +1,4 @@
-import asyncio
+import functools
 import logging
 
 # from dotenv import load_dotenv
@@ -6,64 +6,112 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 
+from .utils.dm import DMDispatcher
+from .utils.metrics import instrumented, registry as metrics
+from .utils.nickname import NicknameManager
+from .utils.queue import PlayerQueue
+from .utils.refresher import CoalescingRefresher
+from .utils.scheduler import DeadlineScheduler
+from .utils.store import StateStore
+
 log = logging.getLogger(__name__)
 
 # Initialize global state dictionary for pug queue
-queue_handler = {}
-timeout_tasks = {}
+queue_handler: dict[int, PlayerQueue] = {}
 panel_messages = {}
+panel_handles = {}
+
+# Queue version last shown on each panel, so unchanged queues are not re-rendered
+panel_versions = {}
+
+# Durable copy of the queues and panel messages, and the shared deadline scheduler (attached by the bot when the cog loads)
+store: StateStore | None = None
+scheduler: DeadlineScheduler | None = None
+
+# Nickname and panel updates are rendered at most once per window per channel
+PANEL_REFRESH_DELAY = 1.5 # seconds
+panel_refresher: CoalescingRefresher | None = None
+
+# Queue pings and removal notices are sent in parallel, a few DMs at a time
+DM_CONCURRENCY = 5
+dm_dispatcher = DMDispatcher(DM_CONCURRENCY)
+
+# Guild nickname manager shared by every queue (attached by the bot when the cog loads)
+nicknames: NicknameManager | None = None
 
 # Set up the timeout logic for the bot
 TIMEOUT_DURATION = 3*60*60  # 3 hours
 
 async def timeout_clear(bot: commands.Bot, channel_id):
-    try:
-        await asyncio.sleep(TIMEOUT_DURATION)
-
-        # Check if players are in queue
-        queue = queue_handler.get(channel_id)
-        if not queue or not queue['players']:
-            return
-
-        # Clear queue
-        queue_handler.pop(channel_id, None)
-        timeout_tasks.pop(channel_id, None)
+    # Check if players are in queue
+    queue = queue_handler.get(channel_id)
+    if not queue:
+        return
 
-        # Change nickname, refresh panel, reset timeout counter
-        await update_queue(bot, channel_id)
+    # Clear queue
+    queue_handler.pop(channel_id, None)
+    queue_changed(channel_id)
 
-        # Notify channel that queue has been cleared
-        channel = await bot.fetch_channel(channel_id)
-        await channel.send(
-            f"PUG queue has been cleared of all players, due to {int(TIMEOUT_DURATION // (60*60))} hour(s) of inactivity. :hourglass:")
-        
-        await clear_timeout(channel_id)
-        guild = channel.guild
-        print(f"Clearing PUG queue in {channel}, {guild}...")
+    # Change nickname, refresh panel, reset timeout counter
+    update_queue(channel_id)
 
-    except asyncio.CancelledError:
-        pass
+    # Notify channel that queue has been cleared
+    channel = await get_channel(bot, channel_id)
+    await channel.send(
+        f"PUG queue has been cleared of all players, due to {int(TIMEOUT_DURATION // (60*60))} hour(s) of inactivity. :hourglass:")
+    
+    await clear_timeout(channel_id)
+    guild = channel.guild
+    log.info("Clearing PUG queue in %s, %s...", channel, guild)
 
 # Function to reset the timeout counter
-def reset_timeout_counter(bot: commands.Bot, channel_id):
-    if channel_id in timeout_tasks:
-        timeout_tasks[channel_id].cancel()
-
-    task = asyncio.create_task(timeout_clear(bot, channel_id))
-    timeout_tasks[channel_id] = task
+def reset_timeout_counter(channel_id):
+    scheduler.schedule_in("pug_timeout", channel_id, TIMEOUT_DURATION)
 
 # Function to remove any active timeout counters in the channel
 async def clear_timeout(channel_id):
-    if channel_id in timeout_tasks:
-        timeout_tasks[channel_id].cancel()
-        timeout_tasks.pop(channel_id, None)
+    scheduler.cancel("pug_timeout", channel_id)
+
+# Function to call after any change to a channel's queue
+def queue_changed(channel_id):
+    queue = queue_handler.get(channel_id)
+    if queue is None:
+        store.delete("pug_queue", channel_id)
+    else:
+        # Dumped once per store flush, so joins and leaves stay O(1) however long the queue is
+        store.put("pug_queue", channel_id, queue.dump)
+
+# Function to attach the bot's store and scheduler, then rehydrate queues and panel messages after a restart
+def restore_state(bot: commands.Bot):
+    global store, scheduler, panel_refresher, nicknames
+    store = bot.store
+    scheduler = bot.scheduler
+    nicknames = bot.nicknames
+    panel_refresher = CoalescingRefresher(functools.partial(render_queue, bot), PANEL_REFRESH_DELAY)
+
+    scheduler.register("pug_timeout", functools.partial(timeout_clear, bot))
+
+    for channel_id, players in store.load("pug_queue").items():
+        queue = PlayerQueue.load(players)
+        queue_handler[channel_id] = queue
+        nicknames.set_count(None, channel_id, len(queue))
+
+    panel_messages.update(store.load("pug_panel"))
+
+    log.info("Restored %d PUG queue(s)", len(queue_handler))
+
+    metrics.gauge("anp_pug_queue_players", "Players in each PUG queue",
+                  lambda: {(channel_id,): len(queue) for channel_id, queue in queue_handler.items()},
+                  labels=("channel",))
+    metrics.gauge("anp_pug_panel_refreshes_total", "PUG panel refresh requests by outcome",
+                  lambda: {(outcome,): count for outcome, count in panel_refresher.stats().items()},
+                  labels=("outcome",), metric_type="counter")
+    metrics.gauge("anp_pug_panel_refreshes_pending", "PUG panels waiting to be refreshed", panel_refresher.pending)
 
 # Function to resolve interaction channel (bot must only take inputs from the channel it is being used in)
 def get_state(channel_id):
     if channel_id not in queue_handler:
-        queue_handler[channel_id] = {
-            "players": []
-        }
+        queue_handler[channel_id] = PlayerQueue()
     return queue_handler[channel_id]
 
 # Build PUG panel embed
@@ -81,14 +129,14 @@ def build_main_panel_embed(channel_id: int):
 
     embed.add_field(name="", value="\u00AD", inline=False)
 
-    if not queue['players']:
+    if not queue:
         embed.add_field(name="Player Queue", value="Queue is empty :dash:", inline=False)
     else:
         embed.add_field(
             name="Player Queue",
             value="\n".join(
-                f"{i+1}. <@{user_id}>"
-                for i, user_id in enumerate(queue['players'])
+                f"{i}. <@{user_id}>"
+                for i, user_id in enumerate(queue, start=1)
             ),
             inline=False
         )
@@ -97,16 +145,49 @@ def build_main_panel_embed(channel_id: int):
 
     return embed
 
-# Refresh PUG panel embed
+# Function to get a channel from the client cache, only falling back to REST on a cache miss
+async def get_channel(bot: commands.Bot, channel_id: int):
+    return bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
+
+# Function to get a partial message handle for the channel's panel (editing it needs no fetches)
+async def get_panel(bot: commands.Bot, channel_id: int) -> discord.PartialMessage | None:
+    panel = panel_handles.get(channel_id)
+    if panel is None and channel_id in panel_messages:
+        channel = await get_channel(bot, channel_id)
+        panel = channel.get_partial_message(panel_messages[channel_id])
+        panel_handles[channel_id] = panel
+    return panel
+
+# Function to remember a newly posted panel
+def save_panel(channel, message_id: int):
+    panel_messages[channel.id] = message_id
+    panel_handles[channel.id] = channel.get_partial_message(message_id)
+    panel_versions[channel.id] = get_state(channel.id).version
+    store.put("pug_panel", channel.id, message_id)
+
+# Function to stop refreshing a panel that has been deleted
+def forget_panel(channel_id: int):
+    panel_messages.pop(channel_id, None)
+    panel_handles.pop(channel_id, None)
+    panel_versions.pop(channel_id, None)
+    store.delete("pug_panel", channel_id)
+
+# Refresh PUG panel embed (the buttons are left as they are)
 async def refresh_panel(bot: commands.Bot, channel_id: int):
-    if channel_id not in panel_messages:
+    panel = await get_panel(bot, channel_id)
+    if panel is None:
         return
 
-    channel = await bot.fetch_channel(channel_id)
-    panel_message = await channel.fetch_message(panel_messages[channel_id])
-    panel = build_main_panel_embed(channel_id)
+    version = get_state(channel_id).version
+    if panel_versions.get(channel_id) == version:
+        return
 
-    await panel_message.edit(embed=panel, view=MainButtons())
+    try:
+        await panel.edit(embed=build_main_panel_embed(channel_id))
+        panel_versions[channel_id] = version
+    except discord.NotFound:
+        log.info("PUG panel in channel %s no longer exists", channel_id)
+        forget_panel(channel_id)
 
 # Build Actions panel embed
 def build_more_panel_embed(channel_id: int):
@@ -128,46 +209,40 @@ def build_more_panel_embed(channel_id: int):
 
     return embed
 
-# Change nickname according to the number of players in queue
+# Change nickname according to the number of players in queue (the manager skips no-op edits and rate limits per guild)
 async def change_nickname(bot: commands.Bot, channel_id: int):
     queue = get_state(channel_id)
-    players = len(queue['players'])
-
-    channel = await bot.fetch_channel(channel_id)
-    guild = channel.guild
-    me = guild.me
-
-    if players > 0:
-        nickname = f"{bot.user.name} ({players} in queue)"
-    else:
-        nickname = None
-
-    await me.edit(nick=nickname)
+    channel = await get_channel(bot, channel_id)
+    nicknames.set_count(channel.guild.id, channel_id, len(queue))
 
-# All the necessary updates in one function
-async def update_queue(bot: commands.Bot, channel_id: int):
+# Render the nickname and panel for the current queue
+async def render_queue(bot: commands.Bot, channel_id: int):
     await change_nickname(bot, channel_id)
     await refresh_panel(bot, channel_id)
-    reset_timeout_counter(bot, channel_id)
+
+# All the necessary updates in one function (bursts of joins/leaves are coalesced into one render)
+def update_queue(channel_id: int):
+    panel_refresher.request(channel_id)
+    reset_timeout_counter(channel_id)
 
 # Function to join queue
 async def queue_add(user_id: int, channel_id: int):
     queue = get_state(channel_id)
 
-    if user_id in queue['players']:
+    if not queue.add(user_id):
         return False
 
-    queue['players'].append(user_id)
+    queue_changed(channel_id)
     return True
 
 # Function to leave queue
 async def queue_remove(user_id: int, channel_id: int):
     queue = get_state(channel_id)
 
-    if user_id not in queue['players']:
+    if not queue.remove(user_id):
         return False
 
-    queue['players'].remove(user_id)
+    queue_changed(channel_id)
     return True
 
 class ButtonOnCooldown(commands.CommandError):
@@ -182,19 +257,20 @@ class MoreButtons(discord.ui.View):
         super().__init__(timeout=None)
 
     @discord.ui.button(label="Ping Queue", style=discord.ButtonStyle.red, emoji="\U0001f514")
+    @instrumented("button")
     async def ping_queue_button(self, interaction, button):
         
         queue = get_state(interaction.channel_id)
 
-        if not queue['players']:
+        if not queue:
             await interaction.response.send_message("Queue is empty.", ephemeral=True)
             return
 
-        if interaction.user.id not in queue['players']:
+        if interaction.user.id not in queue:
             await interaction.response.send_message("Only queued players may ping the queue.", ephemeral=True)
             return
         
-        if len(queue['players']) < 6:
+        if len(queue) < 6:
             await interaction.response.send_message(
                 ":exclamation:**Don't Ping Queue yet**\n\n"
                 "Aim for 10 players (5v5) first before you Ping Queue.\n"
@@ -210,22 +286,24 @@ class MoreButtons(discord.ui.View):
 
         await interaction.response.defer(ephemeral=True)
 
-        for user_id in queue['players'][:10]:
-            player = interaction.guild.get_member(user_id)
-
-            await player.send(f"<@{interaction.user.id}> has pinged everyone in the queue! :bell:\n"
-                              f"> <#{interaction.channel_id}>\n\n"
-                              "Gather in VC and make teams! :sound:",
-                              allowed_mentions=discord.AllowedMentions(users=False))
+        report = await dm_dispatcher.send(
+            interaction.guild, queue.first(10),
+            f"<@{interaction.user.id}> has pinged everyone in the queue! :bell:\n"
+            f"> <#{interaction.channel_id}>\n\n"
+            "Gather in VC and make teams! :sound:",
+            allowed_mentions=discord.AllowedMentions(users=False))
             
-        await interaction.followup.send(f"**<@{interaction.user.id}> has pinged everyone in the queue! :bell:**",
+        await interaction.followup.send(f"**<@{interaction.user.id}> has pinged everyone in the queue! :bell:**\n\n"
+                                        f"{report.summary()}",
                                         allowed_mentions=discord.AllowedMentions(users=True))
 
     @discord.ui.button(label="Map Vote", style=discord.ButtonStyle.blurple, emoji="\U0001f5fa")
+    @instrumented("button")
     async def map_vote_button(self, interaction, button):
         await interaction.response.send_message(":tools: Planned (tentative)", ephemeral=True)
 
     @discord.ui.button(label="Scramble", style=discord.ButtonStyle.blurple, emoji="\U0001f500")
+    @instrumented("button")
     async def scramble_button(self, interaction, button):
         await interaction.response.send_message(":tools: Planned (tentative)", ephemeral=True)
 
@@ -235,6 +313,7 @@ class MainButtons(discord.ui.View):
         super().__init__(timeout=None)
 
     @discord.ui.button(label="Join Queue", style=discord.ButtonStyle.green, emoji="\U0000270b", custom_id='persistent_view:queue_add')
+    @instrumented("button")
     async def join_button(self, interaction, button):
         queue = get_state(interaction.channel_id)
 
@@ -244,12 +323,13 @@ class MainButtons(discord.ui.View):
             return
 
         await interaction.response.send_message(
-            f"<@{interaction.user.id}> has joined the queue -----> **{len(queue['players'])} player(s) in queue**\n",
+            f"<@{interaction.user.id}> has joined the queue -----> **{len(queue)} player(s) in queue**\n",
             allowed_mentions=discord.AllowedMentions(users=False))
         
-        asyncio.create_task(update_queue(interaction.client, interaction.channel_id))
+        update_queue(interaction.channel_id)
 
     @discord.ui.button(label="Leave Queue", style=discord.ButtonStyle.red, emoji="\U0001f44b", custom_id='persistent_view:queue_remove')
+    @instrumented("button")
     async def leave_button(self, interaction, button):
         queue = get_state(interaction.channel_id)
 
@@ -259,12 +339,13 @@ class MainButtons(discord.ui.View):
             return
 
         await interaction.response.send_message(
-            f"<@{interaction.user.id}> has left the queue -----> **{len(queue['players'])} player(s) in queue**\n",
+            f"<@{interaction.user.id}> has left the queue -----> **{len(queue)} player(s) in queue**\n",
             allowed_mentions=discord.AllowedMentions(users=False))
         
-        asyncio.create_task(update_queue(interaction.client, interaction.channel_id))
+        update_queue(interaction.channel_id)
 
     @discord.ui.button(label="How to Play", style=discord.ButtonStyle.blurple, emoji="\U0001f5d2", custom_id='persistent_view:how_to_play')
+    @instrumented("button")
     async def how_to_play_button(self, interaction, button):
         how_to_play_embed = discord.Embed(
             title=":notepad_spiral: How to Play",
@@ -304,6 +385,7 @@ class MainButtons(discord.ui.View):
         await interaction.response.send_message(embed=how_to_play_embed, ephemeral=True)
 
     @discord.ui.button(label="Actions", style=discord.ButtonStyle.grey, emoji="\U00002728", row=1, custom_id='persistent_view:actions')
+    @instrumented("button")
     async def actions_button(self, interaction, button):
         more_panel = build_more_panel_embed(interaction.channel_id)
         await interaction.response.send_message(embed=more_panel, view=MoreButtons(), ephemeral=True)
@@ -313,19 +395,31 @@ class Pug(commands.Cog):
         self.bot = bot
         bot.add_view(MainButtons())
 
+    async def cog_load(self):
+        restore_state(self.bot)
+
+    # Stop refreshing panels as soon as they are deleted
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        if panel_messages.get(payload.channel_id) == payload.message_id:
+            forget_panel(payload.channel_id)
+
     # Command to open PUG prompt
     @app_commands.command(name="pug", description="Open the PUG panel and view the queue")
+    @instrumented("command")
     async def pug_command(self, interaction: discord.Interaction):
         main_panel = build_main_panel_embed(interaction.channel_id)
-        await interaction.response.send_message(embed=main_panel, view=MainButtons())
+        response = await interaction.response.send_message(embed=main_panel, view=MainButtons())
 
-        save_panel_message = await interaction.original_response()
-        
-        panel_message = await interaction.channel.fetch_message(save_panel_message.id)
-        panel_messages[interaction.channel_id] = panel_message.id
+        message_id = response.message_id
+        if message_id is None:
+            message_id = (await interaction.original_response()).id
+
+        save_panel(interaction.channel, message_id)
 
     # Command to join the queue
     @app_commands.command(name="join", description="Join the PUG queue")
+    @instrumented("command")
     async def join_command(self, interaction: discord.Interaction):
         queue = get_state(interaction.channel_id)
 
@@ -334,13 +428,14 @@ class Pug(commands.Cog):
             await interaction.response.send_message("You are already in the queue.", ephemeral=True)
         else:
             await interaction.response.send_message(
-                f"<@{interaction.user.id}> has joined the queue -----> **{len(queue['players'])} player(s) in queue**\n",
+                f"<@{interaction.user.id}> has joined the queue -----> **{len(queue)} player(s) in queue**\n",
                 allowed_mentions=discord.AllowedMentions(users=False))
 
-        asyncio.create_task(update_queue(interaction.client, interaction.channel_id))
+        update_queue(interaction.channel_id)
 
     # Command to leave the queue
     @app_commands.command(name="leave", description="Leave the PUG queue")
+    @instrumented("command")
     async def leave_command(self, interaction: discord.Interaction):
         queue = get_state(interaction.channel_id)
 
@@ -349,13 +444,14 @@ class Pug(commands.Cog):
             await interaction.response.send_message("You are not in the queue.", ephemeral=True)
         else:
             await interaction.response.send_message(
-                f"<@{interaction.user.id}> has left the queue -----> **{len(queue['players'])} player(s) in queue**\n",
+                f"<@{interaction.user.id}> has left the queue -----> **{len(queue)} player(s) in queue**\n",
                 allowed_mentions=discord.AllowedMentions(users=False))
 
-        asyncio.create_task(update_queue(interaction.client, interaction.channel_id))
+        update_queue(interaction.channel_id)
 
     # Command to kick a player from the queue
     @app_commands.command(name="remove", description="Remove a player from the PUG queue")
+    @instrumented("command")
     async def remove_command(self, interaction: discord.Interaction, player: discord.Member):
         queue = get_state(interaction.channel_id)
 
@@ -365,14 +461,15 @@ class Pug(commands.Cog):
             return
 
         await interaction.response.send_message(
-            f"<@{interaction.user.id}> has removed <@{player.id}> from the queue -----> **{len(queue['players'])} player(s) in queue**\n",
+            f"<@{interaction.user.id}> has removed <@{player.id}> from the queue -----> **{len(queue)} player(s) in queue**\n",
             allowed_mentions=discord.AllowedMentions(users=False))
 
-        await player.send(
+        await dm_dispatcher.send(
+            interaction.guild, [player.id],
             f"<@{interaction.user.id}> has removed you from the queue. :door:\n"
             f"> <#{interaction.channel_id}>\n\n")
 
-        asyncio.create_task(update_queue(interaction.client, interaction.channel_id))
+        update_queue(interaction.channel_id)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Pug(bot))
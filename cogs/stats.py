@@ -0,0 +1,169 @@
+import logging
+
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+from .utils.archive import MatchArchive
+from .utils.autocomplete import MAX_CHOICES
+from .utils.embeds import bounded_list
+from .utils.metrics import instrumented
+from .utils.tournament import Tournament, TournamentError, resolve_map_name, resolve_team_name
+
+log = logging.getLogger(__name__)
+
+# Rows listed per stats field
+TOP_ROWS = 10
+
+# Function to format a count with its share of a number of matches
+def rate(count: int, matches: int) -> str:
+    return f"{count} ({count / matches:.0%})" if matches else str(count)
+
+# Function to name a map by its base name where the tournament still has it
+def map_label(tournament: Tournament | None, map_key: str) -> str:
+    base_name = tournament.base_names.get(map_key) if tournament else None
+    return f"{base_name} `{map_key}`" if base_name else f"`{map_key}`"
+
+# Function to list the top rows of a stats field by one of their counts
+def top_rows(rows: list, column: int, label, matches: int) -> str:
+    ranked = sorted((row for row in rows if row[column]), key=lambda row: (-row[column], row[0]))[:TOP_ROWS]
+    return bounded_list([f"{label(row[0])} - {rate(row[column], matches)}" for row in ranked]) or "-"
+
+# Pick and ban statistics from the match archive, per tournament, team or map
+class Stats(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.archive: MatchArchive = bot.match_archive
+
+    # Tournaments and autocomplete cache of the loaded Tourney cog, looked up when used (it can be reloaded)
+    @property
+    def tourney(self):
+        return self.bot.get_cog("Tourney")
+
+    # Function to resolve the tournament named in the command or its autocomplete (None for all tournaments)
+    def tournament_for(self, pool: str | None) -> Tournament | None:
+        return self.tourney.registry.get(pool) if pool else None
+
+    # Command to show the pick and ban rates of a tournament, a team or a map in this server
+    @app_commands.command(name="stats", description="Pick and ban statistics of the finished matches in this server")
+    @discord.app_commands.describe(
+        pool="Tournament (default: all tournaments)", team="Show the bans and picks of a team",
+        map="Show which teams ban and pick a map")
+    @instrumented("command")
+    async def stats_command(
+        self, interaction: discord.Interaction, pool: str | None = None, team: str | None = None, map: str | None = None,
+    ):
+        if team and map:
+            await interaction.response.send_message("Please choose a team or a map, not both.", ephemeral=True)
+            return
+
+        try:
+            tournament = self.tournament_for(pool)
+        except TournamentError as e:
+            await interaction.response.send_message(f"TournamentError: {e}", ephemeral=True)
+            return
+
+        if pool and tournament is None:
+            await interaction.response.send_message(
+                f"ImportError: Could not import the map pool: {pool}.", ephemeral=True)
+            return
+
+        # Without a tournament, teams and maps are the archived names from the autocomplete
+        key = tournament.key if tournament else None
+        scope = tournament.full_name if tournament else "All tournaments"
+        if team and tournament:
+            team = resolve_team_name(tournament, team)
+            if team is None:
+                await interaction.response.send_message("Team names are not recognized.", ephemeral=True)
+                return
+        if map and tournament:
+            map = resolve_map_name(tournament, map)
+            if map is None:
+                await interaction.response.send_message("Map names are not recognized.", ephemeral=True)
+                return
+
+        def label(map_key: str) -> str:
+            return map_label(tournament, map_key)
+
+        if team:
+            stats = await self.archive.team_stats(interaction.guild_id, key, team)
+            stats_embed = discord.Embed(title=f"**Stats: {team}**", color=0x2F3136)
+            stats_embed.description = (
+                f"{scope}: **{stats.matches}** finished match(es), won the coin toss in "
+                f"{rate(stats.coin_tosses_won, stats.matches)}, banned first in {rate(stats.banned_first, stats.matches)}.")
+            stats_embed.add_field(name="Bans", value=top_rows(stats.maps, 1, label, stats.matches), inline=True)
+            stats_embed.add_field(name="Picks", value=top_rows(stats.maps, 2, label, stats.matches), inline=True)
+
+        elif map:
+            stats = await self.archive.map_stats(interaction.guild_id, key, map)
+            stats_embed = discord.Embed(title=f"**Stats: {label(map)}**", color=0x2F3136)
+            stats_embed.description = (
+                f"{scope}: **{stats.matches}** finished match(es). Banned in {rate(stats.bans, stats.matches)}, "
+                f"picked in {rate(stats.picks, stats.matches)}, randomly selected in {rate(stats.random, stats.matches)}.")
+            stats_embed.add_field(name="Banned most by", value=top_rows(stats.teams, 1, str, stats.bans), inline=True)
+            stats_embed.add_field(name="Picked most by", value=top_rows(stats.teams, 2, str, stats.picks), inline=True)
+
+        else:
+            matches, maps = await self.archive.tournament_stats(interaction.guild_id, key)
+            stats_embed = discord.Embed(title=f"**Stats: {scope}**", color=0x2F3136)
+            stats_embed.description = f"**{matches}** finished match(es) in this server."
+            stats_embed.add_field(name="Most banned", value=top_rows(maps, 1, label, matches), inline=True)
+            stats_embed.add_field(name="Most picked", value=top_rows(maps, 2, label, matches), inline=True)
+            if any(row[3] for row in maps):
+                stats_embed.add_field(name="Most randomly selected", value=top_rows(maps, 3, label, matches), inline=False)
+
+        await interaction.response.send_message(embed=stats_embed)
+
+    @stats_command.autocomplete('pool')
+    @instrumented("autocomplete")
+    async def stats_pool_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str,
+    ) -> list[discord.app_commands.Choice[str]]:
+
+        return self.tourney.autocomplete_cache.get(
+            interaction.channel_id, "pool", current, lambda: self.tourney.registry.pool_choices.search(current))
+
+    # Show the tournament's teams, or every team in the archive without a tournament
+    @stats_command.autocomplete('team')
+    @instrumented("autocomplete")
+    async def stats_team_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str,
+    ) -> list[discord.app_commands.Choice[str]]:
+
+        try:
+            tournament = self.tournament_for(interaction.namespace.pool)
+        except TournamentError:
+            return []
+        if tournament is not None:
+            return self.tourney.autocomplete_cache.get(
+                interaction.channel_id, ("team", tournament.key), current, lambda: tournament.team_choices.search(current))
+
+        names = await self.archive.names(interaction.guild_id, "team", current, MAX_CHOICES)
+        return [discord.app_commands.Choice(name=name[:100], value=name) for name in names]
+
+    # Show the tournament's maps, or every map in the archive without a tournament
+    @stats_command.autocomplete('map')
+    @instrumented("autocomplete")
+    async def stats_map_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str,
+    ) -> list[discord.app_commands.Choice[str]]:
+
+        try:
+            tournament = self.tournament_for(interaction.namespace.pool)
+        except TournamentError:
+            return []
+        if tournament is not None:
+            return self.tourney.autocomplete_cache.get(
+                interaction.channel_id, ("map", tournament.key), current, lambda: tournament.map_choices.search(current))
+
+        names = await self.archive.names(interaction.guild_id, "map", current, MAX_CHOICES)
+        return [discord.app_commands.Choice(name=name[:100], value=name) for name in names]
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Stats(bot))
@@ -1,6 +0,0 @@
-__all__ = ["gg26", "ss25", "ww25"]
-
-# Import the tournament modules
-from . import gg26
-from . import ss25
-from . import ww25
@@ -1,88 +0,0 @@
-# Tournament settings
-INFO = {
-    "full_name": "Ghost Gauntlet 2026",
-    "start_date": "2026-03-16",
-    "equal_bans": True, # equal number of map bans per team
-    "maps_per_match": 3, # number of maps in a single match
-    "max_bans": 1, # maximum number of maps banned per team
-    "max_picks": 1, # maximum number of maps picked per team
-    "map_pools": ["Standard"] # list of available map pools
-}
-
-# List of available maps with base names, aliases, and map pool types
-MAP_POOL = {
-    "ntre_ballistremade_ctg_a26ff": {
-        "base_name": ["Ballistremade"],
-        "aliases": ["Ballistrade", "Balli"],
-        "map_pool": "Standard"
-    },
-    "nt_culvert_ctg_b6": {
-        "base_name": ["Culvert"],
-        "aliases": [],
-        "map_pool": "Standard"
-    },
-    "ntre_grid_ctg_b2": {
-        "base_name": ["Grid"],
-        "aliases": [],
-        "map_pool": "Standard"
-    },
-    "ntre_oliostain_ctg_b2": {
-        "base_name": ["Oliostain"],
-        "aliases": ["Olio"],
-        "map_pool": "Standard"
-    },
-    "ntre_rise_ctg": {
-        "base_name": ["Rise"],
-        "aliases": [],
-        "map_pool": "Standard"
-    },
-    "ntre_rogue_ctg": {
-        "base_name": ["Rogue"],
-        "aliases": [],
-        "map_pool": "Standard"
-    },
-    "ntre_snowfall_ctg_b13": {
-        "base_name": ["Snowfall"],
-        "aliases": [],
-        "map_pool": "Standard"
-    },
-}
-
-# List of team Discord roles with role IDs, clan tags, and team names
-TEAM_ROLES = {
-    "[ATEAM] Accessibility Team": {
-        "id": 1476525500385071105,
-        "tag": "ATEAM",
-        "name": "Accessibility Team"
-    },
-    "[BLVD] Blood and Thunder": {
-        "id": 1325533278513401919,
-        "tag": "BLVD",
-        "name": "Blood and Thunder"
-    },
-    "[BONK] Bonkurazu": {
-        "id": 915003320081473576,
-        "tag": "BONK",
-        "name": "Bonkurazu"
-    },
-    "[KOBA] KOBAYASHI CLAN": {
-        "id": 1135193320155525171,
-        "tag": "KOBA",
-        "name": "KOBAYASHI CLAN"
-    },
-    "[MTNT] MuteNT Support Cats": {
-        "id": 1476526838640676935,
-        "tag": "MTNT",
-        "name": "MuteNT Support Cats"
-    },
-    "[FEET] RECON FEET": {
-        "id": 1135193612116824125,
-        "tag": "FEET",
-        "name": "RECON FEET"
-    },
-    "[PAR] TGR Woods": {
-        "id": 1476526209004208179,
-        "tag": "PAR",
-        "name": "TGR Woods"
-    }
-}
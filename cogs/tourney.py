@@ -1,193 +1,395 @@
 import asyncio
-import importlib
+import functools
 import logging
-import pkgutil
 import random
-import sys
-from datetime import datetime
+import time
 from pathlib import Path
 
 # from dotenv import load_dotenv
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
+
+from .utils.archive import CompletedMatch, MatchArchive
+from .utils.autocomplete import MAX_CHOICES, AutocompleteCache, static_choices
+from .utils.embeds import bounded_list
+from .utils.metrics import instrumented, registry as metrics
+from .utils.pacing import COIN_TOSS_DELAY, DEFAULT_PACING, FINAL_DRAW_DELAY, PACING_MODES, SUMMARY_DELAY, RevealQueue
+from .utils.refresher import CoalescingRefresher
+from .utils.registry import TournamentRegistry
+from .utils.roles import RoleIndex
+from .utils.rounds import FAILED, SKIPPED, STARTED, RoundProgress, channel_slug, pairings_path, parse_pairings
+from .utils.scheduler import DeadlineScheduler
+from .utils.selection import BAN, FINAL, ORDER, PICK, SelectionState
+from .utils import selection_log as events
+from .utils.selection_log import SelectionLog, seeded_choice
+from .utils.store import StateStore
+from .utils.tournament import MIXED_TEAMS, Tournament, TournamentError, resolve_map_name, resolve_team_name
 
 log = logging.getLogger(__name__)
 
 # Configure cogs directory
 BASE_DIR = Path(__file__).resolve().parent
 TOURNAMENTS_DIR = BASE_DIR / "tournaments"
+SNAPSHOT_DIR = Path("data") / "snapshots"
 
-sys.path.append(str(BASE_DIR))
+# Tournament files are read lazily and re-read when they change on disk
+registry = TournamentRegistry(TOURNAMENTS_DIR, SNAPSHOT_DIR)
+TOURNAMENT_RELOAD_INTERVAL = 5 # seconds
 
-# Import the tournament modules and sort by start date
-modules_with_dates = []
+# Autocomplete choices and memoized results per channel
+ORDER_CHOICES = static_choices("BAN first, PICK second", "BAN second, PICK first")
+OVERRIDE_CHOICES = static_choices("Yes", "No")
+PACING_CHOICES = static_choices(*(mode.capitalize() for mode in PACING_MODES), "Tournament default")
+WILDCARD_CHOICES = static_choices("INVOKE WILDCARD")
+WHERE_CHOICES = static_choices("Threads", "Channels")
 
-for _, name, _ in pkgutil.iter_modules([str(TOURNAMENTS_DIR)]):
-    module = importlib.import_module(f"{"tournaments"}.{name}")
+autocomplete_cache = AutocompleteCache()
 
-    # Parse the date string
-    full_name = module.INFO['full_name']
-    start_date_str = module.INFO['start_date']
-    start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
-    map_pools = module.INFO['map_pools']
-    modules_with_dates.append((name, full_name, start_date, map_pools))
-
-tournaments = sorted(modules_with_dates, key=lambda x: x[2], reverse=True)
+# Team and organizer roles per guild, with each member's resolved access (kept fresh by the role listeners)
+role_index = RoleIndex()
 
 # Initialize global state dictionary for map selection
-state_handler = {}
-timeout_tasks = {}
+state_handler: dict[int, SelectionState] = {}
+
+# Announced when the selection moves past a phase
+PHASE_COMPLETE = {BAN: "Banning phase complete!", PICK: "Picking phase complete!"}
+
+# Durable copy of the selection states and the shared deadline scheduler (attached by the bot when the cog loads)
+store: StateStore | None = None
+scheduler: DeadlineScheduler | None = None
+
+# Append-only log of every selection's events, for replays (attached by the bot when the cog loads)
+selection_log: SelectionLog | None = None
+
+# Finished matches, for /stats (attached by the bot when the cog loads)
+match_archive: MatchArchive | None = None
+
+# Coin toss, final draw and summary messages, posted from the scheduler after a pacing delay
+reveals: RevealQueue | None = None
+
+# Pacing mode set by organizers per guild (overrides the tournament's INFO.pacing)
+guild_pacing: dict[int, str] = {}
+
+# Matchups of a round set up at once (Discord rate limits channel and thread creation per guild) and
+# the debounce window of the round's status message
+ROUND_CONCURRENCY = 3
+ROUND_STATUS_DELAY = 1.0 # seconds
 
 # Set up the timeout logic for the bot
 TIMEOUT_DURATION = 72*60*60  # 72 hours
 TIMEOUT_NOTICE = 12*60*60 # 12 hours
 
-async def timeout_clear(channel_id, interaction):
-    try:
-        notice_delay = TIMEOUT_DURATION - TIMEOUT_NOTICE
+# Warn the channel before an inactive map selection is cleared
+async def timeout_notice(bot: commands.Bot, channel_id):
+    if channel_id not in state_handler:
+        return
 
-        await asyncio.sleep(notice_delay)
+    channel = bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
+    await channel.send(
+        f"Map selection will be cleared in {TIMEOUT_NOTICE/(60*60)} hour(s) if no further commands are used.")
 
-        await interaction.followup.send(
-            f"Map selection will be cleared in {TIMEOUT_NOTICE/(60*60)} hour(s) if no further commands are used.")
+async def timeout_clear(bot: commands.Bot, channel_id):
+    if channel_id not in state_handler:
+        return
 
-        await asyncio.sleep(TIMEOUT_NOTICE)
+    record_event(state_handler.pop(channel_id), events.TIMEOUT)
+    state_changed(channel_id)
+    await clear_timeout(channel_id)
 
-        state_handler.pop(channel_id, None)
-        timeout_tasks.pop(channel_id, None)
-        await interaction.followup.send(
-            f"Map selection has timed out after {TIMEOUT_DURATION/(60*60)} hour(s) of inactivity and has been cleared.")
-        
-        await clear_timeout(channel_id)
+    channel = bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
+    await channel.send(
+        f"Map selection has timed out after {TIMEOUT_DURATION/(60*60)} hour(s) of inactivity and has been cleared.")
 
-    except asyncio.CancelledError:
-        pass
-
-# Function to reset the timeout counter
-def reset_timeout_counter(channel_id, interaction):
-    if channel_id in timeout_tasks:
-        timeout_tasks[channel_id].cancel()
-    task = asyncio.create_task(timeout_clear(channel_id, interaction))
-    timeout_tasks[channel_id] = task
+# Function to reset the timeout counter (the notice is just an earlier deadline)
+def reset_timeout_counter(channel_id):
+    deadline = time.time() + TIMEOUT_DURATION
+    scheduler.schedule("tourney_timeout", channel_id, deadline)
+    scheduler.schedule("tourney_notice", channel_id, deadline - TIMEOUT_NOTICE)
 
 # Function to remove any active timeout counters in the channel
 async def clear_timeout(channel_id):
-    if channel_id in timeout_tasks:
-        timeout_tasks[channel_id].cancel()
-        timeout_tasks.pop(channel_id, None)
+    scheduler.cancel("tourney_timeout", channel_id)
+    scheduler.cancel("tourney_notice", channel_id)
+
+# Function to convert a selection state to plain values for the store
+def dump_state(selection_state: SelectionState):
+    return selection_state.dump()
+
+# Function to rebuild a stored selection state (None if its tournament no longer exists or its format changed)
+def load_state(data):
+    tournament = registry.get(data["tournament"]) if data["tournament"] else None
+    if data["tournament"] and tournament is None:
+        return None
+
+    return SelectionState.load(data, tournament)
+
+# Function to call after any change to a channel's selection state
+def state_changed(channel_id):
+    autocomplete_cache.invalidate(channel_id)
+
+    selection_state = state_handler.get(channel_id)
+    if selection_state is None:
+        store.delete("selection", channel_id)
+    else:
+        store.put("selection", channel_id, dump_state(selection_state))
+
+# Function to attach the bot's store and scheduler, then rehydrate selection states after a restart
+def restore_state(bot: commands.Bot):
+    global store, scheduler, reveals, selection_log, match_archive
+    store = bot.store
+    scheduler = bot.scheduler
+    selection_log = bot.selection_log
+    match_archive = bot.match_archive
+    reveals = RevealQueue(bot, scheduler)
+    guild_pacing.update(store.load("pacing"))
+
+    scheduler.register("tourney_notice", functools.partial(timeout_notice, bot))
+    scheduler.register("tourney_timeout", functools.partial(timeout_clear, bot))
+
+    for channel_id, data in store.load("selection").items():
+        try:
+            selection_state = load_state(data)
+        except (KeyError, TypeError, TournamentError):
+            log.exception("Could not restore map selection in channel %s", channel_id)
+            selection_state = None
+
+        if selection_state is None:
+            store.delete("selection", channel_id)
+            continue
+        state_handler[channel_id] = selection_state
+
+    log.info("Restored %d map selection(s)", len(state_handler))
+
+    metrics.gauge("anp_active_selections", "Channels with a map selection in progress",
+                  lambda: sum(1 for selection_state in state_handler.values() if selection_state.tournament))
+    metrics.gauge("anp_autocomplete_cache_total", "Autocomplete cache lookups by result",
+                  lambda: {("hit",): autocomplete_cache.hits, ("miss",): autocomplete_cache.misses},
+                  labels=("result",), metric_type="counter")
+    metrics.gauge("anp_reveals_pending", "Reveal messages waiting for their pacing delay", reveals.pending)
+    metrics.gauge("anp_role_index_total", "Member access lookups by result",
+                  lambda: {("hit",): role_index.hits, ("miss",): role_index.misses},
+                  labels=("result",), metric_type="counter")
+
+# Function to append an event to a selection's log (selections started before the log existed have none)
+def record_event(selection_state: SelectionState, kind: str, user: discord.abc.User | None = None, **data):
+    if selection_state.match_id is not None:
+        selection_log.append(selection_state.match_id, kind, data, user.id if user else None, selection_state)
 
 # Function to resolve interaction channel (bot must only take inputs from the channel it is being used in)
-def get_state(channel_id):
+def get_state(channel_id) -> SelectionState:
     if channel_id not in state_handler:
-        state_handler[channel_id] = {
-            "teams": {"team1": None, "team2": None},
-            "coin_toss_winner": None,
-            "ban_order": None,
-            "bans": {"team1": None, "team2": None},
-            "picks": {"team1": None, "team2": None},
-            "map_pools": None,
-            "remaining_maps": {},
-            "final_map_pool": {"team1": None, "team2": None},
-            "random_map": None
-        }
+        state_handler[channel_id] = SelectionState()
     return state_handler[channel_id]
 
-# Function to resolve map name (checks map names and aliases)
-def resolve_map_name(map_name):
-    for official_name, map_info in MAP_POOL.items():
-        if map_name.lower() == official_name.lower():
-            return official_name
-        for name in map_info['base_name']:
-            if map_name.lower() == name.lower():
-                return official_name
-        for alias in map_info['aliases']:
-            if map_name.lower() == alias.lower():
-                return official_name
-    return None
-
 # Function to get base name for map
-def get_base_name(team_pick):
-    base_names = MAP_POOL[team_pick]['base_name']
-    if base_names:
-        return f"{base_names[0]}"
-    return "Unknown Map"
+def get_base_name(tournament: Tournament, team_pick):
+    return tournament.base_names[team_pick]
 
 # Check if a user has the required perms to bypass team restrictions
 def has_admin_privileges(member):
-    return (
-        any(role.permissions.administrator for role in member.roles)
-        or any(role.name == "Organizer" for role in member.roles))
-
-# Function to resolve team name (returns full team name)
-def resolve_team_name(team_name):
-    if team_name == "Mixed Team":
-        return "Mixed Team"
-    for full_name, team_info in TEAM_ROLES.items():
-        if team_name.lower() == team_info["tag"].lower():
-            return full_name
-        if team_name.lower() == full_name.lower() or team_name.lower() == team_info["name"].lower():
-            return full_name
-    return None
+    return role_index.is_admin(member)
+
+# Function to scale a reveal delay by the guild's pacing mode, else the tournament's
+def reveal_delay(guild_id: int, tournament: Tournament, delay: float) -> float:
+    mode = guild_pacing.get(guild_id) or tournament.info.pacing or DEFAULT_PACING
+    return delay * PACING_MODES[mode]
 
 # Function to get team name without clan tag
-def trim_team_name(team_name: str) -> str | None:
-    team_info = TEAM_ROLES.get(team_name)
-    return team_info["name"] if team_info else None
+def trim_team_name(tournament: Tournament, team_name: str) -> str | None:
+    return tournament.trimmed_names.get(team_name)
+
+# Function to start a map selection with assigned teams and the coin toss winner. Returns the opening
+# message and the coin toss announcement, which is scheduled once the opening message is posted.
+def begin_selection(
+    channel_id, guild: discord.Guild, user: discord.abc.User, tournament: Tournament, pool: str, team1: str, team2: str,
+) -> tuple[str, str]:
+    # A selection still in progress is cleared first, as /clear would (its log ends and its pending reveals are dropped)
+    previous = state_handler.get(channel_id)
+    if previous is not None and previous.tournament:
+        record_event(previous, events.CLEARED, user)
+        reveals.cancel(channel_id)
+
+    match_id = selection_log.start_match(guild.id, channel_id, tournament.key, (team1, team2), user.id)
+    coin_toss_winner, seed = seeded_choice([team1, team2])
+    selection_state = SelectionState.start(tournament, team1, team2, coin_toss_winner, match_id, time.time())
+    record_event(selection_state, events.COIN_TOSS, winner=coin_toss_winner, seed=seed)
+    state_handler[channel_id] = selection_state
+    state_changed(channel_id)
+
+    # Announce coin toss winner
+    if team1 == team2:
+        coin_toss_winner = selection_state.coin_toss_winner
+    else:
+        coin_toss_winner = trim_team_name(tournament, selection_state.coin_toss_winner)
+
+    opening = (
+        f"**{team1}** vs **{team2}**\n\n"
+        f"Map selection started! The tournament is **{pool}**.\n\n"
+        "Performing a coin toss to determine which team decides the ban order...")
+
+    # Point organizers to the role audit instead of listing missing roles on every match
+    missing_roles, _ = role_index.audit(guild, tournament)
+    warning = (
+        f"\n\n**WARNING: {len(missing_roles)} team role(s) of this tournament are missing from your server.** "
+        "Organizers can list them with **`/role_audit`**."
+    ) if missing_roles else ""
+
+    coin_toss = (
+        f"{random.choice([":coin:", ":older_man:", ":church:"])} **{coin_toss_winner}** wins the coin toss! Pick your team's ban/pick order using **`/order`**"
+        + warning)
+    return opening, coin_toss
+
+# Function to post the coin toss after the pacing delay and start the timeout counter
+def announce_coin_toss(channel_id, guild_id: int, tournament: Tournament, coin_toss: str):
+    reveals.add(channel_id, reveal_delay(guild_id, tournament, COIN_TOSS_DELAY), coin_toss)
+    reset_timeout_counter(channel_id)
+
+# Function to name the thread or channel of a matchup
+def matchup_name(tournament: Tournament, team1: str, team2: str) -> str:
+    return f"{trim_team_name(tournament, team1) or team1} vs {trim_team_name(tournament, team2) or team2}"[:100]
+
+# Function to find the existing threads of this channel (or channels of its category) by matchup name
+async def matchup_channels(parent: discord.TextChannel, where: str) -> dict:
+    if where == "threads":
+        # Archived threads are not cached; an active thread wins over an archived one of the same name
+        existing = {thread.name: thread async for thread in parent.archived_threads(limit=None)}
+        existing.update((thread.name, thread) for thread in parent.threads)
+        return existing
+    return {channel.name: channel for channel in parent.guild.text_channels if channel.category_id == parent.category_id}
+
+# Function to reuse or create the thread (or channel next to this one) a matchup is played in
+async def matchup_channel(parent: discord.TextChannel, existing: dict, name: str, where: str):
+    if where == "threads":
+        if name in existing:
+            return existing[name]
+        return await parent.create_thread(
+            name=name, type=discord.ChannelType.public_thread, reason="Round setup")
+
+    slug = channel_slug(name)
+    if slug in existing:
+        return existing[slug]
+    return await parent.guild.create_text_channel(slug, category=parent.category, reason="Round setup")
+
+# Function to render the status message of a round's setup
+def round_status(tournament: Tournament, round_name: str, progress: RoundProgress) -> str:
+    header = (
+        f"**{round_name}** of **{tournament.full_name}**: "
+        f"{progress.count(STARTED)} of {len(progress.names)} map selections started"
+        + (f", {progress.count(SKIPPED)} skipped" if progress.count(SKIPPED) else "")
+        + (f", {progress.count(FAILED)} failed" if progress.count(FAILED) else "")
+        + ("" if progress.finished == len(progress.names) else "...")
+    )
+    return header + "\n" + bounded_list(progress.lines(), limit=2000 - len(header) - 1)
+
+# Function to describe a logged selection event in a replay
+def describe_event(tournament: Tournament | None, event: events.Event) -> str:
+    def team(name: str) -> str:
+        return f"**{(trim_team_name(tournament, name) if tournament else None) or name}**"
+
+    data = event.data
+    override = " (override)" if data.get("override") else ""
+    if event.kind == events.START:
+        text = f"Match started: {team(data["teams"][0])} vs {team(data["teams"][1])}"
+    elif event.kind == events.COIN_TOSS:
+        text = f"{team(data["winner"])} won the coin toss (seed `{data["seed"]}`)"
+    elif event.kind == events.ORDER_CHOSEN:
+        text = f"{team(data["team"])} chose to {"ban first" if data["first_to_ban"] == data["team"] else "ban second"}{override}"
+    elif event.kind == events.BAN:
+        text = f"{team(data["team"])} banned `{data["map"]}`{override}"
+    elif event.kind == events.PICK and data["wildcard"]:
+        text = f"{team(data["team"])} invoked the Wildcard: `{data["map"]}` (seed `{data["seed"]}`){override}"
+    elif event.kind == events.PICK:
+        text = f"{team(data["team"])} picked `{data["map"]}`{override}"
+    elif event.kind == events.VOTE:
+        text = f"{" and ".join(team(name) for name in data["teams"])} voted for the {data["pool"]} map pool{override}"
+    elif event.kind == events.DECIDE:
+        text = f"Final map drawn: `{data["map"]}` (seed `{data["seed"]}`)"
+    elif event.kind == events.DONE:
+        text = "Match is ready to go"
+    elif event.kind == events.CLEARED:
+        text = "Map selection cleared"
+    else:
+        text = "Map selection timed out"
+
+    by = f" by <@{event.user_id}>" if event.user_id and event.kind not in (events.START, events.COIN_TOSS) else ""
+    return f"`{event.seq}` {text}{by}"
 
 # Function to check if user belongs to a team
-def user_is_on_team(member: discord.Member, team_name: str):
-    if team_name in ["Mixed Team", "Mixed Team A", "Mixed Team B"]:
-        return True
-
-    team_name_lower = team_name.lower()
-    if any(role.name.lower() == team_name_lower for role in member.roles):
-        return True
-
-    team_role_id = TEAM_ROLES[team_name]["id"]
-    if any(role.id == team_role_id for role in member.roles):
-        return True
-
-# Function to build and send the embed with the match details
-async def send_summary_embed(interaction: discord.Interaction, selection_state):
-    team1 = selection_state["teams"]["team1"]
-    team2 = selection_state["teams"]["team2"]
-    first_to_ban = selection_state["ban_order"][0]
-    second_to_ban = selection_state["ban_order"][1]
-
-    team1_ban = selection_state["bans"]["team1"]
-    team2_ban = selection_state["bans"]["team2"]
-    team1_pick = selection_state["picks"]["team1"]
-    team2_pick = selection_state["picks"]["team2"]
+def user_is_on_team(tournament: Tournament, member: discord.Member, team_name: str):
+    return role_index.access(member, tournament).on_team(team_name)
+
+# Instructions for the team acting on the current turn
+def turn_prompt(selection_state: SelectionState) -> str:
+    tournament = selection_state.tournament
+
+    if selection_state.phase == BAN:
+        return f"**{trim_team_name(tournament, selection_state.acting_team)}**, please ban a map using **`/map_ban`**."
+    if selection_state.phase == PICK:
+        return f"**{trim_team_name(tournament, selection_state.acting_team)}**, please pick a map using **`/map_pick`**."
+
+    team1, team2 = selection_state.teams
+    return (
+        "The final map will be randomly selected from one of the following map pools, according to both teams' choice:\n- "
+        f"{"\n- ".join(tournament.map_pools)}\n\n"
+        f"**{trim_team_name(tournament, team1)}** and **{trim_team_name(tournament, team2)}** can finalize the map selection process by using **`/map_final`**.\n\n"
+        "-# To invoke the Wildcard, both teams must agree. Otherwise, the selection will default to the Standard map pool.")
+
+# Function to announce the next turn after an order, ban or pick (the bot draws the final map itself if there is only one map pool)
+async def announce_turn(interaction: discord.Interaction, selection_state: SelectionState, message: str, finished: str):
+    phase = selection_state.phase
+    if phase != finished and finished in PHASE_COMPLETE:
+        message += f":ballot_box_with_check: {PHASE_COMPLETE[finished]}\n\n"
+
+    if phase in (BAN, PICK):
+        await interaction.response.send_message(message + turn_prompt(selection_state))
+        return
+
+    await interaction.response.send_message(message)
+
+    if phase == FINAL and len(selection_state.tournament.map_pools) > 1:
+        await interaction.followup.send(turn_prompt(selection_state))
+        return
+
+    if phase == FINAL:
+        final_map, seed = seeded_choice(list(selection_state.remaining_maps))
+        selection_state.decide(final_map)
+        record_event(selection_state, events.DECIDE, map=final_map, pool=None, seed=seed)
+        state_changed(interaction.channel_id)
+
+        reveals.add(
+            interaction.channel_id, reveal_delay(interaction.guild_id, selection_state.tournament, FINAL_DRAW_DELAY),
+            "Randomly selecting the final map...")
+
+    await send_summary_embed(interaction, selection_state)
+
+# Function to build the embed with the match details and post it after the pacing delay
+async def send_summary_embed(interaction: discord.Interaction, selection_state: SelectionState):
+    tournament = selection_state.tournament
+    random_map = selection_state.random_map
 
     # Confirm match details in an embed
     embed = discord.Embed(
-        title=f"{team1} vs {team2}",
+        title=" vs ".join(selection_state.teams),
         description=":white_check_mark: Match is ready to go!",
         colour=discord.Colour.from_rgb(252, 155, 40)
         )
 
-    # Add fields to the embed for picks...
-    first_map = f"{get_base_name(team1_pick)} `{team1_pick}`" if team1 == second_to_ban else f"{get_base_name(team2_pick)} `{team2_pick}`"
-    second_map = f"{get_base_name(team2_pick)} `{team2_pick}`" if team2 == first_to_ban else f"{get_base_name(team1_pick)} `{team1_pick}`"
-    third_map = f"{get_base_name(selection_state["random_map"])} `{selection_state["random_map"]}`"
+    # Add fields to the embed for picks (in pick order, then the random map)...
+    maps = [f"{get_base_name(tournament, pick)} `{pick}`" for pick in selection_state.picks]
+    picked_by = [trim_team_name(tournament, team) for team in selection_state.teams_for(PICK)]
 
-    embed_maps = (
-        f"1. {first_map}\n"
-        f"2. {second_map}\n"
-        f"3. {third_map}"
-        )
+    if random_map:
+        if len(tournament.map_pools) > 1:
+            pool_info = f" ({tournament.maps[random_map].map_pool})"
+        else:
+            pool_info = ""
 
-    if len(selection_state["map_pools"]) > 1:
-        pool_info = f" ({MAP_POOL[selection_state["random_map"]]["map_pool"]})"
-    else:
-        pool_info = ""
+        maps.append(f"{get_base_name(tournament, random_map)} `{random_map}`")
+        picked_by.append(f"*Random*{pool_info}")
 
-    embed_teams = (
-        f"1. {trim_team_name(second_to_ban)}\n"
-        f"2. {trim_team_name(first_to_ban)}\n"
-        f"3. *Random*{pool_info}"
-        )
+    embed_maps = "\n".join(f"{i}. {map_name}" for i, map_name in enumerate(maps, start=1))
+    embed_teams = "\n".join(f"{i}. {team}" for i, team in enumerate(picked_by, start=1))
 
     embed.add_field(name="\u00AD", value="\u00AD", inline=False)
 
@@ -197,24 +399,89 @@ async def send_summary_embed(interaction: discord.Interaction, selection_state):
     embed.add_field(name="\u00AD", value="\u00AD", inline=False)
 
     # ...and bans
-    embed.add_field(name=f"{trim_team_name(team1)} Ban", value=f"{get_base_name(team1_ban)} `{team1_ban}`", inline=True)
-    embed.add_field(name=f"{trim_team_name(team2)} Ban", value=f"{get_base_name(team2_ban)} `{team2_ban}`", inline=True)
-
-    await asyncio.sleep(2)
-    await interaction.followup.send(embed=embed)
-
+    banned_by = selection_state.teams_for(BAN)
+    for team in selection_state.teams:
+        team_bans = [ban for ban, banning_team in zip(selection_state.bans, banned_by) if banning_team == team]
+        if team_bans:
+            embed.add_field(
+                name=f"{trim_team_name(tournament, team)} {"Ban" if len(team_bans) == 1 else "Bans"}",
+                value="\n".join(f"{get_base_name(tournament, ban)} `{ban}`" for ban in team_bans),
+                inline=True)
+
+    reveals.add(interaction.channel_id, reveal_delay(interaction.guild_id, tournament, SUMMARY_DELAY), embed=embed)
+
+    record_event(selection_state, events.DONE)
+    match_archive.add(CompletedMatch.from_state(selection_state, interaction.guild_id, time.time()))
     state_handler.pop(interaction.channel_id, None)
+    state_changed(interaction.channel_id)
 
 class Tourney(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # Shared with other cogs through bot.get_cog("Tourney") (importing them from this module would bind
+        # separate copies, since load_extension executes the module anew)
+        self.registry = registry
+        self.autocomplete_cache = autocomplete_cache
+
+    # Organizer check for other cogs, against the role index kept by this module's listeners
+    def is_organizer(self, member: discord.abc.User) -> bool:
+        return has_admin_privileges(member)
+
+    async def cog_load(self):
+        restore_state(self.bot)
+        self.reload_tournaments.start()
+
+    async def cog_unload(self):
+        self.reload_tournaments.cancel()
+
+    # Pick up added, edited or removed tournament files without a restart
+    @tasks.loop(seconds=TOURNAMENT_RELOAD_INTERVAL)
+    async def reload_tournaments(self):
+        if registry.refresh():
+            autocomplete_cache.clear()
+
+    # Keep the role index in step with member and role changes
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.roles != after.roles:
+            role_index.invalidate_member(after.guild.id, after.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        role_index.invalidate_member(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        role_index.role_created(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        role_index.role_deleted(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        role_index.role_updated(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        role_index.index_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        role_index.forget_guild(guild.id)
 
     # Command to clear the selection state
     @app_commands.command(name="clear", description="Clears the map selection state")
+    @instrumented("command")
     async def clear_command(self, interaction: discord.Interaction):
         get_state(interaction.channel_id)
 
-        state_handler.pop(interaction.channel_id, None)
+        selection_state = state_handler.pop(interaction.channel_id)
+        record_event(selection_state, events.CLEARED, interaction.user)
+        state_changed(interaction.channel_id)
+        # A finished selection is already gone from the channel, so its summary still gets posted
+        if selection_state.tournament:
+            reveals.cancel(interaction.channel_id)
         await clear_timeout(interaction.channel_id)
         await interaction.response.send_message(
             "Map selection has been cleared. Use `/match` to start again.")
@@ -222,48 +489,33 @@ class Tourney(commands.Cog):
     # Command to start map selection, with team assignment and coin toss
     @app_commands.command(name="match", description="Set the tournament and opposing teams for a match")
     @discord.app_commands.describe(pool="Name of map pool you want to select from", team1="Name of team 1", team2="Name of team 2")
+    @instrumented("command")
     async def match_command(self, interaction: discord.Interaction, pool: str, team1: str, team2: str):
-        selection_state = get_state(interaction.channel_id)
-
-        # Dynamically import dictionary of map pool based on user input
+        # Dynamically import and compile the tournament based on user input
         try:
-            for name, full_name, _, map_pools in tournaments:
-                if pool.lower() == name.lower() or pool.lower() == full_name.lower():
-                    module_name = name
-                    break
-
-            tournament = importlib.import_module(f"tournaments.{module_name}")
-
-            global MAP_POOL
-            MAP_POOL = tournament.MAP_POOL
-
-            global TEAM_ROLES
-            TEAM_ROLES = tournament.TEAM_ROLES
+            tournament = registry.get(pool)
+            if tournament is None:
+                raise ImportError(pool)
 
         except ImportError:
             await interaction.response.send_message(
                 f"ImportError: Could not import the map pool: {pool}.", ephemeral=True)
             return
 
-        except AttributeError:
+        except TournamentError as e:
+            log.error("Could not compile tournament %s: %s", pool, e)
             await interaction.response.send_message(
-                "AttributeError: Does not contain a valid map pool.", ephemeral=True)
+                f"TournamentError: {e}", ephemeral=True)
             return
 
-        resolved_team1 = resolve_team_name(team1)
-        resolved_team2 = resolve_team_name(team2)
+        resolved_team1 = resolve_team_name(tournament, team1)
+        resolved_team2 = resolve_team_name(tournament, team2)
 
         # If user is not an organizer they should be in one of the opposing teams
-        if not has_admin_privileges(interaction.user):
-            user_role_ids = {role.id for role in interaction.user.roles}
-
-            user_teams = [
-                name for name, info in TEAM_ROLES.items()
-                if info["id"] in user_role_ids
-            ]
-
-            if not (user_is_on_team(interaction.user, resolved_team1)
-                    or user_is_on_team(interaction.user, resolved_team2)
+        access = role_index.access(interaction.user, tournament)
+        if not access.admin:
+            if not (access.on_team(resolved_team1)
+                    or access.on_team(resolved_team2)
                     or "Mixed Team" in {resolved_team1, resolved_team2}):
                 await interaction.response.send_message(
                     "You must belong to one of the selected teams. Otherwise, pick \"Mixed Team\".", ephemeral=True)
@@ -279,124 +531,84 @@ class Tourney(commands.Cog):
                 "Mirror matches are not supported", ephemeral=True)
             return
 
-        # Initialize selection state with assigned teams
-        selection_state["teams"] = {"team1": resolved_team1, "team2": resolved_team2}
-        selection_state["coin_toss_winner"] = None
-        selection_state["ban_order"] = None
-        selection_state["bans"] = {"team1": None, "team2": None}
-        selection_state["picks"] = {"team1": None, "team2": None}
-        selection_state["map_pools"] = map_pools
-        selection_state["remaining_maps"] = MAP_POOL.copy()
-        selection_state["final_map_pool"] = {"team1": None, "team2": None}
-        selection_state["random_map"] = None
-
-        # Announce coin toss winner
-        selection_state["coin_toss_winner"] = random.choice([resolved_team1, resolved_team2])
-
-        if resolved_team1 == resolved_team2:
-            coin_toss_winner = selection_state["coin_toss_winner"]
-        else:
-            coin_toss_winner = trim_team_name(selection_state['coin_toss_winner'])
-
-        await interaction.response.send_message(
-            f"**{resolved_team1}** vs **{resolved_team2}**\n\n"
-            f"Map selection started! The tournament is **{pool}**.\n\n"
-            "Performing a coin toss to determine which team decides the ban order...")
-
-        await asyncio.sleep(2)
-        await interaction.followup.send(
-            f"{random.choice([":coin:", ":older_man:", ":church:"])} **{coin_toss_winner}** wins the coin toss! Pick your team's ban/pick order using **`/order`**")
-
-        server_role_ids = {role.id for role in interaction.guild.roles}
-        server_role_names_lower = {role.name.lower() for role in interaction.guild.roles}
-
-        missing_roles = [
-            name for name, info in TEAM_ROLES.items()
-            if info["id"] not in server_role_ids and name.lower() not in server_role_names_lower
-        ]
-
-        if missing_roles:
-            await interaction.followup.send(
-                "**WARNING: The following team roles are missing from your server:**\n- "
-                + "\n- ".join(missing_roles))
-
-        # Restarts the timeout counter when a command is used on time
-        reset_timeout_counter(interaction.channel_id, interaction)
+        opening, coin_toss = begin_selection(
+            interaction.channel_id, interaction.guild, interaction.user, tournament, pool, resolved_team1, resolved_team2)
+        await interaction.response.send_message(opening)
+        announce_coin_toss(interaction.channel_id, interaction.guild_id, tournament, coin_toss)
 
     # Show user choice of tournaments
     @match_command.autocomplete('pool')
+    @instrumented("autocomplete")
     async def match_pool_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str,
     ) -> list[discord.app_commands.Choice[str]]:
 
-        options = [full_name for _, full_name, _, _ in tournaments][:2]
-        return [
-            discord.app_commands.Choice(name=opt, value=opt)
-            for opt in options if current.lower() in opt
-        ]
+        return autocomplete_cache.get(
+            interaction.channel_id, "pool", current, lambda: registry.pool_choices.search(current))
 
     # Show user choice of teams
     @match_command.autocomplete('team1')
+    @instrumented("autocomplete")
     async def match_team1_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str,
     ) -> list[discord.app_commands.Choice[str]]:
 
-        pool_name = interaction.namespace.pool.lower()
-        module_name = next(name for name, full_name, _, _ in tournaments if pool_name == full_name.lower())
-        tournament = importlib.import_module(f"tournaments.{module_name}")
-        TEAM_ROLES = tournament.TEAM_ROLES
+        try:
+            tournament = registry.get(interaction.namespace.pool)
+        except TournamentError:
+            return []
+        if tournament is None:
+            return []
 
-        options = list(TEAM_ROLES.keys()) + ["Mixed Team"]
-        return [
-            discord.app_commands.Choice(name=opt, value=opt)
-            for opt in options if current.lower() in opt
-        ]
+        return autocomplete_cache.get(
+            interaction.channel_id, ("team", tournament.key), current, lambda: tournament.team_choices.search(current))
 
     @match_command.autocomplete('team2')
+    @instrumented("autocomplete")
     async def match_team2_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str,
     ) -> list[discord.app_commands.Choice[str]]:
 
-        pool_name = interaction.namespace.pool.lower()
-        module_name = next(name for name, full_name, _, _ in tournaments if pool_name == full_name.lower())
-        tournament = importlib.import_module(f"tournaments.{module_name}")
-        TEAM_ROLES = tournament.TEAM_ROLES
+        try:
+            tournament = registry.get(interaction.namespace.pool)
+        except TournamentError:
+            return []
+        if tournament is None:
+            return []
 
-        options = list(TEAM_ROLES.keys()) + ["Mixed Team"]
-        return [
-            discord.app_commands.Choice(name=opt, value=opt)
-            for opt in options if current.lower() in opt
-        ]
+        return autocomplete_cache.get(
+            interaction.channel_id, ("team", tournament.key), current, lambda: tournament.team_choices.search(current))
 
     # Command for the coin toss winner to pick the ban order
     @app_commands.command(name='order', description='Choose whether your team bans first or second')
     @discord.app_commands.describe(choice="Ban first and pick second OR ban second and pick first", override="Organizers can override this phase")
+    @instrumented("command")
     async def order_command(self, interaction: discord.Interaction, choice: str, override: str = "No"):
         selection_state = get_state(interaction.channel_id)
+        tournament = selection_state.tournament
+        coin_toss_winner = selection_state.coin_toss_winner
 
-        team1 = selection_state["teams"]["team1"]
-        team2 = selection_state["teams"]["team2"]
-
-        if selection_state["coin_toss_winner"] is None:
+        if coin_toss_winner is None:
             await interaction.response.send_message(
                 "No coin toss winner! Please use `/match` first to select teams.", ephemeral=True)
             return
 
-        if selection_state["ban_order"]:
+        if selection_state.after(ORDER):
             await interaction.response.send_message(
                 "The ban order has already been decided!", ephemeral=True)
             return
 
         # Check if user is part of the team that won the coin toss
-        if not user_is_on_team(interaction.user, selection_state["coin_toss_winner"]) and not has_admin_privileges(interaction.user):
+        access = role_index.access(interaction.user, tournament)
+        if not access.on_team(coin_toss_winner) and not access.admin:
             await interaction.response.send_message(
-                f"Only a member of **{trim_team_name(selection_state['coin_toss_winner'])}** can decide the ban/pick order.",
+                f"Only a member of **{trim_team_name(tournament, coin_toss_winner)}** can decide the ban/pick order.",
                 ephemeral=True)
             return
 
@@ -405,208 +617,168 @@ class Tourney(commands.Cog):
                 "Please choose one of the given options.", ephemeral=True)
             return
         
-        if not has_admin_privileges(interaction.user) and override == "Yes":
+        if not access.admin and override == "Yes":
             await interaction.response.send_message(
                 "Only organizers can override this phase!", ephemeral=True)
             return
 
-        if selection_state["coin_toss_winner"] == team1:
-            selection_state["ban_order"] = [team1, team2] if choice == "BAN first, PICK second" else [team2, team1]
-        else:
-            selection_state["ban_order"] = [team2, team1] if choice == "BAN first, PICK second" else [team1, team2]
+        team1, team2 = selection_state.teams
+        other_team = team2 if coin_toss_winner == team1 else team1
+        first_to_ban = coin_toss_winner if choice == "BAN first, PICK second" else other_team
+        selection_state.set_ban_order(first_to_ban)
+        record_event(
+            selection_state, events.ORDER_CHOSEN, interaction.user,
+            first_to_ban=first_to_ban, team=coin_toss_winner, override=override == "Yes")
+        state_changed(interaction.channel_id)
 
-        await interaction.response.send_message(
-            f"{trim_team_name(selection_state["coin_toss_winner"])} has chosen to {choice.lower()}.\n\n"
-            f"**{trim_team_name(selection_state['ban_order'][0])}**, please ban a map using **`/map_ban`**.")
+        await announce_turn(
+            interaction, selection_state,
+            f"{trim_team_name(tournament, coin_toss_winner)} has chosen to {choice.lower()}.\n\n", ORDER)
 
         # Restarts the timeout counter when a command is used on time
-        reset_timeout_counter(interaction.channel_id, interaction)
+        reset_timeout_counter(interaction.channel_id)
 
     # Show user the two options (First or Second)
     @order_command.autocomplete('choice')
+    @instrumented("autocomplete")
     async def order_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str,
     ) -> list[discord.app_commands.Choice[str]]:
 
-        options = ["BAN first, PICK second", "BAN second, PICK first"]
-        return [
-            discord.app_commands.Choice(name=opt, value=opt)
-            for opt in options if current.lower() in opt
-        ]
+        return autocomplete_cache.get(
+            interaction.channel_id, "order", current, lambda: ORDER_CHOICES.search(current))
     
     # Show user the two options (Yes or No)
     @order_command.autocomplete('override')
+    @instrumented("autocomplete")
     async def order_override_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str,
     ) -> list[discord.app_commands.Choice[str]]:
 
-        options = ["Yes","No"]
-        return [
-            discord.app_commands.Choice(name=opt, value=opt)
-            for opt in options if current.lower() in opt
-        ]
+        return autocomplete_cache.get(
+            interaction.channel_id, "override", current, lambda: OVERRIDE_CHOICES.search(current))
 
     # Command for banning maps
     @app_commands.command(name='map_ban', description='Ban a map')
     @discord.app_commands.describe(map="Select a map to ban", override="Organizers can override this phase")
+    @instrumented("command")
     async def map_ban_command(self, interaction: discord.Interaction, map: str, override: str = "No"):
         selection_state = get_state(interaction.channel_id)
-
-        team1 = selection_state["teams"]["team1"]
-        team2 = selection_state["teams"]["team2"]
+        tournament = selection_state.tournament
 
         # Validate the ban order
-        if not selection_state["ban_order"]:
+        if selection_state.before(BAN):
             await interaction.response.send_message(
                 "The ban order hasn't been decided yet! Use `/order` to decide the ban order.", ephemeral=True)
             return
 
-        first_to_ban = selection_state["ban_order"][0]
-        second_to_ban = selection_state["ban_order"][1]
-
-        team1_ban = selection_state["bans"]["team1"]
-        team2_ban = selection_state["bans"]["team2"]
-
-        # Determine the banning team
-        banning_team = None
-
-        if not team1_ban and not team2_ban:
-            banning_team = first_to_ban
-
-        # Checks if the correct team has banned first and resets the ban phase if not
-        elif (not team1_ban and team2_ban and team1 == first_to_ban) or (team1_ban and not team2_ban and team2 == first_to_ban):
-            selection_state["bans"] = {"team1": None, "team2": None}
-            selection_state["remaining_maps"] = MAP_POOL.copy()
-            await interaction.response.send_message(
-                "Illegal selection state detected. Resetting ban phase.\n\n"
-                f"**{trim_team_name(selection_state['ban_order'][0])}**, please ban a map using **`/map_ban`**.")
-            return
-
-        elif (team1_ban and not team2_ban) or (not team1_ban and team2_ban):
-            banning_team = second_to_ban
-
-        if banning_team is None:
+        if selection_state.phase != BAN:
             await interaction.response.send_message(
                 "You cannot ban any more maps.", ephemeral=True)
             return
 
         # Allow only the current team to ban
-        if not user_is_on_team(interaction.user, banning_team) and not has_admin_privileges(interaction.user):
+        banning_team = selection_state.acting_team
+        access = role_index.access(interaction.user, tournament)
+        if not access.on_team(banning_team) and not access.admin:
             await interaction.response.send_message(
-                f"Only {trim_team_name(banning_team)} can ban right now.", ephemeral=True)
+                f"Only {trim_team_name(tournament, banning_team)} can ban right now.", ephemeral=True)
             return
         
-        if not has_admin_privileges(interaction.user) and override == "Yes":
+        if not access.admin and override == "Yes":
             await interaction.response.send_message(
                 "Only organizers can override this phase!", ephemeral=True)
             return
 
-        banning_team_key = "team1" if banning_team == team1 else "team2"
-
-        if selection_state["bans"][banning_team_key]:
-            await interaction.response.send_message(
-                f"{trim_team_name(banning_team)} has already banned a map!", ephemeral=True)
-            return
-
-        standard_maps = [map_key for map_key, map_info in selection_state["remaining_maps"].items() if map_info["map_pool"] == "Standard"]
-        banned_map = resolve_map_name(map)
+        standard_maps = [map_key for map_key, map_info in selection_state.remaining_maps.items() if map_info.map_pool == "Standard"]
+        banned_map = resolve_map_name(tournament, map)
 
         if banned_map not in standard_maps:
             await interaction.response.send_message(
                 "Please choose a remaining map from the Standard map pool:\n" + "\n".join([f"- {map}" for map in standard_maps]))
             return
 
-        selection_state["bans"][f"{banning_team_key}"] = banned_map
-        selection_state["remaining_maps"].pop(banned_map)
+        selection_state.ban(banned_map)
+        record_event(
+            selection_state, events.BAN, interaction.user, map=banned_map, team=banning_team, override=override == "Yes")
+        state_changed(interaction.channel_id)
 
-        if not all(selection_state["bans"].values()):
-            next_team = second_to_ban if banning_team == first_to_ban else first_to_ban
-            await interaction.response.send_message(
-                f"{trim_team_name(banning_team)} has banned: **{banned_map}**\n\n"
-                f"**{trim_team_name(next_team)}**, please ban a map using **`/map_ban`**.")
-
-        elif all(selection_state["bans"].values()):
-            picking_team = second_to_ban
-            await interaction.response.send_message(
-                f"{trim_team_name(banning_team)} has banned: **{banned_map}**\n\n"
-                ":ballot_box_with_check: Banning phase complete!\n\n"
-                f"**{trim_team_name(picking_team)}**, please pick a map using **`/map_pick`**.")
+        await announce_turn(
+            interaction, selection_state,
+            f"{trim_team_name(tournament, banning_team)} has banned: **{banned_map}**\n\n", BAN)
 
         # Restarts the timeout counter when a command is used on time
-        reset_timeout_counter(interaction.channel_id, interaction)
+        reset_timeout_counter(interaction.channel_id)
 
     # Show user the choice of maps to ban
     @map_ban_command.autocomplete('map')
+    @instrumented("autocomplete")
     async def map_ban_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str,
     ) -> list[discord.app_commands.Choice[str]]:
         selection_state = get_state(interaction.channel_id)
+        tournament = selection_state.tournament
+        if selection_state.phase != BAN:
+            return []
+
+        def compute():
+            standard_maps = {map_key for map_key, map_info in selection_state.remaining_maps.items() if map_info.map_pool == "Standard"}
+            return tournament.map_choices.search(current, allowed=standard_maps)
 
-        options = [map_key for map_key, map_info in selection_state["remaining_maps"].items() if map_info["map_pool"] == "Standard"]
-        return [
-            discord.app_commands.Choice(name=opt, value=opt)
-            for opt in options if current.lower() in opt
-        ]
+        return autocomplete_cache.get(interaction.channel_id, "map_ban", current, compute)
     
     # Show user the two options (Yes or No)
     @map_ban_command.autocomplete('override')
+    @instrumented("autocomplete")
     async def map_ban_override_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str,
     ) -> list[discord.app_commands.Choice[str]]:
 
-        options = ["Yes","No"]
-        return [
-            discord.app_commands.Choice(name=opt, value=opt)
-            for opt in options if current.lower() in opt
-        ]
+        return autocomplete_cache.get(
+            interaction.channel_id, "override", current, lambda: OVERRIDE_CHOICES.search(current))
 
     # Command for picking maps
     @app_commands.command(name="map_pick", description='Pick a map')
     @discord.app_commands.describe(map="Select a map to pick", override="Organizers can override this phase")
+    @instrumented("command")
     async def map_pick_command(self, interaction: discord.Interaction, map: str, override: str = "No"):
         selection_state = get_state(interaction.channel_id)
+        tournament = selection_state.tournament
 
-        team1 = selection_state["teams"]["team1"]
-        team2 = selection_state["teams"]["team2"]
-
-        if not all(selection_state["bans"].values()):
+        if selection_state.before(PICK):
             await interaction.response.send_message(
                 "Teams must complete the banning phase first.", ephemeral=True)
             return
 
-        first_to_ban = selection_state["ban_order"][0]
-        second_to_ban = selection_state["ban_order"][1]
-
-        # Determine the picking team
-        if not any(selection_state["picks"].values()):
-            picking_team = second_to_ban
-        else:
-            picking_team = first_to_ban
+        if selection_state.phase != PICK:
+            await interaction.response.send_message(
+                "You cannot pick any more maps.", ephemeral=True)
+            return
 
-        # Allow only the current team to ban
-        if not user_is_on_team(interaction.user, picking_team) and not has_admin_privileges(interaction.user):
+        # Allow only the current team to pick
+        picking_team = selection_state.acting_team
+        access = role_index.access(interaction.user, tournament)
+        if not access.on_team(picking_team) and not access.admin:
             await interaction.response.send_message(
-                f"Only {trim_team_name(picking_team)} can pick a map right now.", ephemeral=True)
+                f"Only {trim_team_name(tournament, picking_team)} can pick a map right now.", ephemeral=True)
             return
         
-        if not has_admin_privileges(interaction.user) and override == "Yes":
+        if not access.admin and override == "Yes":
             await interaction.response.send_message(
                 "Only organizers can override this phase!", ephemeral=True)
             return
 
-        team_key = "team1" if picking_team == team1 else "team2"
-
         if "INVOKE WILDCARD" in map:
 
-            wildcard_maps = [map_key for map_key, map_info in selection_state["remaining_maps"].items() if map_info["map_pool"] == "Wildcard"]
+            wildcard_maps = [map_key for map_key, map_info in selection_state.remaining_maps.items() if map_info.map_pool == "Wildcard"]
 
             if not wildcard_maps:
                 await interaction.response.send_message(
@@ -614,12 +786,13 @@ class Tourney(commands.Cog):
                 return
 
             else:
-                picked_map = random.choice(wildcard_maps)
+                picked_map, seed = seeded_choice(wildcard_maps)
                 added_text = "invoked the Wildcard! Their pick will be"
 
         else:
-            picked_map = resolve_map_name(map)
-            standard_maps = [map_key for map_key, map_info in selection_state["remaining_maps"].items() if map_info["map_pool"] == "Standard"]
+            picked_map = resolve_map_name(tournament, map)
+            seed = None
+            standard_maps = [map_key for map_key, map_info in selection_state.remaining_maps.items() if map_info.map_pool == "Standard"]
             added_text = "picked"
 
             if picked_map not in standard_maps:
@@ -627,109 +800,93 @@ class Tourney(commands.Cog):
                     "Please choose a remaining map from the pool:\n" + "\n".join([f"- {map}" for map in standard_maps] + ["- INVOKE WILDCARD"]))
                 return
 
-        # Prevent a team from picking twice
-        if selection_state["picks"][team_key]:
-            await interaction.response.send_message(
-                f"{trim_team_name(picking_team)} has already picked a map: **{selection_state['picks'][team_key]}**. You cannot pick again.",
-                ephemeral=True)
-            return
-
         # Once map is validated, it is saved as a map pick and removed from the remaining map pool
-        selection_state["picks"][team_key] = picked_map
-        selection_state["remaining_maps"].pop(picked_map)
+        selection_state.pick(picked_map)
+        record_event(
+            selection_state, events.PICK, interaction.user,
+            map=picked_map, team=picking_team, wildcard=seed is not None, seed=seed, override=override == "Yes")
+        state_changed(interaction.channel_id)
 
-        if not all(selection_state["picks"].values()):
-            next_team = first_to_ban if picking_team == second_to_ban else second_to_ban
-            await interaction.response.send_message(
-                f"{trim_team_name(picking_team)} has {added_text}: **{picked_map}**\n\n"
-                f"**{trim_team_name(next_team)}**, please pick a map using **`/map_pick`**.")
-
-        if all(selection_state["picks"].values()):
-            await interaction.response.send_message(
-                f"{trim_team_name(picking_team)} has {added_text}: **{picked_map}**\n\n"
-                ":ballot_box_with_check: Picking phase complete!\n\n")
-            if len(selection_state["map_pools"]) == 1:
-                final_maps = list(selection_state["remaining_maps"].keys())
-                selection_state["random_map"] = random.choice(final_maps)
-
-                await asyncio.sleep(0.5)
-                await interaction.followup.send(
-                    "Randomly selecting the final map...")
-
-                await send_summary_embed(interaction, selection_state)
-
-            else:
-                await interaction.followup.send(
-                "The final map will be randomly selected from one of the following map pools, according to both teams' choice:\n- "
-                f"{"\n- ".join(selection_state['map_pools'])}\n\n"
-                f"**{trim_team_name(team1)}** and **{trim_team_name(team2)}** can finalize the map selection process by using **`/map_final`**.\n\n"
-                "-# To invoke the Wildcard, both teams must agree. Otherwise, the selection will default to the Standard map pool.")
+        await announce_turn(
+            interaction, selection_state,
+            f"{trim_team_name(tournament, picking_team)} has {added_text}: **{picked_map}**\n\n", PICK)
 
         # Restarts the timeout counter when a command is used on time
-        reset_timeout_counter(interaction.channel_id, interaction)
+        reset_timeout_counter(interaction.channel_id)
 
     # Show user the choice of maps to pick
     @map_pick_command.autocomplete('map')
+    @instrumented("autocomplete")
     async def map_pick_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str,
     ) -> list[discord.app_commands.Choice[str]]:
         selection_state = get_state(interaction.channel_id)
-
-        standard_maps = [map_key for map_key, map_info in selection_state["remaining_maps"].items() if map_info["map_pool"] == "Standard"]
-        options = standard_maps + (["INVOKE WILDCARD"] if "Wildcard" in selection_state["map_pools"] else [])
-        return [
-            discord.app_commands.Choice(name=opt, value=opt)
-            for opt in options if current.lower() in opt
-        ]
+        tournament = selection_state.tournament
+        if selection_state.phase != PICK:
+            return []
+
+        # Keep a slot free so the Wildcard option is never cut off by the choice limit
+        def compute():
+            standard_maps = {map_key for map_key, map_info in selection_state.remaining_maps.items() if map_info.map_pool == "Standard"}
+            if "Wildcard" not in tournament.map_pools:
+                return tournament.map_choices.search(current, allowed=standard_maps)
+            return tournament.map_choices.search(current, allowed=standard_maps, limit=MAX_CHOICES - 1) + WILDCARD_CHOICES.search(current)
+
+        return autocomplete_cache.get(interaction.channel_id, "map_pick", current, compute)
     
     # Show user the two options (Yes or No)
     @map_pick_command.autocomplete('override')
+    @instrumented("autocomplete")
     async def map_pick_override_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str,
     ) -> list[discord.app_commands.Choice[str]]:
 
-        options = ["Yes","No"]
-        return [
-            discord.app_commands.Choice(name=opt, value=opt)
-            for opt in options if current.lower() in opt
-        ]
+        return autocomplete_cache.get(
+            interaction.channel_id, "override", current, lambda: OVERRIDE_CHOICES.search(current))
 
     # Command for picking maps
     @app_commands.command(name="map_final", description='Choose whether the final map is from the Standard or Wildcard map pool')
     @discord.app_commands.describe(choice="Standard/Wildcard", override="Organizers can override this phase")
+    @instrumented("command")
     async def map_final_command(self, interaction: discord.Interaction, choice: str, override: str = "No"):
         selection_state = get_state(interaction.channel_id)
+        tournament = selection_state.tournament
 
-        team1 = selection_state["teams"]["team1"]
-        team2 = selection_state["teams"]["team2"]
+        if selection_state.before(PICK):
+            await interaction.response.send_message(
+                "Teams must complete the banning phase first.", ephemeral=True)
+            return
 
-        # Allow only the opposing teams to use the command
-        if not(
-            has_admin_privileges(interaction.user) or
-            user_is_on_team(interaction.user, team1) or
-            user_is_on_team(interaction.user, team2)
-        ):
+        if selection_state.before(FINAL):
             await interaction.response.send_message(
-                "You must belong to one of the opposing teams.", ephemeral=True)
+                "Teams must complete the picking phase first.", ephemeral=True)
             return
 
-        if not has_admin_privileges(interaction.user) and override == "Yes":
+        if selection_state.phase != FINAL:
             await interaction.response.send_message(
-                "Only organizers can override this phase!", ephemeral=True)
+                "The final map has already been selected.", ephemeral=True)
             return
 
-        if not all(selection_state["bans"].values()):
+        team1, team2 = selection_state.teams
+
+        # Allow only the opposing teams to use the command
+        access = role_index.access(interaction.user, tournament)
+        if not(
+            access.admin or
+            access.on_team(team1) or
+            access.on_team(team2)
+        ):
             await interaction.response.send_message(
-                "Teams must complete the banning phase first.", ephemeral=True)
+                "You must belong to one of the opposing teams.", ephemeral=True)
             return
 
-        if not all(selection_state["picks"].values()):
+        if not access.admin and override == "Yes":
             await interaction.response.send_message(
-                "Teams must complete the picking phase first.", ephemeral=True)
+                "Only organizers can override this phase!", ephemeral=True)
             return
 
         choice = choice.capitalize()
@@ -741,7 +898,7 @@ class Tourney(commands.Cog):
 
         # Function to check if a map pool has any maps remaining
         def pool_has_maps(pool):
-            return any(maps for maps in selection_state["remaining_maps"].values() if maps["map_pool"] == pool)
+            return any(maps for maps in selection_state.remaining_maps.values() if maps.map_pool == pool)
 
         # Validate the choice of map pool
         if not pool_has_maps(choice):
@@ -749,25 +906,33 @@ class Tourney(commands.Cog):
             return
 
         # Assign the selected choice of map pool to each team
-        if has_admin_privileges(interaction.user) and override == "Yes":
-            selection_state["final_map_pool"]["team1"] = choice
-            selection_state["final_map_pool"]["team2"] = choice
+        if access.admin and override == "Yes":
+            selection_state.final_map_pool[team1] = choice
+            selection_state.final_map_pool[team2] = choice
+            voting_teams = [team1, team2]
         else:
-            choosing_team_key = "team1" if user_is_on_team(interaction.user, team1) else "team2"
-            non_choosing_team_key = "team2" if user_is_on_team(interaction.user, team1) else "team1"
-            selection_state["final_map_pool"][choosing_team_key] = choice
+            choosing_team = team1 if access.on_team(team1) else team2
+            non_choosing_team = team2 if choosing_team == team1 else team1
+            selection_state.final_map_pool[choosing_team] = choice
+            voting_teams = [choosing_team]
+        record_event(
+            selection_state, events.VOTE, interaction.user, teams=voting_teams, pool=choice, override=override == "Yes")
+        state_changed(interaction.channel_id)
 
-        if selection_state["final_map_pool"]["team1"] and selection_state["final_map_pool"]["team2"]:
+        if len(selection_state.final_map_pool) == 2:
 
-            agreed_pool = "Wildcard" if selection_state["final_map_pool"]["team1"] == selection_state["final_map_pool"]["team2"] == "Wildcard" else "Standard"
+            agreed_pool = "Wildcard" if all(pool == "Wildcard" for pool in selection_state.final_map_pool.values()) else "Standard"
 
             # Pull the remaining maps in the selected map pool
             final_maps = [
-                map_key for map_key, map_info in selection_state["remaining_maps"].items()
-                if map_info["map_pool"] == agreed_pool
+                map_key for map_key, map_info in selection_state.remaining_maps.items()
+                if map_info.map_pool == agreed_pool
                 ]
 
-            selection_state["random_map"] = random.choice(final_maps)
+            final_map, seed = seeded_choice(final_maps)
+            selection_state.decide(final_map)
+            record_event(selection_state, events.DECIDE, map=final_map, pool=agreed_pool, seed=seed)
+            state_changed(interaction.channel_id)
 
             await interaction.response.send_message(
                 f"The final map will be from the __{agreed_pool}__ map pool!\n\n"
@@ -777,40 +942,350 @@ class Tourney(commands.Cog):
 
         else:
             await interaction.response.send_message(
-                f"{trim_team_name(selection_state['teams'][choosing_team_key])} wants to play a map from the __{choice}__ map pool.\n\n"
-                f"Waiting for **{trim_team_name(selection_state['teams'][non_choosing_team_key])}** to submit their preference using **`/map_final`**.")
+                f"{trim_team_name(tournament, choosing_team)} wants to play a map from the __{choice}__ map pool.\n\n"
+                f"Waiting for **{trim_team_name(tournament, non_choosing_team)}** to submit their preference using **`/map_final`**.")
 
         # Restarts the timeout counter when a command is used on time
-        reset_timeout_counter(interaction.channel_id, interaction)
+        reset_timeout_counter(interaction.channel_id)
 
     # Show user the choice of maps to pick
     @map_final_command.autocomplete('choice')
+    @instrumented("autocomplete")
     async def map_final_choice_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str,
     ) -> list[discord.app_commands.Choice[str]]:
         selection_state = get_state(interaction.channel_id)
+        tournament = selection_state.tournament
+        if selection_state.phase != FINAL:
+            return []
 
-        options = selection_state["map_pools"]
-        return [
-            discord.app_commands.Choice(name=opt, value=opt)
-            for opt in options if current.lower() in opt
-        ]
+        return autocomplete_cache.get(
+            interaction.channel_id, "map_final", current, lambda: tournament.pool_choices.search(current))
 
     # Show user the two options (Yes or No)
     @map_final_command.autocomplete('override')
+    @instrumented("autocomplete")
     async def map_final_override_autocomplete(
         self,
         interaction: discord.Interaction,
         current: str,
     ) -> list[discord.app_commands.Choice[str]]:
 
-        options = ["Yes","No"]
-        return [
-            discord.app_commands.Choice(name=opt, value=opt)
-            for opt in options if current.lower() in opt
-        ]
+        return autocomplete_cache.get(
+            interaction.channel_id, "override", current, lambda: OVERRIDE_CHOICES.search(current))
+
+    # Command for organizers to start the map selection of every matchup of a round, each in its own thread or channel
+    @app_commands.command(name="round", description="Organizers only: start map selection for every matchup of a round")
+    @discord.app_commands.describe(
+        pool="Name of the tournament",
+        pairings="Matchups separated by \";\", e.g. \"Team A vs Team B; Team C vs Team D\"",
+        file="Round of a pairings file next to the tournament file (e.g. round1 for <tournament>-round1.txt)",
+        where="Threads of this channel (default) or channels of this category")
+    @instrumented("command")
+    async def round_command(
+        self, interaction: discord.Interaction, pool: str,
+        pairings: str | None = None, file: str | None = None, where: str = "Threads",
+    ):
+        if not has_admin_privileges(interaction.user):
+            await interaction.response.send_message("Only organizers can start a round.", ephemeral=True)
+            return
+
+        try:
+            tournament = registry.get(pool)
+        except TournamentError as e:
+            await interaction.response.send_message(f"TournamentError: {e}", ephemeral=True)
+            return
+
+        if tournament is None:
+            await interaction.response.send_message(
+                f"ImportError: Could not import the map pool: {pool}.", ephemeral=True)
+            return
+
+        where = where.casefold()
+        if where not in ("threads", "channels"):
+            await interaction.response.send_message("Please choose Threads or Channels.", ephemeral=True)
+            return
+
+        parent = interaction.channel
+        if not isinstance(parent, discord.TextChannel):
+            await interaction.response.send_message("Please start rounds from a server text channel.", ephemeral=True)
+            return
+
+        if (pairings is None) == (file is None):
+            await interaction.response.send_message(
+                "Please give the round's pairings or the name of its pairings file (not both).", ephemeral=True)
+            return
+
+        # Read the pairings file next to the tournament file
+        if file is not None:
+            path = pairings_path(TOURNAMENTS_DIR, tournament.key, file)
+            try:
+                pairings = path.read_text(encoding="utf-8") if path else None
+            except OSError:
+                pairings = None
+            if pairings is None:
+                await interaction.response.send_message(
+                    f"Could not read the pairings file `{tournament.key}-{file}.txt`.", ephemeral=True)
+                return
+
+        # Resolve every team up front, so no selection starts unless the whole round is valid
+        matchups, errors = parse_pairings(pairings)
+        resolved = []
+        playing = set()
+        for team1, team2 in matchups:
+            resolved_team1 = resolve_team_name(tournament, team1)
+            resolved_team2 = resolve_team_name(tournament, team2)
+
+            unknown = [name for name, team in ((team1, resolved_team1), (team2, resolved_team2)) if not team]
+            if unknown:
+                errors.append(f"Team names are not recognized: {", ".join(unknown)}")
+                continue
+
+            if resolved_team1 == resolved_team2:
+                errors.append(f"Mirror matches are not supported: {resolved_team1}")
+                continue
+
+            repeated = sorted(({resolved_team1, resolved_team2} & playing) - MIXED_TEAMS)
+            if repeated:
+                errors.append(f"Plays more than one matchup: {", ".join(repeated)}")
+                continue
+
+            playing.update((resolved_team1, resolved_team2))
+            resolved.append((resolved_team1, resolved_team2))
+
+        if not matchups and not errors:
+            errors.append("No matchups found.")
+        if errors:
+            await interaction.response.send_message(
+                "The round was not started:\n" + bounded_list(errors, limit=1900), ephemeral=True)
+            return
+
+        round_name = file or "Round"
+        progress = RoundProgress([matchup_name(tournament, team1, team2) for team1, team2 in resolved])
+        await interaction.response.send_message(round_status(tournament, round_name, progress))
+        log.info("%s started %d matchup(s) of %s in %s", interaction.user, len(resolved), tournament.key, where)
+
+        # Edits of the status message are debounced; the final edit below always shows the whole round
+        status = CoalescingRefresher(
+            lambda _: interaction.edit_original_response(content=round_status(tournament, round_name, progress)),
+            ROUND_STATUS_DELAY)
+        existing = await matchup_channels(parent, where)
+        slots = asyncio.Semaphore(ROUND_CONCURRENCY)
+
+        async def start_matchup(index: int, team1: str, team2: str):
+            async with slots:
+                try:
+                    channel = await matchup_channel(parent, existing, progress.names[index], where)
+                except discord.HTTPException as e:
+                    log.warning("Could not create a channel for %s: %s", progress.names[index], e)
+                    progress.update(index, FAILED, e.text or "could not create the channel")
+                    status.request(interaction.id)
+                    return
+
+                current = state_handler.get(channel.id)
+                if current is not None and current.tournament:
+                    progress.update(index, SKIPPED, f"{channel.mention} already has a map selection in progress")
+                    status.request(interaction.id)
+                    return
+
+                opening, coin_toss = begin_selection(
+                    channel.id, interaction.guild, interaction.user, tournament, pool, team1, team2)
+                try:
+                    await channel.send(opening)
+                except discord.HTTPException as e:
+                    log.warning("Could not start the map selection in channel %s: %s", channel.id, e)
+                    record_event(state_handler.pop(channel.id), events.CLEARED)
+                    state_changed(channel.id)
+                    progress.update(index, FAILED, f"could not post in {channel.mention}")
+                    status.request(interaction.id)
+                    return
+
+                announce_coin_toss(channel.id, interaction.guild_id, tournament, coin_toss)
+                progress.update(index, STARTED, channel.mention)
+                status.request(interaction.id)
+
+        await asyncio.gather(*(start_matchup(index, team1, team2) for index, (team1, team2) in enumerate(resolved)))
+        await status.close()
+        await interaction.edit_original_response(content=round_status(tournament, round_name, progress))
+
+    @round_command.autocomplete('pool')
+    @instrumented("autocomplete")
+    async def round_pool_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str,
+    ) -> list[discord.app_commands.Choice[str]]:
+
+        return autocomplete_cache.get(
+            interaction.channel_id, "pool", current, lambda: registry.pool_choices.search(current))
+
+    @round_command.autocomplete('where')
+    @instrumented("autocomplete")
+    async def round_where_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str,
+    ) -> list[discord.app_commands.Choice[str]]:
+
+        return autocomplete_cache.get(
+            interaction.channel_id, "where", current, lambda: WHERE_CHOICES.search(current))
+
+    # Command for organizers to replay the logged events of a match and rebuild its selection state
+    @app_commands.command(name="replay", description="Organizers only: replay the map selection of a past match")
+    @discord.app_commands.describe(match="Match to replay", event="Rebuild the selection state as of this event (default: the last one)")
+    @instrumented("command")
+    async def replay_command(self, interaction: discord.Interaction, match: int, event: int | None = None):
+        if not has_admin_privileges(interaction.user):
+            await interaction.response.send_message("Only organizers can replay matches.", ephemeral=True)
+            return
+
+        record = await selection_log.load(match, event)
+        if record is None or record.guild_id != interaction.guild_id:
+            await interaction.response.send_message(f"There is no match #{match} in this server's selection log.", ephemeral=True)
+            return
+
+        # The timeline is shown even if the tournament file has since been removed or broken
+        try:
+            tournament = registry.get(record.tournament)
+        except TournamentError:
+            tournament = None
+
+        shown = [logged for logged in record.events if event is None or logged.seq <= event]
+        team1, team2 = record.teams
+        replay_embed = discord.Embed(title=f"**Match #{record.match_id}: {team1} vs {team2}**", color=0x2F3136)
+        replay_embed.description = f"**{record.tournament}** in <#{record.channel_id}>, started <t:{int(record.started_at)}:f>"
+        replay_embed.add_field(
+            name=f"Events ({len(shown)} of {len(record.events)})",
+            value=bounded_list([describe_event(tournament, logged) for logged in shown]) or "-", inline=False)
+
+        if tournament is None:
+            replay_embed.set_footer(text=f"The tournament {record.tournament} can no longer be loaded, so the state is not rebuilt.")
+            await interaction.response.send_message(embed=replay_embed, ephemeral=True)
+            return
+
+        try:
+            selection_state = events.replay(record, tournament, event)
+        except KeyError:
+            replay_embed.set_footer(text=f"The tournament {record.tournament} has changed since, so the state cannot be rebuilt.")
+            await interaction.response.send_message(embed=replay_embed, ephemeral=True)
+            return
+
+        def maps(map_keys: list[str]) -> str:
+            return "\n".join(f"{get_base_name(tournament, map_key)} `{map_key}`" for map_key in map_keys) or "-"
+
+        replay_embed.add_field(name="Bans", value=maps(selection_state.bans), inline=True)
+        replay_embed.add_field(name="Picks", value=maps(selection_state.picks), inline=True)
+        if selection_state.random_map:
+            replay_embed.add_field(name="Random map", value=maps([selection_state.random_map]), inline=True)
+
+        rebuilt_from = f"the snapshot at event {record.snapshot[0]}" if record.snapshot else "the start of the match"
+        replayed = sum(1 for logged in shown if logged.seq > (record.snapshot[0] if record.snapshot else 0))
+        replay_embed.set_footer(text=f"State rebuilt from {rebuilt_from} and {replayed} later event(s).")
+        await interaction.response.send_message(embed=replay_embed, ephemeral=True)
+
+    # Show organizers the latest matches of this server
+    @replay_command.autocomplete('match')
+    @instrumented("autocomplete")
+    async def replay_match_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str,
+    ) -> list[discord.app_commands.Choice[int]]:
+
+        if not has_admin_privileges(interaction.user):
+            return []
+
+        current = current.casefold().lstrip("#")
+        choices = []
+        for match_id, tournament, (team1, team2), started_at in await selection_log.recent(interaction.guild_id, limit=100):
+            name = f"#{match_id} {team1} vs {team2} ({tournament}, {time.strftime("%Y-%m-%d", time.gmtime(started_at))})"
+            if current in name.casefold():
+                choices.append(discord.app_commands.Choice(name=name[:100], value=match_id))
+        return choices[:MAX_CHOICES]
+
+    # Command for organizers to check which team roles of a tournament exist in the server
+    @app_commands.command(name="role_audit", description="Organizers only: list the team roles of a tournament missing from the server")
+    @discord.app_commands.describe(pool="Name of the tournament to audit")
+    @instrumented("command")
+    async def role_audit_command(self, interaction: discord.Interaction, pool: str):
+        if not has_admin_privileges(interaction.user):
+            await interaction.response.send_message("Only organizers can audit team roles.", ephemeral=True)
+            return
+
+        try:
+            tournament = registry.get(pool)
+        except TournamentError as e:
+            await interaction.response.send_message(f"TournamentError: {e}", ephemeral=True)
+            return
+
+        if tournament is None:
+            await interaction.response.send_message(
+                f"ImportError: Could not import the map pool: {pool}.", ephemeral=True)
+            return
+
+        missing_roles, matched_by_name = role_index.audit(interaction.guild, tournament)
+
+        audit_embed = discord.Embed(title=f"**Team Roles: {tournament.full_name}**", color=0x2F3136)
+        audit_embed.description = (
+            f"**{len(tournament.teams) - len(missing_roles)}** of **{len(tournament.teams)}** team roles found in this server.")
+        if missing_roles:
+            audit_embed.add_field(name="Missing", value=bounded_list(missing_roles), inline=False)
+        if matched_by_name:
+            audit_embed.add_field(
+                name="Found by name only (role ID differs from the tournament file)",
+                value=bounded_list(matched_by_name), inline=False)
+
+        await interaction.response.send_message(embed=audit_embed, ephemeral=True)
+
+    @role_audit_command.autocomplete('pool')
+    @instrumented("autocomplete")
+    async def role_audit_pool_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str,
+    ) -> list[discord.app_commands.Choice[str]]:
+
+        return autocomplete_cache.get(
+            interaction.channel_id, "pool", current, lambda: registry.pool_choices.search(current))
+
+    # Command for organizers to set how long the bot pauses before reveals in this server
+    @app_commands.command(name="pacing", description="Organizers only: set the pacing of coin toss and map reveals in this server")
+    @discord.app_commands.describe(mode="Dramatic, Normal, Instant (no pauses) or the tournament's default")
+    @instrumented("command")
+    async def pacing_command(self, interaction: discord.Interaction, mode: str):
+        if not has_admin_privileges(interaction.user):
+            await interaction.response.send_message("Only organizers can change the pacing.", ephemeral=True)
+            return
+
+        mode = mode.casefold()
+        if mode == "tournament default":
+            guild_pacing.pop(interaction.guild_id, None)
+            store.delete("pacing", interaction.guild_id)
+            await interaction.response.send_message(
+                "Reveals now follow each tournament's pacing.", ephemeral=True)
+            return
+
+        if mode not in PACING_MODES:
+            await interaction.response.send_message(
+                "Please choose one of the available pacing modes.", ephemeral=True)
+            return
+
+        guild_pacing[interaction.guild_id] = mode
+        store.put("pacing", interaction.guild_id, mode)
+        await interaction.response.send_message(f"Reveals in this server now use **{mode.capitalize()}** pacing.", ephemeral=True)
+
+    @pacing_command.autocomplete('mode')
+    @instrumented("autocomplete")
+    async def pacing_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str,
+    ) -> list[discord.app_commands.Choice[str]]:
+
+        return autocomplete_cache.get(
+            interaction.channel_id, "pacing", current, lambda: PACING_CHOICES.search(current))
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Tourney(bot))
@@ -0,0 +1,224 @@
+import asyncio
+from dataclasses import dataclass
+
+from .selection import BAN, PICK, SelectionState
+from .writebehind import WriteBehindDatabase
+
+# Actions of the maps of an archived match (bans and picks in turn order, then the random map)
+RANDOM = "random"
+
+# A finished map selection, as archived
+@dataclass(frozen=True, slots=True)
+class CompletedMatch:
+    match_id: int | None
+    guild_id: int
+    tournament: str
+    teams: tuple[str, str]
+    coin_toss_winner: str
+    first_to_ban: str
+    # (action, map, team) in the order they were made; the random map has no team
+    maps: tuple[tuple[str, str, str | None], ...]
+    final_pool: str | None
+    started_at: float | None
+    finished_at: float
+
+    @classmethod
+    def from_state(cls, selection_state: SelectionState, guild_id: int, finished_at: float) -> "CompletedMatch":
+        tournament = selection_state.tournament
+        maps = [(BAN, map_key, team) for map_key, team in zip(selection_state.bans, selection_state.teams_for(BAN))]
+        maps += [(PICK, map_key, team) for map_key, team in zip(selection_state.picks, selection_state.teams_for(PICK))]
+        final_pool = None
+        if selection_state.random_map:
+            maps.append((RANDOM, selection_state.random_map, None))
+            final_pool = tournament.maps[selection_state.random_map].map_pool
+
+        return cls(
+            selection_state.match_id, guild_id, tournament.key, selection_state.teams,
+            selection_state.coin_toss_winner, selection_state.ban_order[0], tuple(maps), final_pool,
+            selection_state.started_at, finished_at)
+
+# Totals of one team (over one tournament or all of them)
+@dataclass(frozen=True, slots=True)
+class TeamStats:
+    matches: int
+    coin_tosses_won: int
+    banned_first: int
+    # (map, bans, picks), most banned or picked first
+    maps: list[tuple[str, int, int]]
+
+# Totals of one map: how often it was banned, picked and drawn, and by which teams
+@dataclass(frozen=True, slots=True)
+class MapStats:
+    matches: int
+    bans: int
+    picks: int
+    random: int
+    # (team, bans, picks), most banned or picked first
+    teams: list[tuple[str, int, int]]
+
+# Indexed SQLite (WAL) archive of finished matches. Besides the matches and their maps, it keeps
+# per-tournament, per-team and per-map totals that are updated in the same transaction as each
+# insert, so statistics are read from a few small rows however long the history gets. Like the
+# state store, writes are committed behind the event loop in batches.
+class MatchArchive(WriteBehindDatabase):
+    SCHEMA = (
+        # Match IDs come from the selection log (matches started before it have none)
+        "CREATE TABLE IF NOT EXISTS matches ("
+        " archive_id INTEGER PRIMARY KEY,"
+        " match_id INTEGER UNIQUE,"
+        " guild_id INTEGER NOT NULL,"
+        " tournament TEXT NOT NULL,"
+        " team1 TEXT NOT NULL,"
+        " team2 TEXT NOT NULL,"
+        " coin_toss_winner TEXT NOT NULL,"
+        " first_to_ban TEXT NOT NULL,"
+        " final_pool TEXT,"
+        " started_at REAL,"
+        " finished_at REAL NOT NULL"
+        ");"
+        "CREATE INDEX IF NOT EXISTS matches_by_tournament ON matches (guild_id, tournament, finished_at);"
+        "CREATE INDEX IF NOT EXISTS matches_by_team1 ON matches (guild_id, team1, finished_at);"
+        "CREATE INDEX IF NOT EXISTS matches_by_team2 ON matches (guild_id, team2, finished_at);"
+        "CREATE TABLE IF NOT EXISTS match_maps ("
+        " archive_id INTEGER NOT NULL,"
+        " seq INTEGER NOT NULL,"
+        " action TEXT NOT NULL,"
+        " map TEXT NOT NULL,"
+        " team TEXT,"
+        " PRIMARY KEY (archive_id, seq)"
+        ") WITHOUT ROWID;"
+        "CREATE INDEX IF NOT EXISTS match_maps_by_map ON match_maps (map, action);"
+        # Aggregates, one row per key
+        "CREATE TABLE IF NOT EXISTS tournament_totals ("
+        " guild_id INTEGER NOT NULL,"
+        " tournament TEXT NOT NULL,"
+        " matches INTEGER NOT NULL,"
+        " PRIMARY KEY (guild_id, tournament)"
+        ") WITHOUT ROWID;"
+        "CREATE TABLE IF NOT EXISTS team_totals ("
+        " guild_id INTEGER NOT NULL,"
+        " tournament TEXT NOT NULL,"
+        " team TEXT NOT NULL,"
+        " matches INTEGER NOT NULL,"
+        " coin_tosses_won INTEGER NOT NULL,"
+        " banned_first INTEGER NOT NULL,"
+        " PRIMARY KEY (guild_id, tournament, team)"
+        ") WITHOUT ROWID;"
+        "CREATE TABLE IF NOT EXISTS map_totals ("
+        " guild_id INTEGER NOT NULL,"
+        " tournament TEXT NOT NULL,"
+        " map TEXT NOT NULL,"
+        " bans INTEGER NOT NULL,"
+        " picks INTEGER NOT NULL,"
+        " random INTEGER NOT NULL,"
+        " PRIMARY KEY (guild_id, tournament, map)"
+        ") WITHOUT ROWID;"
+        "CREATE TABLE IF NOT EXISTS team_map_totals ("
+        " guild_id INTEGER NOT NULL,"
+        " tournament TEXT NOT NULL,"
+        " team TEXT NOT NULL,"
+        " map TEXT NOT NULL,"
+        " bans INTEGER NOT NULL,"
+        " picks INTEGER NOT NULL,"
+        " PRIMARY KEY (guild_id, tournament, team, map)"
+        ") WITHOUT ROWID;"
+        "CREATE INDEX IF NOT EXISTS team_map_totals_by_map ON team_map_totals (guild_id, tournament, map);")
+    FLUSH_ERROR = "Could not archive %d match(es)"
+
+    def add(self, match: CompletedMatch):
+        self._pending.append(match)
+
+    def _apply(self, batch: list[CompletedMatch]):
+        for match in batch:
+            self._insert(match)
+
+    def _insert(self, match: CompletedMatch):
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO matches (match_id, guild_id, tournament, team1, team2, coin_toss_winner,"
+            " first_to_ban, final_pool, started_at, finished_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (match.match_id, match.guild_id, match.tournament, *match.teams, match.coin_toss_winner,
+             match.first_to_ban, match.final_pool, match.started_at, match.finished_at))
+        # Already archived (e.g. a batch retried after a failed commit)
+        if not cursor.rowcount:
+            return
+
+        archive_id = cursor.lastrowid
+        key = (match.guild_id, match.tournament)
+        self._conn.executemany(
+            "INSERT INTO match_maps (archive_id, seq, action, map, team) VALUES (?, ?, ?, ?, ?)",
+            [(archive_id, seq, action, map_key, team) for seq, (action, map_key, team) in enumerate(match.maps)])
+
+        self._conn.execute(
+            "INSERT INTO tournament_totals VALUES (?, ?, 1)"
+            " ON CONFLICT (guild_id, tournament) DO UPDATE SET matches = matches + 1", key)
+        self._conn.executemany(
+            "INSERT INTO team_totals VALUES (?, ?, ?, 1, ?, ?)"
+            " ON CONFLICT (guild_id, tournament, team) DO UPDATE SET matches = matches + 1,"
+            " coin_tosses_won = coin_tosses_won + excluded.coin_tosses_won,"
+            " banned_first = banned_first + excluded.banned_first",
+            [(*key, team, team == match.coin_toss_winner, team == match.first_to_ban) for team in match.teams])
+        self._conn.executemany(
+            "INSERT INTO map_totals VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (guild_id, tournament, map) DO UPDATE SET bans = bans + excluded.bans, picks = picks + excluded.picks,"
+            " random = random + excluded.random",
+            [(*key, map_key, action == BAN, action == PICK, action == RANDOM) for action, map_key, _ in match.maps])
+        self._conn.executemany(
+            "INSERT INTO team_map_totals VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (guild_id, tournament, team, map) DO UPDATE SET bans = bans + excluded.bans, picks = picks + excluded.picks",
+            [(*key, team, map_key, action == BAN, action == PICK) for action, map_key, team in match.maps if team])
+
+    # Statistics include pending matches. A tournament of None totals every tournament of the guild.
+    async def _query(self, query, *args):
+        await self.flush()
+        return await asyncio.to_thread(self._locked, query, *args)
+
+    def _locked(self, query, *args):
+        with self._lock:
+            return query(*args)
+
+    def _rows(self, statement: str, guild_id: int, tournament: str | None, *params) -> list:
+        scope = "guild_id = ?" + (" AND tournament = ?" if tournament is not None else "")
+        scope_params = (guild_id, tournament) if tournament is not None else (guild_id,)
+        return self._conn.execute(statement.format(scope=scope), scope_params + params).fetchall()
+
+    # (matches, [(map, bans, picks, random)]) of a tournament
+    async def tournament_stats(self, guild_id: int, tournament: str | None) -> tuple[int, list[tuple[str, int, int, int]]]:
+        def query():
+            matches = self._rows("SELECT COALESCE(SUM(matches), 0) FROM tournament_totals WHERE {scope}", guild_id, tournament)[0][0]
+            maps = self._rows(
+                "SELECT map, SUM(bans), SUM(picks), SUM(random) FROM map_totals WHERE {scope} GROUP BY map",
+                guild_id, tournament)
+            return matches, maps
+        return await self._query(query)
+
+    async def team_stats(self, guild_id: int, tournament: str | None, team: str) -> TeamStats:
+        def query():
+            matches, coin_tosses_won, banned_first = self._rows(
+                "SELECT COALESCE(SUM(matches), 0), COALESCE(SUM(coin_tosses_won), 0), COALESCE(SUM(banned_first), 0)"
+                " FROM team_totals WHERE {scope} AND team = ?", guild_id, tournament, team)[0]
+            maps = self._rows(
+                "SELECT map, SUM(bans), SUM(picks) FROM team_map_totals WHERE {scope} AND team = ?"
+                " GROUP BY map ORDER BY SUM(bans) + SUM(picks) DESC, map", guild_id, tournament, team)
+            return TeamStats(matches, coin_tosses_won, banned_first, maps)
+        return await self._query(query)
+
+    async def map_stats(self, guild_id: int, tournament: str | None, map_key: str) -> MapStats:
+        def query():
+            matches = self._rows("SELECT COALESCE(SUM(matches), 0) FROM tournament_totals WHERE {scope}", guild_id, tournament)[0][0]
+            bans, picks, random = self._rows(
+                "SELECT COALESCE(SUM(bans), 0), COALESCE(SUM(picks), 0), COALESCE(SUM(random), 0)"
+                " FROM map_totals WHERE {scope} AND map = ?", guild_id, tournament, map_key)[0]
+            teams = self._rows(
+                "SELECT team, SUM(bans), SUM(picks) FROM team_map_totals WHERE {scope} AND map = ?"
+                " GROUP BY team ORDER BY SUM(bans) + SUM(picks) DESC, team", guild_id, tournament, map_key)
+            return MapStats(matches, bans, picks, random, teams)
+        return await self._query(query)
+
+    # Archived team or map names of a guild containing `current` (for autocompletes across tournaments)
+    async def names(self, guild_id: int, column: str, current: str, limit: int) -> list[str]:
+        table = {"team": "team_totals", "map": "map_totals"}[column]
+        def query():
+            return [name for name, in self._conn.execute(
+                f"SELECT DISTINCT {column} FROM {table} WHERE guild_id = ? AND instr(lower({column}), ?)"
+                f" ORDER BY {column} LIMIT ?", (guild_id, current.casefold(), limit)).fetchall()]
+        return await self._query(query)
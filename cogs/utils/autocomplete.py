@@ -0,0 +1,109 @@
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Iterable
+
+from discord import app_commands
+
+# Discord rejects autocomplete responses with more than 25 choices
+MAX_CHOICES = 25
+
+# Match ranks, lower is better
+RANK_PREFIX = 0
+RANK_ALIAS = 1
+RANK_SUBSTRING = 2
+
+# Normalize a user-supplied name for lookups
+def normalize(name: str) -> str:
+    return name.strip().casefold()
+
+# Precomputed choice list with a sorted suffix index over casefolded names and aliases.
+# Every substring of a key is a prefix of one of its suffixes, so prefix, alias and substring
+# matches all come from a single bisect range scan.
+class ChoiceIndex:
+    __slots__ = ("values", "_suffixes", "_suffix_keys")
+
+    def __init__(self, entries: Iterable[tuple[str, Iterable[str]]]):
+        entries = [(value, tuple(aliases)) for value, aliases in entries]
+        self.values = tuple(value for value, _ in entries)
+
+        suffixes = []
+        for position, (value, aliases) in enumerate(entries):
+            keys = [(normalize(value), RANK_PREFIX)] + [(normalize(alias), RANK_ALIAS) for alias in aliases]
+            for key, rank in keys:
+                for start in range(len(key)):
+                    suffixes.append((key[start:], rank if start == 0 else RANK_SUBSTRING, position))
+
+        suffixes.sort()
+        self._suffixes = tuple(suffixes)
+        self._suffix_keys = tuple(suffix for suffix, _, _ in suffixes)
+
+    # Ranked values matching the query (prefix > alias > substring), optionally restricted to allowed values
+    def search(self, query: str, allowed=None, limit: int = MAX_CHOICES) -> list[str]:
+        query = normalize(query)
+
+        if not query:
+            return [value for value in self.values if allowed is None or value in allowed][:limit]
+
+        best = {}
+        i = bisect_left(self._suffix_keys, query)
+        while i < len(self._suffix_keys) and self._suffix_keys[i].startswith(query):
+            _, rank, position = self._suffixes[i]
+            if rank < best.get(position, RANK_SUBSTRING + 1):
+                best[position] = rank
+            i += 1
+
+        ranked = sorted(best, key=lambda position: (best[position], position))
+        results = []
+        for position in ranked:
+            value = self.values[position]
+            if allowed is None or value in allowed:
+                results.append(value)
+                if len(results) == limit:
+                    break
+        return results
+
+# Build an index over plain options with no aliases
+def static_choices(*options: str) -> ChoiceIndex:
+    return ChoiceIndex((option, ()) for option in options)
+
+# Memoized autocomplete results per (channel, selection phase, query). Both the channels and each
+# channel's entries are kept least recently used first, so channels that went quiet are dropped.
+class AutocompleteCache:
+    __slots__ = ("max_entries", "max_channels", "_channels", "hits", "misses")
+
+    def __init__(self, max_entries: int = 256, max_channels: int = 1024):
+        self.max_entries = max_entries
+        self.max_channels = max_channels
+        self._channels = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, channel_id, phase, query: str, compute) -> list[app_commands.Choice[str]]:
+        entries = self._channels.get(channel_id)
+        if entries is None:
+            entries = self._channels[channel_id] = OrderedDict()
+            if len(self._channels) > self.max_channels:
+                self._channels.popitem(last=False)
+        else:
+            self._channels.move_to_end(channel_id)
+        key = (phase, normalize(query))
+
+        choices = entries.get(key)
+        if choices is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return choices
+
+        self.misses += 1
+        choices = [app_commands.Choice(name=value[:100], value=value) for value in compute()[:MAX_CHOICES]]
+        entries[key] = choices
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return choices
+
+    # Drop a channel's cached results whenever its selection state changes
+    def invalidate(self, channel_id):
+        self._channels.pop(channel_id, None)
+
+    def clear(self):
+        self._channels.clear()
@@ -0,0 +1,50 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+import discord
+
+log = logging.getLogger(__name__)
+
+# Outcome of a DM fan-out, by user ID
+@dataclass(slots=True)
+class DeliveryReport:
+    delivered: list[int] = field(default_factory=list)
+    failed: list[int] = field(default_factory=list)
+    skipped: list[int] = field(default_factory=list)
+
+    def summary(self) -> str:
+        lines = [f"DMs delivered: **{len(self.delivered)}**"]
+        if self.failed:
+            lines.append(f"Could not DM (closed DMs): {' '.join(f'<@{user_id}>' for user_id in self.failed)}")
+        if self.skipped:
+            lines.append(f"Skipped (no longer in the server): {' '.join(f'<@{user_id}>' for user_id in self.skipped)}")
+        return "\n".join(lines)
+
+# Sends the same DM to many members in parallel. A semaphore bounds the number of requests in
+# flight (discord.py still queues each request behind its route's rate limit bucket), and each
+# recipient's failure is recorded in the report instead of aborting the rest.
+class DMDispatcher:
+    def __init__(self, concurrency: int = 5):
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(self, guild: discord.Guild, user_ids, content: str, **kwargs) -> DeliveryReport:
+        report = DeliveryReport()
+
+        async def deliver(user_id: int):
+            member = guild.get_member(user_id)
+            if member is None:
+                report.skipped.append(user_id)
+                return
+
+            async with self._semaphore:
+                try:
+                    await member.send(content, **kwargs)
+                except discord.HTTPException as e:
+                    log.info("Could not DM %s: %s", member, e)
+                    report.failed.append(user_id)
+                    return
+            report.delivered.append(user_id)
+
+        await asyncio.gather(*(deliver(user_id) for user_id in dict.fromkeys(user_ids)))
+        return report
@@ -0,0 +1,13 @@
+# Function to list names in an embed field (fields hold at most 1024 characters)
+def bounded_list(names: list[str], limit: int = 1024) -> str:
+    lines = []
+    length = 0
+    for i, name in enumerate(names):
+        line = f"- {name}"
+        more = f"...and {len(names) - i} more"
+        if length + len(line) + len(more) + 2 > limit:
+            lines.append(more)
+            break
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
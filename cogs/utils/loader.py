@@ -0,0 +1,214 @@
+import ast
+import hashlib
+import json
+import logging
+import marshal
+import os
+import tomllib
+from datetime import date, datetime
+from pathlib import Path
+
+from .pacing import PACING_MODES
+from .selection import default_sequences
+from .tournament import MapInfo, TeamInfo, TournamentError, TournamentInfo
+
+log = logging.getLogger(__name__)
+
+# File types that can define a tournament, in order of preference when two files share a name
+SUPPORTED_EXTENSIONS = (".toml", ".json", ".py")
+
+# Bump whenever the snapshot layout changes so stale snapshots are ignored
+SNAPSHOT_VERSION = 3
+
+# Parse a tournament file into its INFO, MAP_POOL and TEAM_ROLES tables (never executes the file)
+def parse_definition(path: Path, data: bytes) -> dict:
+    if path.suffix == ".toml":
+        return tomllib.loads(data.decode("utf-8"))
+    if path.suffix == ".json":
+        return json.loads(data)
+
+    # Legacy Python files may only contain plain literal assignments
+    tree = ast.parse(data, filename=str(path))
+    definition = {}
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)):
+            definition[node.targets[0].id] = ast.literal_eval(node.value)
+    return definition
+
+# Check a parsed definition against the tournament schema, collecting every problem found
+def validate_definition(definition) -> list[str]:
+    errors = []
+
+    def check(value, expected, where):
+        if expected is int and isinstance(value, bool) or not isinstance(value, expected):
+            names = " or ".join(t.__name__ for t in expected) if isinstance(expected, tuple) else expected.__name__
+            errors.append(f"{where} must be {names}")
+            return False
+        return True
+
+    def check_strings(value, where):
+        if check(value, list, where):
+            for i, item in enumerate(value):
+                check(item, str, f"{where}[{i}]")
+
+    if not isinstance(definition, dict):
+        return ["definition must be a table"]
+
+    for table in ("INFO", "MAP_POOL", "TEAM_ROLES"):
+        if table not in definition:
+            errors.append(f"missing {table}")
+        else:
+            check(definition[table], dict, table)
+    if errors:
+        return errors
+
+    info = definition["INFO"]
+    for field, expected in (("full_name", str), ("start_date", (str, date)), ("equal_bans", bool),
+                            ("maps_per_match", int), ("max_bans", int), ("max_picks", int)):
+        if field not in info:
+            errors.append(f"INFO.{field} is required")
+        elif check(info[field], expected, f"INFO.{field}") and field == "start_date" and isinstance(info[field], str):
+            try:
+                datetime.strptime(info[field], "%Y-%m-%d")
+            except ValueError:
+                errors.append("INFO.start_date must be a YYYY-MM-DD date")
+    for field in ("ban_sequence", "pick_sequence"):
+        if field in info and check(info[field], str, f"INFO.{field}") and set(info[field]) - {"A", "B"}:
+            errors.append(f"INFO.{field} may only contain A (first team to ban) and B (second team to ban)")
+    if "pacing" in info and check(info["pacing"], str, "INFO.pacing") and info["pacing"] not in PACING_MODES:
+        errors.append(f"INFO.pacing must be one of {", ".join(PACING_MODES)}")
+    if not errors:
+        errors += validate_format(info)
+    if "map_pools" not in info:
+        errors.append("INFO.map_pools is required")
+    else:
+        check_strings(info["map_pools"], "INFO.map_pools")
+    map_pools = info.get("map_pools") if isinstance(info.get("map_pools"), list) else []
+
+    for map_key, map_info in definition["MAP_POOL"].items():
+        where = f"MAP_POOL.{map_key}"
+        if not check(map_info, dict, where):
+            continue
+        check_strings(map_info.get("base_name"), f"{where}.base_name")
+        check_strings(map_info.get("aliases", []), f"{where}.aliases")
+        if check(map_info.get("map_pool"), str, f"{where}.map_pool") and map_info["map_pool"] not in map_pools:
+            errors.append(f"{where}.map_pool \"{map_info['map_pool']}\" is not listed in INFO.map_pools")
+
+    for team_name, team_info in definition["TEAM_ROLES"].items():
+        where = f"TEAM_ROLES.{team_name}"
+        if not check(team_info, dict, where):
+            continue
+        check(team_info.get("id"), int, f"{where}.id")
+        check(team_info.get("tag"), str, f"{where}.tag")
+        check(team_info.get("name"), str, f"{where}.name")
+
+    return errors
+
+# Resolve the ban and pick sequences of INFO, falling back to the defaults for its ban/pick counts
+def format_sequences(info: dict) -> tuple[str, str]:
+    ban_sequence, pick_sequence = default_sequences(info["equal_bans"], info["max_bans"], info["max_picks"])
+    return info.get("ban_sequence", ban_sequence), info.get("pick_sequence", pick_sequence)
+
+# Check that the ban/pick counts of INFO describe a playable selection
+def validate_format(info: dict) -> list[str]:
+    errors = []
+    for field in ("maps_per_match", "max_bans", "max_picks"):
+        if info[field] < 0:
+            errors.append(f"INFO.{field} must not be negative")
+    if errors:
+        return errors
+
+    ban_sequence, pick_sequence = format_sequences(info)
+    for side in "AB":
+        if ban_sequence.count(side) > info["max_bans"]:
+            errors.append(f"INFO.ban_sequence gives team {side} more than INFO.max_bans bans")
+        if pick_sequence.count(side) > info["max_picks"]:
+            errors.append(f"INFO.pick_sequence gives team {side} more than INFO.max_picks picks")
+    if info["equal_bans"] and ban_sequence.count("A") != ban_sequence.count("B"):
+        errors.append("INFO.ban_sequence must give both teams the same number of bans when INFO.equal_bans is set")
+    if info["maps_per_match"] - len(pick_sequence) not in (0, 1):
+        errors.append("INFO.maps_per_match must be the number of picks, plus at most one decider map")
+    return errors
+
+# Flatten a validated definition into plain tuples (the snapshot format)
+def flatten_definition(definition: dict) -> tuple[tuple, tuple]:
+    info = definition["INFO"]
+    start_date = info["start_date"]
+    if isinstance(start_date, date):
+        start_date = start_date.isoformat()
+
+    flat_info = (info["full_name"], start_date, info["equal_bans"], info["maps_per_match"],
+                 info["max_bans"], info["max_picks"], tuple(info["map_pools"]), *format_sequences(info),
+                 info.get("pacing"))
+    flat_maps = tuple(
+        (map_key, tuple(map_info["base_name"]), tuple(map_info.get("aliases", [])), map_info["map_pool"])
+        for map_key, map_info in definition["MAP_POOL"].items())
+    flat_teams = tuple(
+        (team_name, team_info["id"], team_info["tag"], team_info["name"])
+        for team_name, team_info in definition["TEAM_ROLES"].items())
+    return flat_info, (flat_maps, flat_teams)
+
+# Build the slotted records from their flattened form
+def info_from_flat(flat_info: tuple) -> TournamentInfo:
+    full_name, start_date, *rest = flat_info
+    return TournamentInfo(full_name, datetime.strptime(start_date, "%Y-%m-%d"), *rest)
+
+def records_from_flat(flat_records: tuple) -> tuple[tuple[MapInfo, ...], tuple[TeamInfo, ...]]:
+    flat_maps, flat_teams = flat_records
+    return tuple(MapInfo(*m) for m in flat_maps), tuple(TeamInfo(*t) for t in flat_teams)
+
+# Tournament files compiled into marshal snapshots keyed by content hash. A snapshot holds two
+# records (INFO, then maps and teams), so reading metadata does not touch the rest of the file.
+class SnapshotCache:
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(SNAPSHOT_VERSION.to_bytes(2, "big") + data).hexdigest()[:32]
+
+    def _path(self, key: str, digest: str) -> Path:
+        return self.directory / f"{key}-{digest}.snap"
+
+    # Parse, validate and flatten a tournament file, reusing its snapshot when the content is unchanged.
+    # The file is only read if there is no snapshot for the given digest.
+    def load(self, key: str, path: Path, digest: str, data: bytes | None = None, records: bool = False):
+        snapshot = self._path(key, digest)
+        try:
+            with open(snapshot, "rb") as f:
+                flat_info = marshal.load(f)
+                flat_records = marshal.load(f) if records else None
+            return flat_info, flat_records
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        try:
+            if data is None:
+                data = path.read_bytes()
+                snapshot = self._path(key, self.digest(data))
+            definition = parse_definition(path, data)
+        except (OSError, SyntaxError, ValueError, UnicodeDecodeError) as e:
+            raise TournamentError(f"{path.name}: {e}") from e
+
+        errors = validate_definition(definition)
+        if errors:
+            raise TournamentError(f"{path.name}: " + "; ".join(errors))
+
+        flat_info, flat_records = flatten_definition(definition)
+        self._write(key, snapshot, flat_info, flat_records)
+        return flat_info, flat_records
+
+    def _write(self, key: str, snapshot: Path, flat_info: tuple, flat_records: tuple):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for stale in self.directory.glob(f"{key}-*.snap"):
+                stale.unlink(missing_ok=True)
+
+            temp = snapshot.with_suffix(".tmp")
+            with open(temp, "wb") as f:
+                marshal.dump(flat_info, f)
+                marshal.dump(flat_records, f)
+            os.replace(temp, snapshot)
+        except OSError:
+            log.warning("Could not write tournament snapshot %s", snapshot, exc_info=True)
@@ -0,0 +1,138 @@
+import contextvars
+import datetime
+import json
+import logging
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from pathlib import Path
+
+import discord
+
+log = logging.getLogger(__name__)
+
+# Fields of the interaction being handled, added to every record logged while handling it
+interaction_context = contextvars.ContextVar("interaction_context", default=None)
+# When the bot started handling that interaction (perf_counter)
+interaction_received = contextvars.ContextVar("interaction_received", default=None)
+
+# Attributes every LogRecord has, so anything else on a record came from `extra` or the interaction context
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+# Identifying fields of an interaction, for `extra` and the interaction context
+def interaction_fields(interaction: discord.Interaction) -> dict:
+    if interaction.command is not None:
+        command = interaction.command.qualified_name
+    elif interaction.data and "custom_id" in interaction.data:
+        command = interaction.data["custom_id"]
+    else:
+        command = None
+
+    return {
+        "command": command,
+        "channel": interaction.channel_id,
+        "guild": interaction.guild_id,
+        "user": interaction.user.id,
+    }
+
+# Milliseconds since the bot started handling the interaction (since Discord created it, if the
+# interaction was not handled through the command tree)
+def interaction_latency(interaction: discord.Interaction) -> float:
+    received = interaction_received.get()
+    if received is None:
+        return round((discord.utils.utcnow() - interaction.created_at).total_seconds() * 1000, 1)
+    return round((time.perf_counter() - received) * 1000, 1)
+
+# Copy the current interaction's fields onto records that do not set them already. Filters run on the
+# queue handler before the record is queued, so the context variable is still the caller's.
+class InteractionContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields = interaction_context.get()
+        if fields:
+            for name, value in fields.items():
+                if not hasattr(record, name):
+                    setattr(record, name, value)
+        return True
+
+# Keep one in `every` records below INFO, counted per logger and message template, so busy debug
+# call sites (gateway events, autocompletes) cannot flood the log. The first record of each is kept.
+class DebugSampler(logging.Filter):
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._seen = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.INFO or self.every == 1:
+            return True
+        key = (record.name, record.msg)
+        seen = self._seen.get(key, 0)
+        self._seen[key] = seen + 1
+        return seen % self.every == 0
+
+# One JSON object per line: time, level, logger and message (tracebacks included, as the queue handler
+# merges them in), plus any extra fields on the record
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES and not name.startswith("_"):
+                entry[name] = value
+        return json.dumps(entry, default=str)
+
+# Command tree that tags everything logged while handling an app command or autocomplete with the
+# interaction's fields. The check runs in the task that invokes the command, so the context follows it.
+class ContextCommandTree(discord.app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interaction_received.set(time.perf_counter())
+        interaction_context.set(interaction_fields(interaction))
+        log.debug("Received %s interaction", interaction.type.name)
+        return True
+
+# Route every log record through a queue to a listener thread that owns the file and console
+# handlers, so formatting, disk writes and midnight rollovers never run on the event loop.
+# Returns the started listener; stop it on shutdown to flush the remaining records.
+def setup_logging(
+    directory: Path,
+    level: int = logging.INFO,
+    json_lines: bool = False,
+    debug_every: int = 1,
+    fmt: str = "%(asctime)s [%(levelname)s] [%(name)s] %(message)s",
+) -> QueueListener:
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    if json_lines:
+        file_handler = TimedRotatingFileHandler(
+            directory / "discord.jsonl", when="midnight", interval=1, backupCount=3, encoding="utf-8"
+        )
+        file_handler.setFormatter(JsonLinesFormatter())
+    else:
+        file_handler = TimedRotatingFileHandler(
+            directory / "discord.log", when="midnight", interval=1, backupCount=3, encoding="utf-8"
+        )
+        file_handler.setFormatter(logging.Formatter(fmt))
+    file_handler.suffix = "%Y-%m-%d"
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(fmt))
+
+    records = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+    queue_handler.addFilter(DebugSampler(debug_every))
+    queue_handler.addFilter(InteractionContextFilter())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = QueueListener(records, file_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,191 @@
+import contextvars
+import functools
+import logging
+import time
+from bisect import bisect_left
+
+import aiohttp
+from aiohttp import web
+
+log = logging.getLogger(__name__)
+
+# Handler latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (kind, handler) of the command, autocomplete or button being handled, for REST call attribution.
+# Tasks started by a handler inherit it; anything else is counted as background work.
+current_handler = contextvars.ContextVar("current_handler", default=None)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+# Monotonic counter, one value per label combination
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_labels(self.labels, labels)} {_number(value)}")
+        return lines
+
+# Histogram with fixed buckets, one set of buckets per label combination
+class Histogram:
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        self._values = {}
+
+    def observe(self, value: float, *labels):
+        entry = self._values.get(labels)
+        if entry is None:
+            # Per-bucket counts (the last one is +Inf), sum
+            entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, labels, bucket)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+# Value read from the bot's state when scraped. The callback returns a number, or a dict of label
+# value tuples to numbers. Counters kept elsewhere (e.g. refresher stats) use metric_type="counter".
+class Collected:
+    def __init__(self, name: str, documentation: str, collect, labels: tuple = (), metric_type: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.collect = collect
+        self.labels = labels
+        self.metric_type = metric_type
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        values = self.collect()
+        if not isinstance(values, dict):
+            values = {(): values}
+        for labels, value in values.items():
+            lines.append(f"{self.name}{_labels(self.labels, labels)} {_number(value)}")
+        return lines
+
+# Every metric the bot exposes, by name. Registering a name again replaces it, so cogs can
+# re-register their gauges when they are reloaded.
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def counter(self, name: str, documentation: str, labels: tuple = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, documentation, labels, buckets))
+
+    def gauge(self, name: str, documentation: str, collect, labels: tuple = (), metric_type: str = "gauge"):
+        self._metrics[name] = Collected(name, documentation, collect, labels, metric_type)
+
+    # Prometheus text exposition format
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            try:
+                lines += metric.render()
+            except Exception:
+                log.exception("Could not collect metric %s", metric.name)
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+handler_latency = registry.histogram(
+    "anp_handler_duration_seconds", "Time spent in command, autocomplete and button handlers", ("kind", "handler"))
+handler_errors = registry.counter(
+    "anp_handler_errors_total", "Handlers that raised an exception", ("kind", "handler"))
+rest_requests = registry.counter(
+    "anp_rest_requests_total", "REST requests sent to Discord by handler and response status (429 = rate limited)",
+    ("kind", "handler", "method", "status"))
+
+# Record latency, errors and REST calls of a handler. Goes directly above the `async def`, below the
+# discord.py decorators (which read the wrapped function's signature).
+def instrumented(kind: str):
+    def decorator(func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            token = current_handler.set((kind, name))
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                handler_errors.inc(kind, name)
+                raise
+            finally:
+                handler_latency.observe(time.perf_counter() - start, kind, name)
+                current_handler.reset(token)
+
+        return wrapper
+    return decorator
+
+# aiohttp trace hooks counting every REST request (retries after a 429 included) against the
+# handler that made it. Pass to the bot as `http_trace`.
+def rest_trace() -> aiohttp.TraceConfig:
+    async def on_request_end(session, context, params):
+        kind, name = current_handler.get() or ("background", "")
+        rest_requests.inc(kind, name, params.method, str(params.response.status))
+
+    async def on_request_exception(session, context, params):
+        kind, name = current_handler.get() or ("background", "")
+        rest_requests.inc(kind, name, params.method, "error")
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_exception)
+    return trace
+
+# Local HTTP endpoint serving the registry at /metrics
+class MetricsServer:
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self.metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        log.info("Serving metrics on http://%s:%d/metrics", self.host, self.port)
+
+    async def close(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8")
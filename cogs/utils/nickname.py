@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+
+import discord
+
+log = logging.getLogger(__name__)
+
+# Per-guild nickname manager. The bot's nickname shows the total number of queued players across
+# every PUG queue in the guild; edits are skipped when nothing would change, and are spaced at
+# least `interval` seconds apart with a trailing edit that applies the latest count.
+class NicknameManager:
+    def __init__(self, bot: discord.Client, interval: float = 5.0):
+        self.bot = bot
+        self.interval = interval
+        self._counts = {}
+        self._applied = {}
+        self._last_edit = {}
+        self._pending = {}
+
+        # Counters
+        self.edits = 0
+        self.skipped = 0
+
+    def nickname_for(self, guild_id: int) -> str | None:
+        players = sum(count for count_guild_id, count in self._counts.values() if count_guild_id == guild_id)
+        if players > 0:
+            return f"{self.bot.user.name} ({players} in queue)"
+        return None
+
+    # Record a queue's size; the guild may be unknown (None) for queues restored before the bot is ready
+    def set_count(self, guild_id: int | None, channel_id: int, count: int):
+        if count > 0:
+            self._counts[channel_id] = (guild_id, count)
+        else:
+            self._counts.pop(channel_id, None)
+
+        if guild_id is not None:
+            self.request(guild_id)
+
+    # Apply the guild's nickname now, or once the rate limit window has passed
+    def request(self, guild_id: int):
+        if guild_id in self._pending:
+            return
+
+        delay = self._last_edit.get(guild_id, float("-inf")) + self.interval - time.monotonic()
+        self._pending[guild_id] = asyncio.create_task(self._apply_later(guild_id, max(0, delay)))
+
+    async def _apply_later(self, guild_id: int, delay: float):
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._pending.pop(guild_id, None)
+        await self.apply(guild_id)
+
+    async def apply(self, guild_id: int):
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return
+
+        nickname = self.nickname_for(guild_id)
+        if nickname == self._applied.get(guild_id, guild.me.nick):
+            self.skipped += 1
+            return
+
+        self._last_edit[guild_id] = time.monotonic()
+        try:
+            await guild.me.edit(nick=nickname)
+        except discord.HTTPException:
+            log.exception("Could not change nickname in guild %s", guild)
+            return
+        self._applied[guild_id] = nickname
+        self.edits += 1
+
+    # Bring every guild's nickname in line with its queues at startup, all guilds at once
+    async def reset_all(self):
+        for channel_id, (guild_id, count) in list(self._counts.items()):
+            if guild_id is None:
+                channel = self.bot.get_channel(channel_id)
+                if channel is None:
+                    self._counts.pop(channel_id)
+                else:
+                    self._counts[channel_id] = (channel.guild.id, count)
+
+        await asyncio.gather(*(self.apply(guild.id) for guild in self.bot.guilds))
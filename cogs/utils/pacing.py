@@ -0,0 +1,62 @@
+import collections
+import logging
+
+import discord
+
+from .scheduler import DeadlineScheduler
+
+log = logging.getLogger(__name__)
+
+# Pacing modes of the reveal messages in a map selection, as a factor on the base delays below
+PACING_MODES = {"dramatic": 1.5, "normal": 1.0, "instant": 0.0}
+DEFAULT_PACING = "normal"
+
+# Base delays in seconds: coin toss result, final map draw and match summary
+COIN_TOSS_DELAY = 2.0
+FINAL_DRAW_DELAY = 0.5
+SUMMARY_DELAY = 2.0
+
+# Delayed channel messages, posted in order per channel from the shared scheduler so no handler
+# sleeps while the channel waits. Each message's delay counts from the one before it. Reveals are
+# not persisted: a restart drops the few seconds' worth that are still pending.
+class RevealQueue:
+    KIND = "reveal"
+
+    def __init__(self, bot: discord.Client, scheduler: DeadlineScheduler):
+        self.bot = bot
+        self.scheduler = scheduler
+        self._queues = {}
+        scheduler.register(self.KIND, self._reveal, persistent=False)
+
+    def add(self, channel_id: int, delay: float, content: str | None = None, embed: discord.Embed | None = None):
+        queue = self._queues.setdefault(channel_id, collections.deque())
+        queue.append((delay, content, embed))
+        if len(queue) == 1:
+            self.scheduler.schedule_in(self.KIND, channel_id, delay)
+
+    # Drop a channel's pending reveals (e.g. when its selection is cleared)
+    def cancel(self, channel_id: int):
+        if self._queues.pop(channel_id, None):
+            self.scheduler.cancel(self.KIND, channel_id)
+
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def _reveal(self, channel_id: int):
+        queue = self._queues.get(channel_id)
+        if not queue:
+            return
+
+        _, content, embed = queue[0]
+        try:
+            await self.bot.get_partial_messageable(channel_id).send(content=content, embed=embed)
+        except discord.HTTPException:
+            log.exception("Could not post reveal in channel %s", channel_id)
+        finally:
+            # The queue may have been cancelled (or replaced) while sending
+            if self._queues.get(channel_id) is queue:
+                queue.popleft()
+                if queue:
+                    self.scheduler.schedule_in(self.KIND, channel_id, queue[0][0])
+                else:
+                    del self._queues[channel_id]
@@ -0,0 +1,152 @@
+import asyncio
+import collections
+import datetime
+import logging
+import sys
+import threading
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+# Directory of the cog modules, to single out the cogs' own frames in reports
+COGS_DIR = Path(__file__).resolve().parent.parent
+
+# Frames tracemalloc keeps per allocation (more is slower)
+TRACEMALLOC_FRAMES = 10
+
+# Lines of each report section
+TOP_ENTRIES = 25
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+# Samples the stack of one thread (the event loop's) from a background thread at a fixed interval.
+# Nothing runs between sessions, so there is no cost while profiling is off.
+class SamplingProfiler:
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self.own = collections.Counter()
+        self.total = collections.Counter()
+        self.stacks = collections.Counter()
+        self.cogs = collections.Counter()
+        self._cog_files = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            cogs = set()
+            while frame is not None:
+                name = _frame_name(frame)
+                stack.append(name)
+                if self._is_cog_file(frame.f_code.co_filename):
+                    cogs.add(name)
+                frame = frame.f_back
+
+            self.samples += 1
+            self.own[stack[0]] += 1
+            # Count recursive functions once per sample
+            self.total.update(set(stack))
+            self.cogs.update(cogs)
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def _is_cog_file(self, filename: str) -> bool:
+        is_cog = self._cog_files.get(filename)
+        if is_cog is None:
+            is_cog = self._cog_files[filename] = Path(filename).resolve().parent == COGS_DIR
+        return is_cog
+
+# Result of a profiling window
+@dataclass(slots=True)
+class ProfileReport:
+    report: Path
+    stacks: Path
+    samples: int
+    hottest: list[tuple[str, float]] = field(default_factory=list)
+
+# One profiling window: samples the event loop thread and traces allocations for `seconds`, then
+# writes a text report and a collapsed stack file (for flame graph tools) to `directory`
+class ProfileSession:
+    def __init__(self, directory: Path, seconds: float, interval: float = 0.005):
+        self.directory = Path(directory)
+        self.seconds = seconds
+        self.profiler = SamplingProfiler(threading.get_ident(), interval)
+
+    async def run(self) -> ProfileReport:
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        before = await asyncio.to_thread(tracemalloc.take_snapshot)
+
+        started = datetime.datetime.now()
+        self.profiler.start()
+        try:
+            await asyncio.sleep(self.seconds)
+        finally:
+            self.profiler.stop()
+            after = await asyncio.to_thread(tracemalloc.take_snapshot)
+            if not tracing:
+                tracemalloc.stop()
+
+        return await asyncio.to_thread(self._write, started, before, after)
+
+    def _write(self, started: datetime.datetime, before, after) -> ProfileReport:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = f"profile-{started:%Y-%m-%d_%H-%M-%S}"
+        report_path = self.directory / f"{stem}.txt"
+        stacks_path = self.directory / f"{stem}.stacks"
+        profiler = self.profiler
+        samples = max(profiler.samples, 1)
+        ignored = (tracemalloc.Filter(False, tracemalloc.__file__),)
+        before, after = before.filter_traces(ignored), after.filter_traces(ignored)
+
+        def share(count: int) -> str:
+            return f"{count / samples:7.1%}"
+
+        lines = [
+            f"Profile started {started:%Y-%m-%d %H:%M:%S}, {self.seconds:g}s window, "
+            f"{profiler.samples} samples every {profiler.interval * 1000:g} ms",
+            "",
+            "Hottest functions (own time):",
+        ]
+        lines += [f"{share(count)}  {name}" for name, count in profiler.own.most_common(TOP_ENTRIES)]
+
+        lines += ["", "Hottest functions (including callees):"]
+        lines += [f"{share(count)}  {name}" for name, count in profiler.total.most_common(TOP_ENTRIES)]
+
+        lines += ["", "Cog functions on the stack:"]
+        lines += [f"{share(count)}  {name}" for name, count in profiler.cogs.most_common(TOP_ENTRIES)] or ["  (none)"]
+
+        lines += ["", "Top allocation sites (size at end of window):"]
+        lines += [f"  {stat}" for stat in after.statistics("lineno")[:TOP_ENTRIES]]
+
+        lines += ["", "Largest allocation growth during the window:"]
+        lines += [f"  {stat}" for stat in after.compare_to(before, "lineno")[:TOP_ENTRIES]]
+
+        report_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        stacks_path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in profiler.stacks.items()), encoding="utf-8")
+
+        hottest = [(name, count / samples) for name, count in profiler.cogs.most_common(5)]
+        log.info("Wrote profile report %s (%d samples)", report_path, profiler.samples)
+        return ProfileReport(report_path, stacks_path, profiler.samples, hottest)
@@ -0,0 +1,97 @@
+import itertools
+import time
+from typing import Iterable
+
+# Versions are unique across every queue in the process, so a replaced queue never reuses one
+_versions = itertools.count(1)
+
+# Insertion-ordered player queue backed by a dict of user ID -> join timestamp: membership is O(1).
+# Each player also holds a slot number that only grows in join order, and a Fenwick tree counts the
+# occupied slots, so join, leave and position lookups are O(log n) however the queue churns. Slots
+# are renumbered once they run out, which is O(n) after at least n joins (amortized O(1) per join).
+class PlayerQueue:
+    __slots__ = ("_players", "version", "_slots", "_tree", "_next_slot")
+
+    def __init__(self, players: Iterable[tuple[int, float]] = ()):
+        self._players = dict(players)
+        self.version = next(_versions)
+        self._renumber()
+
+    def add(self, user_id: int, joined_at: float | None = None) -> bool:
+        if user_id in self._players:
+            return False
+        self._players[user_id] = time.time() if joined_at is None else joined_at
+        if self._next_slot >= len(self._tree):
+            self._renumber()
+        else:
+            self._slots[user_id] = self._next_slot
+            self._count(self._next_slot, 1)
+            self._next_slot += 1
+        self.version = next(_versions)
+        return True
+
+    def remove(self, user_id: int) -> bool:
+        if self._players.pop(user_id, None) is None:
+            return False
+        self._count(self._slots.pop(user_id), -1)
+        self.version = next(_versions)
+        return True
+
+    def clear(self):
+        self._players.clear()
+        self._renumber()
+        self.version = next(_versions)
+
+    def __contains__(self, user_id) -> bool:
+        return user_id in self._players
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def __iter__(self):
+        return iter(self._players)
+
+    # 1-based position in the queue, or None if the player is not queued
+    def position(self, user_id: int) -> int | None:
+        slot = self._slots.get(user_id)
+        if slot is None:
+            return None
+        # Occupied slots up to and including the player's
+        position = 0
+        while slot > 0:
+            position += self._tree[slot]
+            slot &= slot - 1
+        return position
+
+    def joined_at(self, user_id: int) -> float | None:
+        return self._players.get(user_id)
+
+    # The first n players, without copying the whole queue
+    def first(self, n: int) -> list[int]:
+        return list(itertools.islice(self._players, n))
+
+    # Give the players slots 1..n in queue order, with room for as many joins again, and rebuild the tree in O(n)
+    def _renumber(self):
+        self._slots = {user_id: slot for slot, user_id in enumerate(self._players, start=1)}
+        self._next_slot = len(self._players) + 1
+        self._tree = [0] * (2 * len(self._players) + 16)
+        for slot in range(1, len(self._tree)):
+            if slot < self._next_slot:
+                self._tree[slot] += 1
+            parent = slot + (slot & -slot)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[slot]
+
+    # Add to the count of occupied slots at a slot
+    def _count(self, slot: int, delta: int):
+        while slot < len(self._tree):
+            self._tree[slot] += delta
+            slot += slot & -slot
+
+    # Plain values for the state store
+    def dump(self) -> list[list]:
+        return [[user_id, joined_at] for user_id, joined_at in self._players.items()]
+
+    @classmethod
+    def load(cls, data) -> "PlayerQueue":
+        return cls((user_id, joined_at) for user_id, joined_at in data)
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+# Debounced per-key refresher. Requests made while a refresh is pending collapse into it, and one
+# worker per key renders the latest state after a short window, so edits never complete out of
+# order and the last edit always reflects the newest state.
+class CoalescingRefresher:
+    def __init__(self, render, delay: float):
+        self.render = render
+        self.delay = delay
+        self._dirty = set()
+        self._workers = {}
+        self._rendering = set()
+
+        # Counters
+        self.requested = 0
+        self.coalesced = 0
+        self.rendered = 0
+        self.failed = 0
+
+    def request(self, key):
+        self.requested += 1
+        if key in self._dirty:
+            self.coalesced += 1
+            return
+
+        self._dirty.add(key)
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._work(key))
+
+    # Drop pending refreshes and wait for renders in flight, so an edit made after this lands last
+    async def close(self):
+        self._dirty.clear()
+        workers = list(self._workers.items())
+        for key, worker in workers:
+            if key not in self._rendering:
+                worker.cancel()
+        await asyncio.gather(*(worker for _, worker in workers), return_exceptions=True)
+        # Workers cancelled before their first step never reach their own cleanup
+        for key, worker in workers:
+            if self._workers.get(key) is worker:
+                del self._workers[key]
+
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    def stats(self) -> dict:
+        return {
+            "requested": self.requested,
+            "coalesced": self.coalesced,
+            "rendered": self.rendered,
+            "failed": self.failed,
+        }
+
+    async def _work(self, key):
+        try:
+            while key in self._dirty:
+                await asyncio.sleep(self.delay)
+                self._dirty.discard(key)
+                self._rendering.add(key)
+                try:
+                    await self.render(key)
+                    self.rendered += 1
+                except Exception:
+                    self.failed += 1
+                    log.exception("Refresh failed for %s", key)
+                finally:
+                    self._rendering.discard(key)
+        finally:
+            self._workers.pop(key, None)
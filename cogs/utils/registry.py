@@ -0,0 +1,139 @@
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from .autocomplete import ChoiceIndex, normalize
+from .loader import SUPPORTED_EXTENSIONS, SnapshotCache, info_from_flat, records_from_flat
+from .tournament import Tournament, TournamentError, TournamentInfo, compile_tournament
+
+log = logging.getLogger(__name__)
+
+# Only the most recent tournaments are offered by the /match autocomplete
+LISTED_TOURNAMENTS = 2
+
+# Lightweight metadata for a tournament file, read without loading its maps or teams
+@dataclass(frozen=True, slots=True)
+class TournamentEntry:
+    key: str
+    path: Path
+    mtime_ns: int
+    digest: str
+    info: TournamentInfo
+
+    @property
+    def full_name(self) -> str:
+        return self.info.full_name
+
+# Tournament registry: metadata is read at startup, maps and teams are compiled on first use,
+# and files are re-read when their mtime changes. Compiled tournaments are immutable, so
+# selections that already hold one keep working after a reload.
+class TournamentRegistry:
+    def __init__(self, directory: Path, snapshot_dir: Path):
+        self.directory = directory
+        self.snapshots = SnapshotCache(snapshot_dir)
+        self.entries = {}
+        self.names = {}
+        self.pool_choices = ChoiceIndex(())
+        self.generation = 0
+        self._compiled = {}
+        self._failed = {}
+        self.refresh()
+
+    # Find tournament files, preferring data files over legacy Python files with the same name
+    def _scan(self) -> dict[str, os.DirEntry]:
+        files = {}
+        with os.scandir(self.directory) as entries:
+            for file in entries:
+                key, ext = os.path.splitext(file.name)
+                if ext not in SUPPORTED_EXTENSIONS or key.startswith(("_", ".")) or not file.is_file():
+                    continue
+                current = files.get(key)
+                if current and SUPPORTED_EXTENSIONS.index(os.path.splitext(current.name)[1]) < SUPPORTED_EXTENSIONS.index(ext):
+                    log.warning("Ignoring %s, tournament %s is already defined by %s", file.name, key, current.name)
+                    continue
+                files[key] = file
+        return files
+
+    # Rescan the directory, returning True if any tournament was added, changed or removed
+    def refresh(self) -> bool:
+        entries = dict(self.entries)
+        files = self._scan()
+        changed = False
+
+        for key, file in files.items():
+            path = Path(file.path)
+            mtime_ns = file.stat().st_mtime_ns
+            current = entries.get(key)
+            if (current and current.path == path and current.mtime_ns == mtime_ns) or self._failed.get(key) == (path, mtime_ns):
+                continue
+
+            try:
+                data = path.read_bytes()
+                digest = SnapshotCache.digest(data)
+                if current and current.path == path and current.digest == digest:
+                    entries[key] = TournamentEntry(key, path, mtime_ns, digest, current.info)
+                    continue
+                flat_info, _ = self.snapshots.load(key, path, digest, data)
+                entries[key] = TournamentEntry(key, path, mtime_ns, digest, info_from_flat(flat_info))
+            except (OSError, TournamentError) as e:
+                # Keep serving the last good version while the file is being edited
+                log.error("Could not read tournament file %s: %s", file.name, e)
+                self._failed[key] = (path, mtime_ns)
+                continue
+
+            self._failed.pop(key, None)
+            self._compiled.pop(key, None)
+            changed = True
+            if current:
+                log.info("Reloaded tournament %s (%s)", key, entries[key].full_name)
+
+        for key in entries.keys() - files.keys():
+            entries.pop(key)
+            self._compiled.pop(key, None)
+            changed = True
+            log.info("Removed tournament %s", key)
+
+        if changed:
+            self._publish(entries)
+        elif entries != self.entries:
+            self.entries = entries
+        return changed
+
+    # Swap in new lookup tables in one step so readers never see a half-updated registry
+    def _publish(self, entries: dict):
+        names = {}
+        for entry in entries.values():
+            names[normalize(entry.key)] = entry.key
+            names[normalize(entry.full_name)] = entry.key
+
+        listed = self._sorted(entries)[:LISTED_TOURNAMENTS]
+
+        self.entries = entries
+        self.names = names
+        self.pool_choices = ChoiceIndex((entry.full_name, (entry.key,)) for entry in listed)
+        self.generation += 1
+
+    @staticmethod
+    def _sorted(entries: dict) -> list[TournamentEntry]:
+        return sorted(entries.values(), key=lambda entry: entry.info.start_date, reverse=True)
+
+    # Tournaments sorted by start date, newest first
+    def listing(self) -> list[TournamentEntry]:
+        return self._sorted(self.entries)
+
+    # Find a tournament by file name or full name, compiling it on first use
+    def get(self, name: str) -> Tournament | None:
+        key = self.names.get(normalize(name))
+        if key is None:
+            return None
+
+        tournament = self._compiled.get(key)
+        if tournament is None:
+            entry = self.entries[key]
+            flat_info, flat_records = self.snapshots.load(key, entry.path, entry.digest, records=True)
+            maps, teams = records_from_flat(flat_records)
+            tournament = compile_tournament(key, info_from_flat(flat_info), maps, teams)
+            self._compiled[key] = tournament
+
+        return tournament
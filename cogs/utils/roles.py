@@ -0,0 +1,254 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING, NamedTuple
+
+import discord
+
+from .tournament import MIXED_TEAMS
+
+if TYPE_CHECKING:
+    from .tournament import Tournament
+
+# Members with a role of this name (or with administrator permissions) are organizers
+ORGANIZER_ROLE = "Organizer"
+
+# Resolved members kept per guild (the least recently used are dropped first)
+MAX_CACHED_MEMBERS = 1000
+
+# What a member may do in a tournament: organizer status and the teams they belong to
+class Access(NamedTuple):
+    admin: bool
+    teams: frozenset[str]
+
+    def on_team(self, team_name: str) -> bool:
+        return team_name in MIXED_TEAMS or team_name in self.teams
+
+# Which of a guild's roles stand for each team of a tournament. A role stands for a team if it has
+# the team's role ID or the team's full name (case-insensitive); teams no role stands for are missing.
+class _TeamTable:
+    __slots__ = ("tournament", "teams_by_id", "teams_by_name", "team_roles", "holders")
+
+    def __init__(self, tournament: "Tournament", roles: dict[int, str]):
+        self.tournament = tournament
+        self.teams_by_id = {}
+        for team_name, role_id in tournament.team_role_ids.items():
+            self.teams_by_id.setdefault(role_id, set()).add(team_name)
+        self.teams_by_name = {team_name.casefold(): team_name for team_name in tournament.teams}
+        # Role ID -> teams, and team -> role IDs standing for it
+        self.team_roles = {}
+        self.holders = {}
+        for role_id, name in roles.items():
+            self.add_role(role_id, name)
+
+    def add_role(self, role_id: int, name: str):
+        teams = set(self.teams_by_id.get(role_id, ()))
+        if name in self.teams_by_name:
+            teams.add(self.teams_by_name[name])
+        if not teams:
+            return
+
+        self.team_roles[role_id] = frozenset(teams)
+        for team_name in teams:
+            self.holders.setdefault(team_name, set()).add(role_id)
+
+    def remove_role(self, role_id: int):
+        for team_name in self.team_roles.pop(role_id, ()):
+            holders = self.holders[team_name]
+            holders.discard(role_id)
+            if not holders:
+                del self.holders[team_name]
+
+    # Teams without a role in the guild, in tournament order
+    def missing(self) -> list[str]:
+        return [team_name for team_name in self.tournament.teams if team_name not in self.holders]
+
+    # Teams whose role was only found by name (the role ID in the tournament file does not match)
+    def matched_by_name(self) -> list[str]:
+        return [
+            team_name for team_name, role_ids in self.holders.items()
+            if self.tournament.team_role_ids[team_name] not in role_ids
+        ]
+
+# Role tables of one guild: role names, organizer roles and a team table per tournament, kept up to
+# date role by role from the guild's role events
+class _GuildRoles:
+    __slots__ = ("roles", "privileged", "tournaments")
+
+    def __init__(self, guild: discord.Guild):
+        self.roles = {}
+        self.privileged = set()
+        # Tournament key -> team table
+        self.tournaments = {}
+        for role in guild.roles:
+            self.add_role(role)
+
+    def add_role(self, role: discord.Role):
+        name = role.name.casefold()
+        self.roles[role.id] = name
+        if role.permissions.administrator or role.name == ORGANIZER_ROLE:
+            self.privileged.add(role.id)
+        for table in self.tournaments.values():
+            table.add_role(role.id, name)
+
+    def remove_role(self, role_id: int):
+        self.roles.pop(role_id, None)
+        self.privileged.discard(role_id)
+        for table in self.tournaments.values():
+            table.remove_role(role_id)
+
+    def team_table(self, tournament: "Tournament") -> _TeamTable:
+        table = self.tournaments.get(tournament.key)
+        if table is None or table.tournament is not tournament:
+            table = self.tournaments[tournament.key] = _TeamTable(tournament, self.roles)
+        return table
+
+# Resolved roles of one member: their role IDs, organizer status and teams per tournament
+class _MemberRoles:
+    __slots__ = ("role_ids", "admin", "teams")
+
+    def __init__(self, role_ids: frozenset[int], admin: bool):
+        self.role_ids = role_ids
+        self.admin = admin
+        # Tournament key -> (tournament, teams)
+        self.teams = {}
+
+# Resolved members of one guild, least recently used first, and which of them hold each role
+class _MemberCache:
+    __slots__ = ("members", "holders")
+
+    def __init__(self):
+        self.members = OrderedDict()
+        # Role ID -> IDs of the cached members holding it
+        self.holders = {}
+
+    def get(self, member_id: int) -> _MemberRoles | None:
+        member_roles = self.members.get(member_id)
+        if member_roles is not None:
+            self.members.move_to_end(member_id)
+        return member_roles
+
+    def add(self, member_id: int, member_roles: _MemberRoles, max_members: int):
+        self.members[member_id] = member_roles
+        for role_id in member_roles.role_ids:
+            self.holders.setdefault(role_id, set()).add(member_id)
+        if len(self.members) > max_members:
+            self.remove(next(iter(self.members)))
+
+    def remove(self, member_id: int):
+        member_roles = self.members.pop(member_id, None)
+        if member_roles is None:
+            return
+        for role_id in member_roles.role_ids:
+            holders = self.holders.get(role_id)
+            if holders is None:
+                continue
+            holders.discard(member_id)
+            if not holders:
+                del self.holders[role_id]
+
+    # Forget the members holding a role, touching only them
+    def remove_holders(self, role_id: int):
+        for member_id in list(self.holders.get(role_id, ())):
+            self.remove(member_id)
+
+# Per-guild index of role IDs to tournament teams and organizer status, with the resolved access of
+# recently seen members cached until their roles or the guild's roles change. The cog forwards member
+# and role events, which also keep each tournament's missing-role audit current.
+class RoleIndex:
+    def __init__(self, max_members: int = MAX_CACHED_MEMBERS):
+        self.max_members = max_members
+        self._guilds = {}
+        # Guild ID -> member cache
+        self._members = {}
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    def _guild_roles(self, guild: discord.Guild) -> _GuildRoles:
+        guild_roles = self._guilds.get(guild.id)
+        if guild_roles is None:
+            guild_roles = self._guilds[guild.id] = _GuildRoles(guild)
+        return guild_roles
+
+    def _member_roles(self, member: discord.Member) -> _MemberRoles:
+        cache = self._members.get(member.guild.id)
+        if cache is None:
+            cache = self._members[member.guild.id] = _MemberCache()
+        member_roles = cache.get(member.id)
+        if member_roles is not None:
+            self.hits += 1
+            return member_roles
+
+        self.misses += 1
+        role_ids = frozenset(role.id for role in member.roles)
+        admin = not role_ids.isdisjoint(self._guild_roles(member.guild).privileged)
+        member_roles = _MemberRoles(role_ids, admin)
+        cache.add(member.id, member_roles, self.max_members)
+        return member_roles
+
+    def is_admin(self, member: discord.abc.User) -> bool:
+        if getattr(member, "guild", None) is None:
+            return False
+        return self._member_roles(member).admin
+
+    # Access of a member in a tournament (users outside a guild have none)
+    def access(self, member: discord.abc.User, tournament: "Tournament | None") -> Access:
+        if getattr(member, "guild", None) is None:
+            return Access(False, frozenset())
+
+        member_roles = self._member_roles(member)
+        if tournament is None:
+            return Access(member_roles.admin, frozenset())
+
+        entry = member_roles.teams.get(tournament.key)
+        if entry is None or entry[0] is not tournament:
+            team_roles = self._guild_roles(member.guild).team_table(tournament).team_roles
+            teams = frozenset().union(*(team_roles[role_id] for role_id in member_roles.role_ids if role_id in team_roles))
+            entry = member_roles.teams[tournament.key] = (tournament, teams)
+        return Access(member_roles.admin, entry[1])
+
+    # Role audit of a tournament in a guild: (missing teams, teams only matched by role name)
+    def audit(self, guild: discord.Guild, tournament: "Tournament") -> tuple[list[str], list[str]]:
+        table = self._guild_roles(guild).team_table(tournament)
+        return table.missing(), table.matched_by_name()
+
+    def invalidate_member(self, guild_id: int, member_id: int):
+        cache = self._members.get(guild_id)
+        if cache is not None:
+            cache.remove(member_id)
+
+    # Forget the resolved access of the guild's members holding a role
+    def _invalidate_holders(self, guild_id: int, role_id: int):
+        cache = self._members.get(guild_id)
+        if cache is not None:
+            cache.remove_holders(role_id)
+
+    # Role events update the guild's tables in place (guilds that were never indexed are skipped)
+    def role_created(self, role: discord.Role):
+        guild_roles = self._guilds.get(role.guild.id)
+        if guild_roles is not None:
+            guild_roles.add_role(role)
+
+    def role_deleted(self, role: discord.Role):
+        guild_roles = self._guilds.get(role.guild.id)
+        if guild_roles is not None:
+            guild_roles.remove_role(role.id)
+        self._invalidate_holders(role.guild.id, role.id)
+
+    def role_updated(self, before: discord.Role, after: discord.Role):
+        if before.name == after.name and before.permissions == after.permissions:
+            return
+        guild_roles = self._guilds.get(after.guild.id)
+        if guild_roles is not None:
+            guild_roles.remove_role(after.id)
+            guild_roles.add_role(after)
+        self._invalidate_holders(after.guild.id, after.id)
+
+    # (Re)build a guild's role tables, e.g. when the bot joins it
+    def index_guild(self, guild: discord.Guild):
+        self.forget_guild(guild.id)
+        self._guilds[guild.id] = _GuildRoles(guild)
+
+    def forget_guild(self, guild_id: int):
+        self._guilds.pop(guild_id, None)
+        self._members.pop(guild_id, None)
@@ -0,0 +1,63 @@
+import re
+from pathlib import Path
+
+# Pairings files sit next to the tournament file, named <tournament key>-<round>.txt
+PAIRINGS_SUFFIX = ".txt"
+ROUND_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+# One matchup per line (or separated by ";" inline): "Team A vs Team B"; "#" starts a comment line
+MATCHUP_SEPARATOR = re.compile(r"\s+vs\.?\s+", re.IGNORECASE)
+MATCHUP_DELIMITER = re.compile(r"[;\n]")
+
+# Path of a round's pairings file (None if the round name could leave the tournaments directory)
+def pairings_path(directory: Path, tournament_key: str, round_name: str) -> Path | None:
+    if not ROUND_NAME.fullmatch(round_name):
+        return None
+    return directory / f"{tournament_key}-{round_name}{PAIRINGS_SUFFIX}"
+
+# Split pairings text into (team, team) name pairs, collecting lines that are not a matchup
+def parse_pairings(text: str) -> tuple[list[tuple[str, str]], list[str]]:
+    matchups = []
+    errors = []
+    for line in MATCHUP_DELIMITER.split(text):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        teams = MATCHUP_SEPARATOR.split(line)
+        if len(teams) != 2 or not all(team.strip() for team in teams):
+            errors.append(f"`{line}` is not a matchup (expected \"Team A vs Team B\")")
+            continue
+        matchups.append((teams[0].strip(), teams[1].strip()))
+    return matchups, errors
+
+# Channel name for a matchup, in the form Discord stores text channel names
+def channel_slug(name: str) -> str:
+    return re.sub(r"[^\w-]+", "-", name.casefold()).strip("-")[:100]
+
+# Setup status of each matchup of a round, rendered into one status message
+WAITING = ":hourglass:"
+STARTED = ":white_check_mark:"
+SKIPPED = ":warning:"
+FAILED = ":x:"
+
+class RoundProgress:
+    def __init__(self, names: list[str]):
+        self.names = names
+        self.statuses = [(WAITING, "")] * len(names)
+
+    def update(self, index: int, status: str, note: str = ""):
+        self.statuses[index] = (status, note)
+
+    def count(self, status: str) -> int:
+        return sum(1 for current, _ in self.statuses if current == status)
+
+    @property
+    def finished(self) -> int:
+        return len(self.statuses) - self.count(WAITING)
+
+    def lines(self) -> list[str]:
+        return [
+            f"{status} {name}" + (f": {note}" if note else "")
+            for name, (status, note) in zip(self.names, self.statuses)
+        ]
@@ -0,0 +1,115 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from .store import StateStore
+
+log = logging.getLogger(__name__)
+
+# One shared scheduler for every timed event in the bot (inactivity timeouts, warnings, reveals).
+# Deadlines live in a heap keyed by (kind, target); rescheduling pushes a new heap entry and the
+# superseded one is skipped when it surfaces, so a reset is O(log n) and no task sleeps per channel.
+# Deadlines of persistent kinds are saved to the state store and restored after a restart.
+class DeadlineScheduler:
+    def __init__(self, store: StateStore | None = None):
+        self.store = store
+        self._heap = []
+        self._deadlines = {}
+        self._handlers = {}
+        self._persistent = set()
+        self._counter = itertools.count()
+        self._wake = asyncio.Event()
+        self._task = None
+
+    # Register the coroutine function called with the target when a deadline of this kind expires
+    def register(self, kind: str, handler, persistent: bool = True):
+        self._handlers[kind] = handler
+        if persistent:
+            self._persistent.add(kind)
+
+    def schedule(self, kind: str, target, when: float):
+        key = (kind, target)
+        seq = next(self._counter)
+        self._deadlines[key] = (when, seq)
+        heapq.heappush(self._heap, (when, seq, key))
+
+        if kind in self._persistent and self.store:
+            self.store.put("deadline", f"{kind}:{target}", [kind, target, when])
+        self._compact()
+        self._wake.set()
+
+    def schedule_in(self, kind: str, target, delay: float):
+        self.schedule(kind, target, time.time() + delay)
+
+    def cancel(self, kind: str, target):
+        if self._deadlines.pop((kind, target), None) and kind in self._persistent and self.store:
+            self.store.delete("deadline", f"{kind}:{target}")
+
+    def get(self, kind: str, target) -> float | None:
+        entry = self._deadlines.get((kind, target))
+        return entry[0] if entry else None
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    # Reload persisted deadlines and start firing them (overdue ones fire immediately)
+    def start(self):
+        if self.store:
+            for kind, target, when in self.store.load("deadline").values():
+                if (kind, target) not in self._deadlines:
+                    self.schedule(kind, target, when)
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    # Drop superseded heap entries once they outnumber the live ones
+    def _compact(self):
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._deadlines):
+            self._heap = [(when, seq, key) for key, (when, seq) in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_due(self, now: float) -> list:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, seq, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) != (when, seq):
+                continue
+            self.cancel(*key)
+            due.append(key)
+        return due
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            now = time.time()
+
+            for kind, target in self._pop_due(now):
+                handler = self._handlers.get(kind)
+                if handler is None:
+                    log.warning("No handler registered for deadline %s:%s", kind, target)
+                    continue
+                asyncio.create_task(self._fire(handler, kind, target))
+
+            # Skip superseded entries so the wait is for the next live deadline
+            while self._heap and self._deadlines.get(self._heap[0][2]) != self._heap[0][:2]:
+                heapq.heappop(self._heap)
+
+            if not self._heap:
+                await self._wake.wait()
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max(0, self._heap[0][0] - time.time()))
+            except asyncio.TimeoutError:
+                pass
+
+    @staticmethod
+    async def _fire(handler, kind, target):
+        try:
+            await handler(target)
+        except Exception:
+            log.exception("Deadline handler %s failed for %s", kind, target)
@@ -0,0 +1,171 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from .tournament import MapInfo, Tournament
+
+# Selection phases, in the order a match goes through them
+ORDER = "order"
+BAN = "ban"
+PICK = "pick"
+FINAL = "final"
+DONE = "done"
+PHASE_RANKS = {ORDER: 0, BAN: 1, PICK: 2, FINAL: 3, DONE: 4}
+
+# Who acts on a turn: the team banning first (A), the team banning second (B), the coin toss winner or either team
+FIRST = 0
+SECOND = 1
+COIN_TOSS = 2
+EITHER = 3
+SEQUENCE_SIDES = {"A": FIRST, "B": SECOND}
+
+# A single step of the map selection
+class Turn(NamedTuple):
+    action: str
+    side: int
+
+# Default ban and pick sequences: bans alternate starting with the first team to ban (the second team
+# gets one ban less without equal bans), and picks alternate starting with the second team to ban
+def default_sequences(equal_bans: bool, max_bans: int, max_picks: int) -> tuple[str, str]:
+    ban_sequence = "AB" * max_bans
+    if not equal_bans and ban_sequence:
+        ban_sequence = ban_sequence[:-1]
+    return ban_sequence, "BA" * max_picks
+
+# Build the full turn table for a tournament format (maps not picked by a team are decided by the bot)
+def compile_turns(ban_sequence: str, pick_sequence: str, maps_per_match: int) -> tuple[Turn, ...]:
+    turns = [Turn(ORDER, COIN_TOSS)]
+    turns += [Turn(BAN, SEQUENCE_SIDES[side]) for side in ban_sequence]
+    turns += [Turn(PICK, SEQUENCE_SIDES[side]) for side in pick_sequence]
+    if maps_per_match > len(pick_sequence):
+        turns.append(Turn(FINAL, EITHER))
+    turns.append(Turn(DONE, EITHER))
+    return tuple(turns)
+
+# Map selection state of a channel. The tournament's turn table drives the selection, so the current
+# phase and acting team are a lookup at the turn cursor.
+@dataclass(slots=True)
+class SelectionState:
+    tournament: "Tournament | None" = None
+    teams: tuple[str, str] | None = None
+    coin_toss_winner: str | None = None
+    ban_order: tuple[str, str] | None = None
+    turn: int = 0
+    bans: list[str] = field(default_factory=list)
+    picks: list[str] = field(default_factory=list)
+    remaining_maps: dict[str, "MapInfo"] = field(default_factory=dict)
+    final_map_pool: dict[str, str] = field(default_factory=dict)
+    random_map: str | None = None
+    # ID of the match in the selection log, and when it started (seconds since the epoch)
+    match_id: int | None = None
+    started_at: float | None = None
+
+    @classmethod
+    def start(cls, tournament: "Tournament", team1: str, team2: str, coin_toss_winner: str | None,
+              match_id: int | None = None, started_at: float | None = None) -> "SelectionState":
+        return cls(
+            tournament, (team1, team2), coin_toss_winner, remaining_maps=dict(tournament.maps),
+            match_id=match_id, started_at=started_at)
+
+    @property
+    def current(self) -> Turn | None:
+        if self.tournament is None:
+            return None
+        return self.tournament.turns[self.turn]
+
+    @property
+    def next(self) -> Turn | None:
+        if self.tournament is None or self.turn + 1 >= len(self.tournament.turns):
+            return None
+        return self.tournament.turns[self.turn + 1]
+
+    @property
+    def phase(self) -> str | None:
+        turn = self.current
+        return turn.action if turn else None
+
+    # Whether the selection has not reached the given phase yet (true for every phase before /match)
+    def before(self, phase: str) -> bool:
+        return self.tournament is None or PHASE_RANKS[self.phase] < PHASE_RANKS[phase]
+
+    def after(self, phase: str) -> bool:
+        return self.tournament is not None and PHASE_RANKS[self.phase] > PHASE_RANKS[phase]
+
+    # Team acting on a turn (None if either team may act)
+    def team_for(self, turn: Turn) -> str | None:
+        if turn.side == COIN_TOSS:
+            return self.coin_toss_winner
+        if turn.side == EITHER or self.ban_order is None:
+            return None
+        return self.ban_order[turn.side]
+
+    @property
+    def acting_team(self) -> str | None:
+        return self.team_for(self.current)
+
+    # Teams that made each ban/pick so far, in order
+    def teams_for(self, phase: str) -> list[str]:
+        made = len(self.bans) if phase == BAN else len(self.picks)
+        return [self.team_for(turn) for turn in self.tournament.turns if turn.action == phase][:made]
+
+    def set_ban_order(self, first_to_ban: str):
+        team1, team2 = self.teams
+        self.ban_order = (first_to_ban, team2 if first_to_ban == team1 else team1)
+        self.turn += 1
+
+    def ban(self, map_key: str):
+        self.bans.append(map_key)
+        self.remaining_maps.pop(map_key)
+        self.turn += 1
+
+    def pick(self, map_key: str):
+        self.picks.append(map_key)
+        self.remaining_maps.pop(map_key)
+        self.turn += 1
+
+    def decide(self, map_key: str):
+        self.random_map = map_key
+        self.turn += 1
+
+    # Plain values for the state store
+    def dump(self) -> dict:
+        return {
+            "tournament": self.tournament.key if self.tournament else None,
+            "teams": list(self.teams) if self.teams else None,
+            "coin_toss_winner": self.coin_toss_winner,
+            "ban_order": list(self.ban_order) if self.ban_order else None,
+            "turn": self.turn,
+            "bans": self.bans,
+            "picks": self.picks,
+            "remaining_maps": list(self.remaining_maps),
+            "final_map_pool": self.final_map_pool,
+            "random_map": self.random_map,
+            "match_id": self.match_id,
+            "started_at": self.started_at,
+        }
+
+    # Rebuild a stored state against its tournament (None if the turn cursor no longer fits its format)
+    @classmethod
+    def load(cls, data: dict, tournament: "Tournament | None") -> "SelectionState | None":
+        if tournament is None:
+            return cls()
+        if not 0 <= data["turn"] < len(tournament.turns):
+            return None
+
+        return cls(
+            tournament=tournament,
+            teams=tuple(data["teams"]),
+            coin_toss_winner=data["coin_toss_winner"],
+            ban_order=tuple(data["ban_order"]) if data["ban_order"] else None,
+            turn=data["turn"],
+            bans=data["bans"],
+            picks=data["picks"],
+            remaining_maps={
+                map_key: tournament.maps[map_key]
+                for map_key in data["remaining_maps"] if map_key in tournament.maps
+            },
+            final_map_pool=data["final_map_pool"],
+            random_map=data["random_map"],
+            match_id=data.get("match_id"),
+            started_at=data.get("started_at"),
+        )
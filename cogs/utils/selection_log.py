@@ -0,0 +1,215 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from .selection import SelectionState
+from .writebehind import WriteBehindDatabase
+
+if TYPE_CHECKING:
+    from .tournament import Tournament
+
+log = logging.getLogger(__name__)
+
+# Event kinds. A match starts with START and COIN_TOSS, and ends with DONE, CLEARED or TIMEOUT.
+START = "start"
+COIN_TOSS = "coin_toss"
+ORDER_CHOSEN = "order"
+BAN = "ban"
+PICK = "pick"
+VOTE = "vote"
+DECIDE = "decide"
+DONE = "done"
+CLEARED = "cleared"
+TIMEOUT = "timeout"
+END_KINDS = (DONE, CLEARED, TIMEOUT)
+
+# A state snapshot is written every this many events, so a rebuild applies at most this many events
+SNAPSHOT_EVERY = 8
+
+# Random choice from a fresh seed, so the draw can be checked against the seed in the log
+def seeded_choice(options: list[str]) -> tuple[str, int]:
+    seed = random.getrandbits(32)
+    return random.Random(seed).choice(options), seed
+
+# One logged event of a match (seq counts from 0 per match)
+class Event(NamedTuple):
+    seq: int
+    kind: str
+    data: dict
+    user_id: int | None
+    at: float
+
+# A match read back from the log: its events and the latest snapshot up to the requested event
+@dataclass(slots=True)
+class MatchRecord:
+    match_id: int
+    guild_id: int
+    channel_id: int
+    tournament: str
+    teams: tuple[str, str]
+    started_at: float
+    events: list[Event] = field(default_factory=list)
+    snapshot: tuple[int, dict] | None = None
+
+# Apply one event to a selection state (events without a state change are skipped)
+def apply_event(selection_state: SelectionState, event: Event):
+    data = event.data
+    if event.kind == COIN_TOSS:
+        selection_state.coin_toss_winner = data["winner"]
+    elif event.kind == ORDER_CHOSEN:
+        selection_state.set_ban_order(data["first_to_ban"])
+    elif event.kind == BAN:
+        selection_state.ban(data["map"])
+    elif event.kind == PICK:
+        selection_state.pick(data["map"])
+    elif event.kind == VOTE:
+        for team in data["teams"]:
+            selection_state.final_map_pool[team] = data["pool"]
+    elif event.kind == DECIDE:
+        selection_state.decide(data["map"])
+
+# Rebuild a match's selection state as of an event, from its snapshot plus the events after it.
+# Raises KeyError if the tournament changed since (e.g. a logged map was removed).
+def replay(record: MatchRecord, tournament: "Tournament", upto: int | None = None) -> SelectionState:
+    if record.snapshot is not None:
+        snapshot_seq, data = record.snapshot
+        selection_state = SelectionState.load(data, tournament)
+        if selection_state is None:
+            raise KeyError(record.tournament)
+    else:
+        snapshot_seq = 0
+        selection_state = SelectionState.start(tournament, *record.teams, None, record.match_id, record.started_at)
+
+    for event in record.events:
+        if event.seq <= snapshot_seq or (upto is not None and event.seq > upto):
+            continue
+        apply_event(selection_state, event)
+    return selection_state
+
+# Append-only SQLite (WAL) log of every map selection: one row per match, its events in order, and a
+# snapshot of the state every few events. Like the state store, appends are written behind the event
+# loop in batches, so commands never wait on disk. Rows are never updated.
+class SelectionLog(WriteBehindDatabase):
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS matches ("
+        " match_id INTEGER PRIMARY KEY,"
+        " guild_id INTEGER NOT NULL,"
+        " channel_id INTEGER NOT NULL,"
+        " tournament TEXT NOT NULL,"
+        " team1 TEXT NOT NULL,"
+        " team2 TEXT NOT NULL,"
+        " started_at REAL NOT NULL"
+        ");"
+        "CREATE INDEX IF NOT EXISTS matches_by_guild ON matches (guild_id, match_id);"
+        "CREATE TABLE IF NOT EXISTS events ("
+        " match_id INTEGER NOT NULL,"
+        " seq INTEGER NOT NULL,"
+        " kind TEXT NOT NULL,"
+        " data TEXT NOT NULL,"
+        " user_id INTEGER,"
+        " at REAL NOT NULL,"
+        " PRIMARY KEY (match_id, seq)"
+        ") WITHOUT ROWID;"
+        "CREATE TABLE IF NOT EXISTS snapshots ("
+        " match_id INTEGER NOT NULL,"
+        " seq INTEGER NOT NULL,"
+        " state TEXT NOT NULL,"
+        " PRIMARY KEY (match_id, seq)"
+        ") WITHOUT ROWID;")
+    FLUSH_ERROR = "Could not append %d selection log row(s)"
+
+    def __init__(self, path: Path, flush_interval: float = 1.0):
+        super().__init__(path, flush_interval)
+        self._next_id = 1
+        # Match ID -> next event seq, for matches that have not ended
+        self._seqs = {}
+
+    def open(self):
+        super().open()
+        self._next_id = self._conn.execute("SELECT COALESCE(MAX(match_id), 0) + 1 FROM matches").fetchone()[0]
+        # Matches still in progress at the last shutdown keep appending after their last event
+        placeholders = ", ".join("?" * len(END_KINDS))
+        self._seqs = dict(self._conn.execute(
+            "SELECT match_id, MAX(seq) + 1 FROM events GROUP BY match_id"
+            f" HAVING SUM(kind IN ({placeholders})) = 0", END_KINDS).fetchall())
+
+    # Log the start of a match and return its ID
+    def start_match(self, guild_id: int, channel_id: int, tournament: str, teams: tuple[str, str], user_id: int | None) -> int:
+        match_id = self._next_id
+        self._next_id += 1
+        self._pending.append((
+            "INSERT INTO matches (match_id, guild_id, channel_id, tournament, team1, team2, started_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (match_id, guild_id, channel_id, tournament, *teams, time.time())))
+        self._seqs[match_id] = 0
+        self.append(match_id, START, {"tournament": tournament, "teams": list(teams)}, user_id)
+        return match_id
+
+    # Queue an event; the state after the event is snapshotted every SNAPSHOT_EVERY events
+    def append(self, match_id: int, kind: str, data: dict, user_id: int | None = None,
+               selection_state: SelectionState | None = None):
+        seq = self._seqs.get(match_id)
+        if seq is None:
+            log.warning("Dropped %s event of match %s, which has already ended", kind, match_id)
+            return
+
+        self._pending.append((
+            "INSERT INTO events (match_id, seq, kind, data, user_id, at) VALUES (?, ?, ?, ?, ?, ?)",
+            (match_id, seq, kind, json.dumps(data), user_id, time.time())))
+        if selection_state is not None and seq and seq % SNAPSHOT_EVERY == 0:
+            self._pending.append((
+                "INSERT INTO snapshots (match_id, seq, state) VALUES (?, ?, ?)",
+                (match_id, seq, json.dumps(selection_state.dump()))))
+
+        if kind in END_KINDS:
+            del self._seqs[match_id]
+        else:
+            self._seqs[match_id] = seq + 1
+
+    def _apply(self, batch: list):
+        for statement, params in batch:
+            self._conn.execute(statement, params)
+
+    # Latest matches of a guild, newest first: (match ID, tournament, teams, start time)
+    async def recent(self, guild_id: int, limit: int = 25) -> list[tuple[int, str, tuple[str, str], float]]:
+        await self.flush()
+        rows = await asyncio.to_thread(self._read, (
+            "SELECT match_id, tournament, team1, team2, started_at FROM matches"
+            " WHERE guild_id = ? ORDER BY match_id DESC LIMIT ?"), (guild_id, limit))
+        return [(match_id, tournament, (team1, team2), started_at) for match_id, tournament, team1, team2, started_at in rows]
+
+    # Read a match back with all of its events and its latest snapshot at or before `upto`
+    async def load(self, match_id: int, upto: int | None = None) -> MatchRecord | None:
+        await self.flush()
+        return await asyncio.to_thread(self._load, match_id, upto)
+
+    def _read(self, statement: str, params: tuple) -> list:
+        with self._lock:
+            return self._conn.execute(statement, params).fetchall()
+
+    def _load(self, match_id: int, upto: int | None) -> MatchRecord | None:
+        rows = self._read(
+            "SELECT guild_id, channel_id, tournament, team1, team2, started_at FROM matches WHERE match_id = ?",
+            (match_id,))
+        if not rows:
+            return None
+
+        guild_id, channel_id, tournament, team1, team2, started_at = rows[0]
+        record = MatchRecord(match_id, guild_id, channel_id, tournament, (team1, team2), started_at)
+        record.events = [
+            Event(seq, kind, json.loads(data), user_id, at)
+            for seq, kind, data, user_id, at in self._read(
+                "SELECT seq, kind, data, user_id, at FROM events WHERE match_id = ? ORDER BY seq", (match_id,))
+        ]
+
+        snapshot = self._read(
+            "SELECT seq, state FROM snapshots WHERE match_id = ? AND seq <= ? ORDER BY seq DESC LIMIT 1",
+            (match_id, upto if upto is not None else len(record.events)))
+        if snapshot:
+            record.snapshot = (snapshot[0][0], json.loads(snapshot[0][1]))
+        return record
@@ -0,0 +1,63 @@
+import json
+
+from .writebehind import WriteBehindDatabase
+
+# Local SQLite (WAL) key/value store for bot state, written behind the event loop. Repeated writes
+# to the same key between flushes collapse into one.
+class StateStore(WriteBehindDatabase):
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS state ("
+        " namespace TEXT NOT NULL,"
+        " key NOT NULL,"
+        " value TEXT NOT NULL,"
+        " PRIMARY KEY (namespace, key)"
+        ") WITHOUT ROWID")
+    FLUSH_ERROR = "Could not write %d state change(s)"
+
+    # Everything saved under a namespace (pending writes included)
+    def load(self, namespace: str) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM state WHERE namespace = ?", (namespace,)).fetchall()
+        values = {key: json.loads(value) for key, value in rows}
+
+        for (pending_namespace, key), value in self._pending.items():
+            if pending_namespace != namespace:
+                continue
+            if value is None:
+                values.pop(key, None)
+            else:
+                values[key] = json.loads(self._serialize(value))
+        return values
+
+    # Queue a write; the value is serialized now so later in-place changes are not picked up by accident.
+    # A zero-argument callable is called at flush time instead, so state that changes often (e.g. a
+    # large PUG queue) is dumped once per flush rather than on every change.
+    def put(self, namespace: str, key, value):
+        self._pending[(namespace, key)] = value if callable(value) else json.dumps(value)
+
+    def delete(self, namespace: str, key):
+        self._pending[(namespace, key)] = None
+
+    @staticmethod
+    def _serialize(value) -> str:
+        return json.dumps(value()) if callable(value) else value
+
+    def _empty(self):
+        return {}
+
+    # Deferred values are dumped on the event loop, where their state cannot change mid-dump
+    def _prepare(self, batch: dict) -> dict:
+        return {key: None if value is None else self._serialize(value) for key, value in batch.items()}
+
+    # Newer writes made while flushing take priority over the failed batch
+    def _requeue(self, batch: dict, pending: dict) -> dict:
+        return batch | pending
+
+    def _apply(self, batch: dict):
+        upserts = [(namespace, key, value) for (namespace, key), value in batch.items() if value is not None]
+        deletes = [(namespace, key) for (namespace, key), value in batch.items() if value is None]
+        self._conn.executemany(
+            "INSERT INTO state (namespace, key, value) VALUES (?, ?, ?)"
+            " ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value", upserts)
+        self._conn.executemany("DELETE FROM state WHERE namespace = ? AND key = ?", deletes)
@@ -0,0 +1,36 @@
+import hashlib
+import json
+import logging
+
+import discord
+from discord import app_commands
+
+log = logging.getLogger(__name__)
+
+# Store namespace holding the hash of the last synced command tree, per application and scope
+NAMESPACE = "command_sync"
+
+# Stable hash of the command payloads Discord would receive for a scope (None for global commands).
+# Commands are sorted by type and name so registration order does not change the hash.
+def command_tree_hash(tree: app_commands.CommandTree, guild: discord.abc.Snowflake | None = None) -> str:
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+        key=lambda command: (command.get("type", 1), command["name"]),
+    )
+    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+# Sync the command tree only when its definitions changed since the last successful sync.
+# Returns the number of synced commands, or None if the sync was skipped.
+async def sync_if_changed(bot, guild: discord.abc.Snowflake | None = None, force: bool = False) -> int | None:
+    scope = f"{bot.application_id}:{guild.id if guild else 'global'}"
+    digest = command_tree_hash(bot.tree, guild)
+
+    if not force and bot.store.load(NAMESPACE).get(scope) == digest:
+        log.info("Command tree unchanged (%s), skipping sync", digest[:12])
+        return None
+
+    synced = await bot.tree.sync(guild=guild)
+    bot.store.put(NAMESPACE, scope, digest)
+    await bot.store.flush()
+    return len(synced)
@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+from .autocomplete import ChoiceIndex, normalize
+from .selection import Turn, compile_turns
+
+# Raised when a tournament definition cannot be loaded or compiled
+class TournamentError(Exception):
+    pass
+
+# Placeholder teams that anyone is allowed to play for
+MIXED_TEAMS = frozenset({"Mixed Team", "Mixed Team A", "Mixed Team B"})
+
+# Tournament settings (INFO)
+class TournamentInfo(NamedTuple):
+    full_name: str
+    start_date: datetime
+    equal_bans: bool
+    maps_per_match: int
+    max_bans: int
+    max_picks: int
+    map_pools: tuple[str, ...]
+    ban_sequence: str
+    pick_sequence: str
+    pacing: str | None = None
+
+# A map with its base names, aliases and map pool type (MAP_POOL entry)
+class MapInfo(NamedTuple):
+    key: str
+    base_name: tuple[str, ...]
+    aliases: tuple[str, ...]
+    map_pool: str
+
+# A team Discord role with its role ID, clan tag and team name (TEAM_ROLES entry)
+class TeamInfo(NamedTuple):
+    full_name: str
+    id: int
+    tag: str
+    name: str
+
+# Immutable, pre-compiled tournament (built once per tournament file and shared by every channel using it)
+@dataclass(frozen=True, slots=True)
+class Tournament:
+    key: str
+    info: TournamentInfo
+    maps: Mapping[str, MapInfo]
+    teams: Mapping[str, TeamInfo]
+    base_names: Mapping[str, str]
+    trimmed_names: Mapping[str, str]
+    team_role_ids: Mapping[str, int]
+    maps_by_pool: Mapping[str, tuple[str, ...]]
+    map_index: Mapping[str, str]
+    team_index: Mapping[str, str]
+    map_choices: ChoiceIndex
+    team_choices: ChoiceIndex
+    pool_choices: ChoiceIndex
+    turns: tuple[Turn, ...]
+
+    @property
+    def full_name(self) -> str:
+        return self.info.full_name
+
+    @property
+    def start_date(self) -> datetime:
+        return self.info.start_date
+
+    @property
+    def map_pools(self) -> tuple[str, ...]:
+        return self.info.map_pools
+
+# Function to resolve map name (checks map names and aliases)
+def resolve_map_name(tournament: Tournament, map_name):
+    return tournament.map_index.get(normalize(map_name))
+
+# Function to resolve team name (returns full team name)
+def resolve_team_name(tournament: Tournament, team_name):
+    if team_name == "Mixed Team":
+        return "Mixed Team"
+    return tournament.team_index.get(normalize(team_name))
+
+# Build a normalized name -> official name index, collecting every key claimed by more than one entry
+def build_index(kind: str, names: dict[str, list[str]], errors: list[str]) -> Mapping[str, str]:
+    index = {}
+    for official_name, keys in names.items():
+        for key in keys:
+            key = normalize(key)
+            if not key:
+                continue
+            owner = index.setdefault(key, official_name)
+            if owner != official_name:
+                errors.append(f"{kind} name \"{key}\" is shared by \"{owner}\" and \"{official_name}\"")
+    return MappingProxyType(index)
+
+# Build the compiled tournament from its loaded records
+def compile_tournament(key: str, info: TournamentInfo, maps: tuple[MapInfo, ...], teams: tuple[TeamInfo, ...]) -> Tournament:
+    maps_by_pool = {pool: [] for pool in info.map_pools}
+    for map_info in maps:
+        maps_by_pool.setdefault(map_info.map_pool, []).append(map_info.key)
+
+    # Alias collisions are reported at load time instead of silently resolving to the first match
+    errors = []
+    map_index = build_index("Map", {
+        map_info.key: [map_info.key, *map_info.base_name, *map_info.aliases]
+        for map_info in maps
+    }, errors)
+    team_index = build_index("Team", {
+        team_info.full_name: [team_info.full_name, team_info.tag, team_info.name]
+        for team_info in teams
+    }, errors)
+    if errors:
+        raise TournamentError(f"{key}: " + "; ".join(errors))
+
+    return Tournament(
+        key=key,
+        info=info,
+        maps=MappingProxyType({map_info.key: map_info for map_info in maps}),
+        teams=MappingProxyType({team_info.full_name: team_info for team_info in teams}),
+        base_names=MappingProxyType({
+            map_info.key: map_info.base_name[0] if map_info.base_name else "Unknown Map"
+            for map_info in maps
+        }),
+        trimmed_names=MappingProxyType({team_info.full_name: team_info.name for team_info in teams}),
+        team_role_ids=MappingProxyType({team_info.full_name: team_info.id for team_info in teams}),
+        maps_by_pool=MappingProxyType({pool: tuple(keys) for pool, keys in maps_by_pool.items()}),
+        map_index=map_index,
+        team_index=team_index,
+        map_choices=ChoiceIndex(
+            (map_info.key, (*map_info.base_name, *map_info.aliases))
+            for map_info in maps),
+        team_choices=ChoiceIndex(
+            [(team_info.full_name, (team_info.tag, team_info.name)) for team_info in teams]
+            + [("Mixed Team", ())]),
+        pool_choices=ChoiceIndex((pool, ()) for pool in info.map_pools),
+        turns=compile_turns(info.ban_sequence, info.pick_sequence, info.maps_per_match),
+    )
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+# Local SQLite (WAL) database written behind the event loop. Writes are buffered in memory and
+# committed in batches from a worker thread, so commands never wait on disk. Flushes run one at a
+# time, from taking the batch until it is committed, so batches land in order and a read that
+# flushes first sees every write made before it.
+#
+# Subclasses set SCHEMA and FLUSH_ERROR, and implement _empty (the pending batch container) and
+# _apply (the statements of a batch, run inside the transaction).
+class WriteBehindDatabase:
+    SCHEMA = ""
+    # Logged with the batch size when a batch cannot be committed
+    FLUSH_ERROR = "Could not write %d change(s)"
+
+    def __init__(self, path: Path, flush_interval: float = 1.0):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self._pending = self._empty()
+        self._lock = threading.Lock()
+        self._flushing = asyncio.Lock()
+        self._conn = None
+        self._task = None
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    # Open the database and start the background flusher
+    def start(self):
+        if self._conn is None:
+            self.open()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            # Cancel between flushes, never while a batch is being written
+            async with self._flushing:
+                self._task.cancel()
+                self._task = None
+        await self.flush()
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+    # Write pending changes; a failed batch is put back in front of the writes made since
+    async def flush(self):
+        async with self._flushing:
+            if not self._pending or self._conn is None:
+                return
+            batch = self._prepare(self._pending)
+            self._pending = self._empty()
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except sqlite3.Error:
+                log.exception(self.FLUSH_ERROR + ", retrying on next flush", len(batch))
+                self._pending = self._requeue(batch, self._pending)
+
+    def _write(self, batch):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._apply(batch)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def _empty(self):
+        return []
+
+    # Batch as written (taken on the event loop, so values cannot change while it is prepared)
+    def _prepare(self, batch):
+        return batch
+
+    def _requeue(self, batch, pending):
+        return batch + pending
+
+    def _apply(self, batch):
+        raise NotImplementedError
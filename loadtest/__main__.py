@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from cogs.utils.registry import TournamentRegistry
+
+from .scenarios import pug_storm, selection_flow
+from .server import ACK_DEADLINE, FakeDiscord
+
+TOURNAMENTS_DIR = Path("cogs") / "tournaments"
+SNAPSHOT_DIR = Path("data") / "snapshots"
+STARTUP_TIMEOUT = 60.0 # seconds
+
+def percentile(values: list[float], q: float) -> float:
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+def build_report(discord: FakeDiscord, elapsed: float, flows: dict[str, list[bool]]) -> dict:
+    by_name = defaultdict(list)
+    for record in discord.records:
+        by_name[record.name].append(record)
+
+    commands = {}
+    for name, records in sorted(by_name.items()):
+        latencies = sorted(record.latency * 1000 for record in records if record.latency is not None)
+        commands[name] = {
+            "count": len(records),
+            "acked": len(latencies),
+            "p50_ms": round(percentile(latencies, 0.50), 1),
+            "p95_ms": round(percentile(latencies, 0.95), 1),
+            "p99_ms": round(percentile(latencies, 0.99), 1),
+            "max_ms": round(latencies[-1], 1) if latencies else 0.0,
+            "missed_deadlines": sum(1 for record in records if record.latency is None or record.latency > ACK_DEADLINE),
+            "rest_calls_per_interaction": round(sum(record.rest_calls for record in records) / len(records), 2),
+        }
+
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "interactions": len(discord.records),
+        "flows": {kind: {"completed": sum(results), "total": len(results)} for kind, results in flows.items()},
+        "missed_deadlines": sum(command["missed_deadlines"] for command in commands.values()),
+        "rate_limited": discord.rate_limited,
+        "commands": commands,
+        "rest_calls": dict(discord.rest_calls.most_common()),
+        "unattributed_rest_calls": discord.unattributed_calls,
+    }
+
+def print_report(report: dict):
+    print(f"\n{report['interactions']} interactions in {report['elapsed_s']}s, "
+          f"{report['rate_limited']} injected 429s, {report['missed_deadlines']} missed {ACK_DEADLINE:g}s deadlines")
+    for kind, flows in report["flows"].items():
+        print(f"{kind}: {flows['completed']}/{flows['total']} flows completed")
+
+    print(f"\n{'interaction':<16} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'missed':>7} {'REST/int':>9}")
+    for name, c in report["commands"].items():
+        print(f"{name:<16} {c['count']:>6} {c['p50_ms']:>9.1f} {c['p95_ms']:>9.1f} {c['p99_ms']:>9.1f} "
+              f"{c['max_ms']:>9.1f} {c['missed_deadlines']:>7} {c['rest_calls_per_interaction']:>9.2f}")
+
+    print("\nREST calls by route:")
+    for route, count in report["rest_calls"].items():
+        print(f"{count:>8}  {route}")
+    print(f"{report['unattributed_rest_calls']:>8}  (not tied to an interaction: DMs, nicknames, startup)")
+
+# Wait until the bot has synced its commands and received its guild (False if it exits or times out first)
+async def started(discord: FakeDiscord, bot: asyncio.subprocess.Process) -> bool:
+    async def connected():
+        await discord.synced.wait()
+        await discord.ready.wait()
+
+    ready = asyncio.create_task(connected())
+    exited = asyncio.create_task(bot.wait())
+    await asyncio.wait({ready, exited}, timeout=STARTUP_TIMEOUT, return_when=asyncio.FIRST_COMPLETED)
+    ready.cancel()
+    exited.cancel()
+    return discord.ready.is_set() and bot.returncode is None
+
+async def run(args) -> int:
+    registry = TournamentRegistry(TOURNAMENTS_DIR, SNAPSHOT_DIR)
+    registry.refresh()
+    tournament = registry.get(args.tournament)
+    if tournament is None:
+        print(f"Unknown tournament: {args.tournament}", file=sys.stderr)
+        return 2
+
+    low, high = args.latency
+    discord = FakeDiscord(rate_limit=args.rate_limit, latency=(low / 1000, high / 1000), seed=args.seed)
+    organizer = discord.add_member("organizer", [discord.add_role("Organizer")])
+    for team in tournament.teams.values():
+        discord.add_role(team.full_name)
+    selection_channels = [discord.add_channel(f"match-{i}") for i in range(args.channels)]
+    pug_channels = [discord.add_channel(f"pug-{i}") for i in range(args.pug_channels)]
+    players = [[discord.add_member(f"player-{c}-{i}") for i in range(args.players)] for c in range(args.pug_channels)]
+
+    url = await discord.start()
+    Path(args.bot_log).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.bot_log, "w") as bot_log:
+        bot = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "loadtest.bot", url, discord.guild_id, stdout=bot_log, stderr=bot_log)
+        try:
+            if not await started(discord, bot):
+                print(f"The bot did not start, see {args.bot_log}", file=sys.stderr)
+                return 2
+
+            print(f"Bot connected to {url}: {args.channels} map selection channel(s), "
+                  f"{args.pug_channels} PUG channel(s) with {args.players} player(s) each")
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(selection_flow(discord, channel_id, organizer, tournament) for channel_id in selection_channels),
+                *(pug_storm(discord, channel_id, channel_players, args.rounds)
+                  for channel_id, channel_players in zip(pug_channels, players)))
+            elapsed = time.perf_counter() - start
+
+            # Let trailing followups, panel refreshes and DMs land before counting REST calls
+            await asyncio.sleep(args.settle)
+        finally:
+            if bot.returncode is None:
+                bot.terminate()
+                await bot.wait()
+            await discord.stop()
+
+    report = build_report(discord, elapsed, {
+        "map selection": list(results[:len(selection_channels)]),
+        "PUG storm": list(results[len(selection_channels):]),
+    })
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+
+    failed = report["missed_deadlines"] or not all(results)
+    return 1 if failed else 0
+
+def latency_range(value: str) -> tuple[float, float]:
+    low, _, high = value.partition("-")
+    return float(low), float(high or low)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Load test the bot against a local fake Discord")
+    parser.add_argument("--tournament", default="ss25", help="tournament used by the map selection flows")
+    parser.add_argument("--channels", type=int, default=100, help="channels running a full map selection")
+    parser.add_argument("--pug-channels", type=int, default=10, help="channels running PUG join/leave/ping storms")
+    parser.add_argument("--players", type=int, default=20, help="players per PUG channel")
+    parser.add_argument("--rounds", type=int, default=3, help="join/ping/leave rounds per PUG channel")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="fraction of REST calls answered with a 429")
+    parser.add_argument("--latency", type=latency_range, default=(0.0, 0.0), help="REST latency in ms, e.g. 20-80")
+    parser.add_argument("--settle", type=float, default=5.0, help="seconds to wait for trailing REST calls")
+    parser.add_argument("--seed", type=int, help="seed for injected faults")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--bot-log", default="logs/loadtest-bot.log", help="where the bot's output goes")
+    return asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import yarl
+from discord.gateway import DiscordWebSocket
+from discord.http import Route
+
+from cogs.utils.archive import MatchArchive
+from cogs.utils.scheduler import DeadlineScheduler
+from cogs.utils.selection_log import SelectionLog
+from cogs.utils.store import StateStore
+
+# Run the MatchManager bot from main.py against the fake Discord at the given URL
+# (usage: python -m loadtest.bot <url> <guild id>). State goes to a temporary directory
+# so a load test never touches the bot's real data.
+def main():
+    url, guild_id = sys.argv[1], sys.argv[2]
+    os.environ["DISCORD_GUILD"] = guild_id
+
+    Route.BASE = f"{url}/api/v10"
+    DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(url.replace("http", "ws", 1) + "/gateway")
+
+    import main as app
+
+    bot = app.MatchManager()
+    data_dir = Path(tempfile.mkdtemp(prefix="loadtest-"))
+    bot.store = StateStore(data_dir / "state.db")
+    bot.selection_log = SelectionLog(data_dir / "matches.db")
+    bot.match_archive = MatchArchive(data_dir / "archive.db")
+    bot.scheduler = DeadlineScheduler(bot.store)
+    bot.run("loadtest", log_handler=None)
+
+if __name__ == "__main__":
+    main()
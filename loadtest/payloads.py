@@ -0,0 +1,73 @@
+import itertools
+import time
+from datetime import datetime, timezone
+
+# Snowflake-like IDs for everything the fake Discord creates
+_ids = itertools.count(int(time.time() * 1000) << 22)
+
+def snowflake() -> str:
+    return str(next(_ids))
+
+def now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+# Minimal payloads in the shape the Discord API returns them (only the fields discord.py reads)
+def user(user_id: str, name: str, bot: bool = False) -> dict:
+    return {"id": user_id, "username": name, "global_name": name, "discriminator": "0", "avatar": None, "bot": bot}
+
+def role(role_id: str, name: str, position: int = 1, permissions: int = 0) -> dict:
+    return {"id": role_id, "name": name, "color": 0, "hoist": False, "position": position,
+            "permissions": str(permissions), "managed": False, "mentionable": False, "flags": 0}
+
+def member(user_payload: dict, roles: list[str], nick: str | None = None) -> dict:
+    return {"user": user_payload, "roles": roles, "nick": nick, "avatar": None, "joined_at": now(),
+            "deaf": False, "mute": False, "flags": 0}
+
+def text_channel(channel_id: str, guild_id: str, name: str, position: int = 0) -> dict:
+    return {"id": channel_id, "type": 0, "guild_id": guild_id, "name": name, "position": position,
+            "permission_overwrites": [], "nsfw": False, "parent_id": None, "topic": None,
+            "last_message_id": None, "rate_limit_per_user": 0}
+
+def dm_channel(channel_id: str, recipient: dict) -> dict:
+    return {"id": channel_id, "type": 1, "recipients": [recipient], "last_message_id": None}
+
+def guild(guild_id: str, name: str, owner_id: str, roles: list, channels: list, members: list) -> dict:
+    return {
+        "id": guild_id, "name": name, "icon": None, "splash": None, "discovery_splash": None, "banner": None,
+        "owner_id": owner_id, "roles": roles, "emojis": [], "stickers": [], "features": [],
+        "channels": channels, "threads": [], "members": members, "member_count": len(members),
+        "voice_states": [], "presences": [], "stage_instances": [], "guild_scheduled_events": [],
+        "large": False, "unavailable": False, "premium_tier": 0, "afk_timeout": 300, "verification_level": 0,
+        "default_message_notifications": 0, "explicit_content_filter": 0, "mfa_level": 0, "nsfw_level": 0,
+        "system_channel_flags": 0, "preferred_locale": "en-US", "joined_at": now(),
+    }
+
+def application(application_id: str, owner: dict) -> dict:
+    return {"id": application_id, "name": "MatchManager", "icon": None, "description": "", "bot_public": True,
+            "bot_require_code_grant": False, "owner": owner, "verify_key": "0" * 64, "flags": 0,
+            "team": None, "summary": ""}
+
+def message(message_id: str, channel_id: str, author: dict, body: dict, guild_id: str | None = None,
+            webhook_id: str | None = None, interaction_id: str | None = None) -> dict:
+    payload = {
+        "id": message_id, "channel_id": channel_id, "author": author, "content": body.get("content") or "",
+        "timestamp": now(), "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [],
+        "mention_roles": [], "attachments": [], "embeds": body.get("embeds") or [], "pinned": False, "type": 0,
+        "flags": body.get("flags") or 0, "components": body.get("components") or [],
+    }
+    if guild_id:
+        payload["guild_id"] = guild_id
+    if webhook_id:
+        payload["webhook_id"] = webhook_id
+    if interaction_id:
+        payload["interaction_metadata"] = {"id": interaction_id, "type": 2, "user": author,
+                                           "authorizing_integration_owners": {}}
+    return payload
+
+def registered_command(command: dict, application_id: str, guild_id: str | None = None) -> dict:
+    return {
+        "default_member_permissions": None, "dm_permission": True, "nsfw": False, "options": [],
+        "description": "", "type": 1, "integration_types": [0], "contexts": [0, 1, 2],
+        **command, "id": snowflake(), "application_id": application_id, "version": snowflake(),
+        **({"guild_id": guild_id} if guild_id else {}),
+    }
@@ -0,0 +1,80 @@
+import asyncio
+
+from cogs.utils.tournament import Tournament
+
+from .server import FakeDiscord, InteractionRecord
+
+# How long a scripted user waits for an acknowledgement before giving up on the rest of its flow
+RESPONSE_TIMEOUT = 15.0 # seconds
+
+# Pause before clicking a button on a message that was just sent (the bot only starts listening
+# for its buttons once the response to Discord has come back)
+THINK_TIME = 0.5 # seconds
+
+async def respond(record: InteractionRecord) -> dict | None:
+    try:
+        return await asyncio.wait_for(asyncio.shield(record.acked), RESPONSE_TIMEOUT)
+    except asyncio.TimeoutError:
+        return None
+
+# Custom ID of a button in an interaction response
+def find_button(response: dict, label: str) -> str | None:
+    for row in response["data"].get("components", []):
+        for component in row.get("components", []):
+            if component.get("label") == label:
+                return component.get("custom_id")
+    return None
+
+# A full map selection in one channel (/match -> /order -> /map_ban -> /map_pick -> /map_final),
+# played by an organizer, who may act for both teams
+async def selection_flow(discord: FakeDiscord, channel_id: str, organizer: str, tournament: Tournament) -> bool:
+    info = tournament.info
+    team1, team2 = list(tournament.teams)[:2]
+    standard_maps = tournament.maps_by_pool["Standard"]
+    bans, picks = len(info.ban_sequence), len(info.pick_sequence)
+
+    steps = [
+        ("match", {"pool": tournament.key, "team1": team1, "team2": team2}),
+        ("order", {"choice": "BAN first, PICK second"}),
+        *(("map_ban", {"map": map_key}) for map_key in standard_maps[:bans]),
+        *(("map_pick", {"map": map_key}) for map_key in standard_maps[bans:bans + picks]),
+    ]
+    if info.maps_per_match > picks and len(info.map_pools) > 1:
+        steps.append(("map_final", {"choice": "Standard", "override": "Yes"}))
+
+    for name, options in steps:
+        if await respond(discord.command(channel_id, organizer, name, **options)) is None:
+            return False
+    return True
+
+# Every player joins at once (half with /join, half with the panel button), the first player pings
+# the queue through the Actions menu, then everyone leaves at once
+async def pug_storm(discord: FakeDiscord, channel_id: str, players: list[str], rounds: int) -> bool:
+    panel = await respond(discord.command(channel_id, players[0], "pug"))
+    if panel is None:
+        return False
+    panel_id = panel["message_id"]
+
+    for _ in range(rounds):
+        joins = [
+            discord.command(channel_id, player, "join") if i % 2 else
+            discord.click(channel_id, player, panel_id, "persistent_view:queue_add", "Join Queue")
+            for i, player in enumerate(players)
+        ]
+        if None in await asyncio.gather(*map(respond, joins)):
+            return False
+
+        actions = await respond(discord.click(channel_id, players[0], panel_id, "persistent_view:actions", "Actions"))
+        ping = actions and find_button(actions, "Ping Queue")
+        await asyncio.sleep(THINK_TIME)
+        if not ping or await respond(discord.click(channel_id, players[0], actions["message_id"], ping, "Ping Queue")) is None:
+            return False
+
+        leaves = [
+            discord.command(channel_id, player, "leave") if i % 2 else
+            discord.click(channel_id, player, panel_id, "persistent_view:queue_remove", "Leave Queue")
+            for i, player in enumerate(players)
+        ]
+        if None in await asyncio.gather(*map(respond, leaves)):
+            return False
+    return True
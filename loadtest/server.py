@@ -0,0 +1,400 @@
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+
+from aiohttp import WSMsgType, web
+
+from . import payloads
+
+log = logging.getLogger(__name__)
+
+# Discord's deadline for acknowledging an interaction
+ACK_DEADLINE = 3.0 # seconds
+
+ADMINISTRATOR = 1 << 3
+ALL_PERMISSIONS = (1 << 50) - 1
+
+# Numeric IDs and interaction tokens are folded out of paths when counting REST calls per route
+ROUTE_IDS = re.compile(r"/(\d{5,}|lt-[0-9a-f]+)(?=/|$)")
+CHANNEL_PATH = re.compile(r"^/channels/(\d+)")
+
+# discord.py only decodes bodies whose content type is exactly application/json (no charset)
+def json_response(data, status: int = 200, headers: dict | None = None) -> web.Response:
+    return web.Response(body=json.dumps(data).encode(), status=status, content_type="application/json", headers=headers)
+
+# One interaction sent to the bot, with when (and how) it was acknowledged
+class InteractionRecord:
+    __slots__ = ("id", "token", "name", "channel_id", "sent_at", "acked_at", "response", "rest_calls", "acked")
+
+    def __init__(self, interaction_id: str, token: str, name: str, channel_id: str):
+        self.id = interaction_id
+        self.token = token
+        self.name = name
+        self.channel_id = channel_id
+        self.sent_at = time.perf_counter()
+        self.acked_at = None
+        self.response = None
+        self.rest_calls = 0
+        self.acked = asyncio.get_running_loop().create_future()
+
+    @property
+    def latency(self) -> float | None:
+        return None if self.acked_at is None else self.acked_at - self.sent_at
+
+    @property
+    def message_id(self) -> str | None:
+        return self.response.get("message_id") if self.response else None
+
+# Local stand-in for the Discord gateway and REST API: one guild, scripted users, and faults
+# (latency, 429s) injected into REST calls. Interaction callbacks and followups are never
+# rate limited, as on Discord.
+class FakeDiscord:
+    def __init__(self, *, rate_limit: float = 0.0, latency: tuple[float, float] = (0.0, 0.0), seed: int | None = None):
+        self.rate_limit = rate_limit
+        self.latency = latency
+        self.random = random.Random(seed)
+
+        self.application_id = payloads.snowflake()
+        self.bot_user = payloads.user(self.application_id, "MatchManager", bot=True)
+        self.guild_id = payloads.snowflake()
+        self.roles = {self.guild_id: payloads.role(self.guild_id, "@everyone", position=0)}
+        self.channels = {}
+        self.members = {self.application_id: payloads.member(self.bot_user, [])}
+        self.messages = {}
+        self.dm_channels = {}
+        self.commands = {}
+
+        self.interactions = {}
+        self.records = []
+        self.active = {}
+        self.rest_calls = Counter()
+        self.rate_limited = 0
+        self.unattributed_calls = 0
+
+        self.synced = asyncio.Event()
+        self.ready = asyncio.Event()
+        self._ws = None
+        self._sequence = 0
+        self._tasks = set()
+        self._runner = None
+        self.url = None
+
+        app = web.Application(middlewares=[self._faults])
+        app.router.add_get("/gateway", self.gateway)
+        api = "/api/v10"
+        routes = [
+            ("GET", "/gateway/bot", self.get_gateway),
+            ("GET", "/users/@me", self.get_me),
+            ("GET", "/oauth2/applications/@me", self.get_application),
+            ("PUT", "/applications/{app}/commands", self.sync_commands),
+            ("PUT", "/applications/{app}/guilds/{guild}/commands", self.sync_commands),
+            ("POST", "/interactions/{id}/{token}/callback", self.interaction_callback),
+            ("POST", "/webhooks/{app}/{token}", self.followup),
+            ("GET", "/webhooks/{app}/{token}/messages/{message}", self.get_webhook_message),
+            ("PATCH", "/webhooks/{app}/{token}/messages/{message}", self.edit_webhook_message),
+            ("GET", "/channels/{channel}", self.get_channel),
+            ("POST", "/channels/{channel}/messages", self.create_message),
+            ("GET", "/channels/{channel}/messages/{message}", self.get_message),
+            ("PATCH", "/channels/{channel}/messages/{message}", self.edit_message),
+            ("POST", "/users/@me/channels", self.create_dm),
+            ("PATCH", "/guilds/{guild}/members/@me", self.edit_own_member),
+            ("GET", "/guilds/{guild}/members/{user}", self.get_member),
+        ]
+        for method, path, handler in routes:
+            app.router.add_route(method, api + path, handler)
+        app.router.add_route("*", api + "/{tail:.*}", self.unhandled)
+        self.app = app
+
+    # World building
+
+    def add_role(self, name: str, permissions: int = 0) -> str:
+        role_id = payloads.snowflake()
+        self.roles[role_id] = payloads.role(role_id, name, position=len(self.roles), permissions=permissions)
+        return role_id
+
+    def add_channel(self, name: str) -> str:
+        channel_id = payloads.snowflake()
+        self.channels[channel_id] = payloads.text_channel(channel_id, self.guild_id, name, position=len(self.channels))
+        return channel_id
+
+    def add_member(self, name: str, roles: list[str] = ()) -> str:
+        user_id = payloads.snowflake()
+        self.members[user_id] = payloads.member(payloads.user(user_id, name), list(roles))
+        return user_id
+
+    def guild_payload(self) -> dict:
+        return payloads.guild(self.guild_id, "Load Test", self.application_id, list(self.roles.values()),
+                              list(self.channels.values()), list(self.members.values()))
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._ws is not None:
+            await self._ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    # Gateway
+
+    async def gateway(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        self._ws = ws
+        await ws.send_json({"op": 10, "d": {"heartbeat_interval": 41250}})
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            data = json.loads(msg.data)
+            if data["op"] == 1:
+                await ws.send_json({"op": 11})
+            elif data["op"] == 2:
+                await self.dispatch("READY", {
+                    "v": 10, "user": self.bot_user, "guilds": [{"id": self.guild_id, "unavailable": True}],
+                    "session_id": "loadtest", "resume_gateway_url": self.url.replace("http", "ws", 1) + "/gateway",
+                    "application": {"id": self.application_id, "flags": 0},
+                })
+                await self.dispatch("GUILD_CREATE", self.guild_payload())
+                # discord.py fires on_ready once no guild has arrived for two seconds
+                asyncio.get_running_loop().call_later(2.5, self.ready.set)
+            elif data["op"] == 8:
+                await self.dispatch("GUILD_MEMBERS_CHUNK", {
+                    "guild_id": self.guild_id, "members": list(self.members.values()),
+                    "chunk_index": 0, "chunk_count": 1, "nonce": data["d"].get("nonce"),
+                })
+        return ws
+
+    async def dispatch(self, event: str, data: dict):
+        self._sequence += 1
+        await self._ws.send_json({"op": 0, "t": event, "s": self._sequence, "d": data})
+
+    def _interaction(self, type: int, name: str, channel_id: str, user_id: str, data: dict, message: dict | None = None) -> InteractionRecord:
+        interaction_id = payloads.snowflake()
+        token = f"lt-{interaction_id}"
+        record = InteractionRecord(interaction_id, token, name, channel_id)
+        self.interactions[token] = record
+        self.records.append(record)
+        self.active[channel_id] = record
+
+        member = self.members[user_id]
+        permissions = ALL_PERMISSIONS if any(
+            int(self.roles[role_id]["permissions"]) & ADMINISTRATOR for role_id in member["roles"]) else 0
+        payload = {
+            "id": interaction_id, "application_id": self.application_id, "type": type, "data": data,
+            "guild_id": self.guild_id, "channel_id": channel_id, "channel": self.channels[channel_id],
+            "member": {**member, "permissions": str(permissions)}, "token": token, "version": 1,
+            "app_permissions": str(ALL_PERMISSIONS), "locale": "en-US", "guild_locale": "en-US",
+            "entitlements": [], "authorizing_integration_owners": {"0": self.guild_id}, "context": 0,
+            "attachment_size_limit": 10 * 1024 * 1024,
+        }
+        if message is not None:
+            payload["message"] = message
+        task = asyncio.create_task(self.dispatch("INTERACTION_CREATE", payload))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return record
+
+    # Send a slash command (string options only)
+    def command(self, channel_id: str, user_id: str, name: str, **options) -> InteractionRecord:
+        command = self.commands.get(name, {"id": payloads.snowflake()})
+        data = {"id": command["id"], "name": name, "type": 1, "guild_id": self.guild_id,
+                "options": [{"name": key, "type": 3, "value": value} for key, value in options.items()]}
+        return self._interaction(2, f"/{name}", channel_id, user_id, data)
+
+    # Click a button on a message sent by the bot
+    def click(self, channel_id: str, user_id: str, message_id: str, custom_id: str, label: str | None = None) -> InteractionRecord:
+        data = {"custom_id": custom_id, "component_type": 2}
+        return self._interaction(3, f"[{label or custom_id}]", channel_id, user_id, data, self.messages[message_id])
+
+    # REST
+
+    @web.middleware
+    async def _faults(self, request: web.Request, handler):
+        if not request.path.startswith("/api/"):
+            return await handler(request)
+
+        path = request.path[len("/api/v10"):]
+        self.rest_calls[f"{request.method} {ROUTE_IDS.sub('/{id}', path)}"] += 1
+        self._attribute(path)
+
+        low, high = self.latency
+        if high:
+            await asyncio.sleep(self.random.uniform(low, high))
+
+        interaction_route = path.startswith(("/interactions/", "/webhooks/"))
+        if self.rate_limit and not interaction_route and self.synced.is_set() and self.random.random() < self.rate_limit:
+            self.rate_limited += 1
+            retry_after = round(self.random.uniform(0.05, 0.5), 3)
+            return json_response(
+                {"message": "You are being rate limited.", "retry_after": retry_after, "global": False},
+                status=429, headers={"Via": "1.1 google", "Retry-After": str(retry_after), "X-RateLimit-Scope": "user"})
+        return await handler(request)
+
+    # REST calls count towards the interaction they belong to (by token, or the latest one in the channel)
+    def _attribute(self, path: str):
+        record = None
+        for part in path.split("/"):
+            if part.startswith("lt-"):
+                record = self.interactions.get(part)
+                break
+        else:
+            match = CHANNEL_PATH.match(path)
+            if match:
+                record = self.active.get(match.group(1))
+
+        if record is not None:
+            record.rest_calls += 1
+        else:
+            self.unattributed_calls += 1
+
+    @staticmethod
+    async def _body(request: web.Request) -> dict:
+        if request.content_type.startswith("multipart/"):
+            form = await request.post()
+            return json.loads(form.get("payload_json", "{}"))
+        if not request.can_read_body:
+            return {}
+        return await request.json()
+
+    def _store_message(self, channel_id: str, body: dict, webhook: bool = False, interaction_id: str | None = None) -> dict:
+        message = payloads.message(
+            payloads.snowflake(), channel_id, self.bot_user, body,
+            guild_id=self.guild_id if channel_id in self.channels else None,
+            webhook_id=self.application_id if webhook else None, interaction_id=interaction_id)
+        self.messages[message["id"]] = message
+        return message
+
+    def _edit_message(self, message_id: str, body: dict) -> web.Response:
+        message = self.messages.get(message_id)
+        if message is None:
+            return json_response({"message": "Unknown Message", "code": 10008}, status=404)
+        for field in ("content", "embeds", "components", "flags"):
+            if field in body:
+                message[field] = body[field]
+        message["edited_timestamp"] = payloads.now()
+        return json_response(message)
+
+    async def get_gateway(self, request):
+        return json_response({
+            "url": self.url.replace("http", "ws", 1) + "/gateway", "shards": 1,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1}})
+
+    async def get_me(self, request):
+        return json_response(self.bot_user)
+
+    async def get_application(self, request):
+        return json_response(payloads.application(self.application_id, payloads.user(payloads.snowflake(), "owner")))
+
+    async def sync_commands(self, request):
+        guild_id = request.match_info.get("guild")
+        registered = [payloads.registered_command(command, self.application_id, guild_id) for command in await self._body(request)]
+        self.commands.update((command["name"], command) for command in registered)
+        self.synced.set()
+        return json_response(registered)
+
+    async def interaction_callback(self, request):
+        record = self.interactions.get(request.match_info["token"])
+        body = await self._body(request)
+        if record is None:
+            return json_response({"message": "Unknown interaction", "code": 10062}, status=404)
+        if record.acked.done():
+            return json_response({"message": "Interaction has already been acknowledged.", "code": 40060}, status=400)
+
+        record.acked_at = time.perf_counter()
+        callback_type = body.get("type")
+        data = body.get("data") or {}
+        response = {"interaction": {
+            "id": record.id, "type": 2, "activity_instance_id": None, "response_message_id": None,
+            "response_message_loading": callback_type == 5,
+            "response_message_ephemeral": bool(data.get("flags", 0) & 64)}}
+
+        if callback_type in (4, 5):
+            message = self._store_message(record.channel_id, data, webhook=True, interaction_id=record.id)
+            response["interaction"]["response_message_id"] = message["id"]
+            response["resource"] = {"type": callback_type, "message": message}
+        elif callback_type == 7 and record.message_id:
+            self._edit_message(record.message_id, data)
+            response["resource"] = {"type": callback_type, "message": self.messages[record.message_id]}
+        else:
+            response["resource"] = {"type": callback_type}
+
+        record.response = {"type": callback_type, "data": data, "message_id": response["interaction"]["response_message_id"]}
+        record.acked.set_result(record.response)
+        return json_response(response)
+
+    async def followup(self, request):
+        record = self.interactions.get(request.match_info["token"])
+        channel_id = record.channel_id if record else next(iter(self.channels))
+        message = self._store_message(channel_id, await self._body(request), webhook=True)
+        return json_response(message)
+
+    async def get_webhook_message(self, request):
+        record = self.interactions.get(request.match_info["token"])
+        message_id = request.match_info["message"]
+        if message_id == "@original" and record is not None:
+            message_id = record.message_id
+        if message_id not in self.messages:
+            return json_response({"message": "Unknown Message", "code": 10008}, status=404)
+        return json_response(self.messages[message_id])
+
+    async def edit_webhook_message(self, request):
+        record = self.interactions.get(request.match_info["token"])
+        message_id = request.match_info["message"]
+        if message_id == "@original" and record is not None:
+            message_id = record.message_id
+        return self._edit_message(message_id, await self._body(request))
+
+    async def get_channel(self, request):
+        channel_id = request.match_info["channel"]
+        channel = self.channels.get(channel_id) or self.dm_channels.get(channel_id)
+        if channel is None:
+            return json_response({"message": "Unknown Channel", "code": 10003}, status=404)
+        return json_response(channel)
+
+    async def create_message(self, request):
+        return json_response(self._store_message(request.match_info["channel"], await self._body(request)))
+
+    async def get_message(self, request):
+        message = self.messages.get(request.match_info["message"])
+        if message is None:
+            return json_response({"message": "Unknown Message", "code": 10008}, status=404)
+        return json_response(message)
+
+    async def edit_message(self, request):
+        return self._edit_message(request.match_info["message"], await self._body(request))
+
+    async def create_dm(self, request):
+        recipient_id = (await self._body(request))["recipient_id"]
+        member = self.members.get(str(recipient_id))
+        if member is None:
+            return json_response({"message": "Unknown User", "code": 10013}, status=404)
+        channel_id = payloads.snowflake()
+        self.dm_channels[channel_id] = payloads.dm_channel(channel_id, member["user"])
+        return json_response(self.dm_channels[channel_id])
+
+    async def edit_own_member(self, request):
+        body = await self._body(request)
+        member = self.members[self.application_id]
+        member["nick"] = body.get("nick")
+        return json_response(member)
+
+    async def get_member(self, request):
+        member = self.members.get(request.match_info["user"])
+        if member is None:
+            return json_response({"message": "Unknown Member", "code": 10007}, status=404)
+        return json_response(member)
+
+    async def unhandled(self, request):
+        log.warning("Unhandled fake Discord route: %s %s", request.method, request.path)
+        return json_response({})
@@ -1,34 +1,51 @@
 import asyncio
 import logging
 import os
-from logging.handlers import TimedRotatingFileHandler
+import time
+from pathlib import Path
 
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from cogs.utils.archive import MatchArchive
+from cogs.utils.logs import ContextCommandTree, interaction_fields, interaction_latency, setup_logging
+from cogs.utils.metrics import MetricsServer, registry, rest_trace
+from cogs.utils.nickname import NicknameManager
+from cogs.utils.scheduler import DeadlineScheduler
+from cogs.utils.selection_log import SelectionLog
+from cogs.utils.store import StateStore
+from cogs.utils.sync import sync_if_changed
+
 # Load environment variables including discord token and server ID(s)
 load_dotenv()
 token = os.getenv("DISCORD_TOKEN")
 server = int(os.getenv("DISCORD_GUILD"))
+# "global" (default) or "guild" to sync commands to DISCORD_GUILD only, which applies instantly (for development)
+sync_mode = os.getenv("COMMAND_SYNC", "global").lower()
+# Sync even if the command tree has not changed since the last sync
+sync_force = os.getenv("COMMAND_SYNC_FORCE", "").lower() in ("1", "true", "yes")
+# Serve Prometheus metrics on this port (disabled if unset), on localhost unless METRICS_HOST is set
+metrics_port = os.getenv("METRICS_PORT")
+metrics_host = os.getenv("METRICS_HOST", "127.0.0.1")
 
-# Log errors/debug info
-try:
-    os.mkdir("logs")
-except OSError:
-    pass
-
-handler = TimedRotatingFileHandler(
-    "logs/discord.log", when="midnight", interval=1, backupCount=3, encoding="utf-8"
+# Log errors/debug info. Records go through a queue to a background thread, so log I/O never blocks
+# the event loop. LOG_JSON=1 writes JSON lines (with command, channel, guild and latency fields) instead
+# of plain text, and LOG_DEBUG_SAMPLE=N keeps one in N debug records per call site when LOG_LEVEL=DEBUG.
+# An unknown LOG_LEVEL falls back to INFO with a warning.
+log_level_name = (os.getenv("LOG_LEVEL") or "INFO").upper()
+log_level = logging.getLevelNamesMapping().get(log_level_name)
+log_listener = setup_logging(
+    Path("logs"),
+    level=logging.INFO if log_level is None else log_level,
+    json_lines=os.getenv("LOG_JSON", "").lower() in ("1", "true", "yes"),
+    debug_every=int(os.getenv("LOG_DEBUG_SAMPLE", "1")),
 )
 
-handler.suffix = "%Y-%m-%d"
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] [%(name)s] %(message)s",
-    handlers=[handler, logging.StreamHandler()]
-)
+log = logging.getLogger(__name__)
+if log_level is None:
+    log.warning("Unknown LOG_LEVEL %r, logging at INFO (expected one of %s)",
+                log_level_name, ", ".join(logging.getLevelNamesMapping()))
 
 intents = discord.Intents.default()
 intents.message_content = True
@@ -36,25 +53,64 @@ intents.members = True
 
 class MatchManager(commands.Bot):
     def __init__(self):
-        super().__init__(command_prefix="!", intents=intents)
+        super().__init__(command_prefix="!", intents=intents, tree_cls=ContextCommandTree, http_trace=rest_trace())
+        # Map selections, PUG queues and panel messages survive restarts
+        self.store = StateStore(Path("data") / "state.db")
+        # Append-only log of every map selection's events, for /replay
+        self.selection_log = SelectionLog(Path("data") / "matches.db")
+        # Finished matches with pick/ban totals, for /stats
+        self.match_archive = MatchArchive(Path("data") / "archive.db")
+        # Timeouts for every cog, persisted in the store
+        self.scheduler = DeadlineScheduler(self.store)
+        # PUG queue counts shown in the bot's nickname, per guild
+        self.nicknames = NicknameManager(self)
+        # Latency, error and REST call metrics for the cogs' handlers
+        self.metrics = MetricsServer(metrics_host, int(metrics_port)) if metrics_port else None
+
+        registry.gauge("anp_scheduler_pending", "Pending timeouts", lambda: len(self.scheduler))
+        registry.gauge("anp_nickname_edits_total", "Nickname updates by outcome",
+                       lambda: {("edited",): self.nicknames.edits, ("skipped",): self.nicknames.skipped},
+                       labels=("outcome",), metric_type="counter")
     
     async def reset_nickname(self):
         await self.wait_until_ready()
-        
-        for guild in self.guilds:
-            me = guild.me
-            await me.edit(nick=None)
-            print("Nickname successfully reset")
+
+        # Resets every guild at once (nicknames of restored queues are kept)
+        await self.nicknames.reset_all()
+        log.info("Nickname successfully reset")
 
     async def setup_hook(self):
+        started = time.perf_counter()
+
+        phase = time.perf_counter()
+        self.store.start()
+        log.info("Opened state store in %.1f ms", (time.perf_counter() - phase) * 1000)
+
+        phase = time.perf_counter()
+        self.selection_log.start()
+        log.info("Opened selection log in %.1f ms", (time.perf_counter() - phase) * 1000)
+
+        phase = time.perf_counter()
+        self.match_archive.start()
+        log.info("Opened match archive in %.1f ms", (time.perf_counter() - phase) * 1000)
+
         for filename in os.listdir("./cogs"):
             if (
                 filename.endswith(".py")
                 and not filename.endswith("dev.py")
                 and filename != "__init__.py"
             ):
+                phase = time.perf_counter()
                 await self.load_extension(f"cogs.{filename[:-3]}")
-                print(f"Loaded cog: {filename}")
+                log.info("Loaded cog %s in %.1f ms", filename, (time.perf_counter() - phase) * 1000)
+
+        # Cogs register their deadline handlers when they load
+        phase = time.perf_counter()
+        self.scheduler.start()
+        log.info("Started scheduler in %.1f ms", (time.perf_counter() - phase) * 1000)
+
+        if self.metrics:
+            await self.metrics.start()
         
         asyncio.create_task(self.reset_nickname())
         
@@ -63,9 +119,44 @@ class MatchManager(commands.Bot):
         # # Clear command tree
         # self.tree.clear_commands(guild=guild)
         
-        # Global sync
-        synced = await self.tree.sync()
-        print(f"Synced {len(synced)} commands to guild {server}")
+        # Sync only when the command definitions changed since the last sync
+        phase = time.perf_counter()
+        if sync_mode == "guild":
+            guild = discord.Object(id=server)
+            self.tree.copy_global_to(guild=guild)
+            synced = await sync_if_changed(self, guild=guild, force=sync_force)
+        else:
+            synced = await sync_if_changed(self, force=sync_force)
+
+        if synced is not None:
+            log.info("Synced %d commands (%s)", synced, f"guild {server}" if sync_mode == "guild" else "global")
+        log.info("Command sync (%s) took %.1f ms", sync_mode, (time.perf_counter() - phase) * 1000)
+
+        log.info("Setup finished in %.1f ms", (time.perf_counter() - started) * 1000)
+
+    # One record per completed app command, with the interaction's latency
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        log.info(
+            "Completed /%s", command.qualified_name,
+            extra=interaction_fields(interaction) | {"latency_ms": interaction_latency(interaction)},
+        )
+
+    # Buttons and other components (sampled at debug level, there are a lot of them)
+    async def on_interaction(self, interaction: discord.Interaction):
+        if interaction.type is discord.InteractionType.component:
+            log.debug("Component interaction", extra=interaction_fields(interaction))
+
+    async def close(self):
+        await super().close()
+        if self.metrics:
+            await self.metrics.close()
+        await self.scheduler.close()
+        await self.selection_log.close()
+        await self.match_archive.close()
+        await self.store.close()
+        log_listener.stop()
 
-bot = MatchManager()
-bot.run(token)
\ No newline at end of file
+if __name__ == "__main__":
+    bot = MatchManager()
+    # Logging is already set up above, so discord.py should not add its own handler
+    bot.run(token, log_handler=None)
\ No newline at end of file
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+import pytest
+
+from cogs.utils.selection import default_sequences
+from cogs.utils.tournament import MapInfo, TeamInfo, TournamentInfo, compile_tournament
+
+# Two teams and a map pool big enough for every format under test
+TEAMS = (
+    TeamInfo("[AAA] Alpha Squad", 101, "AAA", "Alpha Squad"),
+    TeamInfo("[BBB] Bravo Crew", 102, "BBB", "Bravo Crew"),
+)
+MAPS = tuple(
+    MapInfo(f"nt_map{i}_ctg", (f"Map {i}",), (f"m{i}",), "Standard" if i < 8 else "Wildcard")
+    for i in range(10)
+)
+
+# Build a compiled tournament of the given format (sequences default as in the loader)
+def build_tournament(key="test", equal_bans=True, maps_per_match=3, max_bans=1, max_picks=1,
+                     ban_sequence=None, pick_sequence=None, maps=MAPS, teams=TEAMS):
+    default_bans, default_picks = default_sequences(equal_bans, max_bans, max_picks)
+    info = TournamentInfo(
+        "Test Cup", datetime(2026, 1, 1), equal_bans, maps_per_match, max_bans, max_picks,
+        ("Standard", "Wildcard"), default_bans if ban_sequence is None else ban_sequence,
+        default_picks if pick_sequence is None else pick_sequence)
+    return compile_tournament(key, info, maps, teams)
+
+@pytest.fixture
+def tournament():
+    return build_tournament()
@@ -0,0 +1,142 @@
+import asyncio
+import copy
+
+from conftest import build_tournament
+from cogs.utils import selection_log
+from cogs.utils.archive import RANDOM, CompletedMatch, MatchArchive
+from cogs.utils.selection import BAN, PICK, SelectionState
+from cogs.utils.selection_log import SNAPSHOT_EVERY, SelectionLog, replay
+
+ALPHA, BRAVO = "[AAA] Alpha Squad", "[BBB] Bravo Crew"
+
+def match(match_id, maps, first_to_ban=ALPHA, tournament="cup", guild_id=1):
+    return CompletedMatch(match_id, guild_id, tournament, (ALPHA, BRAVO), ALPHA, first_to_ban, maps, None, 0.0, 1.0)
+
+def test_from_state_lists_maps_in_turn_order(tournament):
+    selection_state = SelectionState.start(tournament, ALPHA, BRAVO, BRAVO, match_id=3, started_at=5.0)
+    selection_state.set_ban_order(BRAVO)
+    for map_key in ("nt_map0_ctg", "nt_map1_ctg"):
+        selection_state.ban(map_key)
+    for map_key in ("nt_map2_ctg", "nt_map3_ctg"):
+        selection_state.pick(map_key)
+    selection_state.decide("nt_map9_ctg")
+
+    completed = CompletedMatch.from_state(selection_state, 1, 9.0)
+    assert completed.first_to_ban == BRAVO
+    assert completed.maps == (
+        (BAN, "nt_map0_ctg", BRAVO), (BAN, "nt_map1_ctg", ALPHA),
+        (PICK, "nt_map2_ctg", ALPHA), (PICK, "nt_map3_ctg", BRAVO),
+        (RANDOM, "nt_map9_ctg", None))
+    assert completed.final_pool == "Wildcard"
+
+def test_aggregates(tmp_path):
+    async def main():
+        archive = MatchArchive(tmp_path / "archive.db")
+        archive.open()
+        archive.add(match(1, ((BAN, "a", ALPHA), (BAN, "b", BRAVO), (PICK, "c", BRAVO), (RANDOM, "d", None))))
+        archive.add(match(2, ((BAN, "a", ALPHA), (BAN, "c", BRAVO), (PICK, "b", ALPHA)), first_to_ban=BRAVO))
+        archive.add(match(3, ((BAN, "a", BRAVO),), tournament="other"))
+        archive.add(match(4, ((BAN, "a", BRAVO),), guild_id=2))
+        # A match archived twice (e.g. a retried batch) is only counted once
+        archive.add(match(2, ((BAN, "a", ALPHA),)))
+
+        matches, maps = await archive.tournament_stats(1, "cup")
+        assert matches == 2
+        assert sorted(maps) == [("a", 2, 0, 0), ("b", 1, 1, 0), ("c", 1, 1, 0), ("d", 0, 0, 1)]
+
+        alpha = await archive.team_stats(1, "cup", ALPHA)
+        assert (alpha.matches, alpha.coin_tosses_won, alpha.banned_first) == (2, 2, 1)
+        assert alpha.maps == [("a", 2, 0), ("b", 0, 1)]
+
+        # A tournament of None covers every tournament of the guild
+        assert (await archive.tournament_stats(1, None))[0] == 3
+        map_a = await archive.map_stats(1, None, "a")
+        assert (map_a.matches, map_a.bans, map_a.picks, map_a.random) == (3, 3, 0, 0)
+        assert map_a.teams == [(ALPHA, 2, 0), (BRAVO, 1, 0)]
+
+        assert await archive.names(1, "team", "bra", 5) == [BRAVO]
+        assert await archive.names(1, "map", "", 2) == ["a", "b"]
+        await archive.close()
+
+        archive = MatchArchive(tmp_path / "archive.db")
+        archive.open()
+        assert (await archive.tournament_stats(1, "cup"))[0] == 2
+        await archive.close()
+
+    asyncio.run(main())
+
+# Log a whole selection as the tourney cog does, with its state after each event
+async def log_selection(log: SelectionLog, tournament) -> tuple[int, list[dict]]:
+    match_id = log.start_match(1, 10, tournament.key, (ALPHA, BRAVO), user_id=None)
+    started_at = (await log.load(match_id)).started_at
+    selection_state = SelectionState.start(tournament, ALPHA, BRAVO, None, match_id, started_at)
+    # dump() shares the state's lists, so each step is copied
+    states = [copy.deepcopy(selection_state.dump())]
+
+    def record(kind, data):
+        selection_log.apply_event(selection_state, selection_log.Event(0, kind, data, None, 0.0))
+        log.append(match_id, kind, data, 5, selection_state)
+        states.append(copy.deepcopy(selection_state.dump()))
+
+    record(selection_log.COIN_TOSS, {"winner": ALPHA})
+    record(selection_log.ORDER_CHOSEN, {"first_to_ban": BRAVO})
+    while selection_state.current.action in (BAN, PICK):
+        map_key = next(iter(selection_state.remaining_maps))
+        record(selection_state.current.action, {"map": map_key})
+    record(selection_log.VOTE, {"teams": [ALPHA, BRAVO], "pool": "Wildcard"})
+    record(selection_log.DECIDE, {"map": next(iter(selection_state.remaining_maps))})
+    log.append(match_id, selection_log.DONE, {}, None)
+    return match_id, states
+
+def test_replay_matches_the_live_state(tmp_path):
+    # Enough bans for the log to write snapshots along the way
+    tournament = build_tournament(maps_per_match=1, max_bans=4, max_picks=0)
+
+    async def main():
+        log = SelectionLog(tmp_path / "selections.db")
+        log.open()
+        match_id, states = await log_selection(log, tournament)
+        assert len(states) > SNAPSHOT_EVERY + 1
+
+        full = await log.load(match_id)
+        assert full.teams == (ALPHA, BRAVO)
+        assert [event.seq for event in full.events] == list(range(len(states) + 1))
+        assert full.snapshot[0] == SNAPSHOT_EVERY
+
+        for upto, expected in enumerate(states):
+            record = await log.load(match_id, upto)
+            assert replay(record, tournament, upto).dump() == expected
+            # Replaying every event from the start gives the same state as starting from the snapshot
+            record.snapshot = None
+            assert replay(record, tournament, upto).dump() == expected
+
+        # Events after the match ended are dropped
+        log.append(match_id, selection_log.BAN, {"map": "nt_map0_ctg"})
+        assert [match[0] for match in await log.recent(1)] == [match_id]
+        await log.close()
+
+        log = SelectionLog(tmp_path / "selections.db")
+        log.open()
+        assert log.start_match(1, 10, tournament.key, (ALPHA, BRAVO), None) == match_id + 1
+        assert len((await log.load(match_id)).events) == len(states) + 1
+        await log.close()
+
+    asyncio.run(main())
+
+def test_matches_in_progress_continue_after_reopen(tmp_path):
+    async def main():
+        log = SelectionLog(tmp_path / "selections.db")
+        log.open()
+        match_id = log.start_match(1, 10, "cup", (ALPHA, BRAVO), None)
+        log.append(match_id, selection_log.COIN_TOSS, {"winner": ALPHA})
+        await log.close()
+
+        log = SelectionLog(tmp_path / "selections.db")
+        log.open()
+        log.append(match_id, selection_log.ORDER_CHOSEN, {"first_to_ban": ALPHA})
+        record = await log.load(match_id)
+        assert [(event.seq, event.kind) for event in record.events] == [
+            (0, selection_log.START), (1, selection_log.COIN_TOSS), (2, selection_log.ORDER_CHOSEN)]
+        await log.close()
+
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+from cogs.utils.autocomplete import AutocompleteCache, ChoiceIndex, static_choices
+
+MAPS = ChoiceIndex([
+    ("nt_oilstain_ctg", ("Oilstain", "Oil")),
+    ("nt_rogue_ctg_b4", ("Rogue", "Rouge")),
+    ("nt_tetsu_ctg_b6f", ("Tetsu",)),
+    ("nt_tetsujin_ctg", ("Tetsujin",)),
+    ("nt_dawnlife_ctg_b1", ("Dawnlife", "Dawn")),
+])
+
+def test_prefix_ranks_before_alias_before_substring():
+    index = ChoiceIndex([("xx_tet", ()), ("Tetris", ()), ("map_b", ("tetra",))])
+    assert index.search("tet") == ["Tetris", "map_b", "xx_tet"]
+
+def test_best_rank_of_a_value_wins():
+    # "nt_tetsu..." is a prefix match on its own name, so its alias matches do not demote it
+    assert MAPS.search("nt_tetsu") == ["nt_tetsu_ctg_b6f", "nt_tetsujin_ctg"]
+
+def test_ties_keep_definition_order():
+    assert MAPS.search("tetsu") == ["nt_tetsu_ctg_b6f", "nt_tetsujin_ctg"]
+    assert MAPS.search("ctg") == list(MAPS.values)
+
+def test_case_and_whitespace_are_ignored():
+    assert MAPS.search("  ROUGE ") == ["nt_rogue_ctg_b4"]
+
+def test_empty_query_lists_everything_in_order():
+    assert MAPS.search("") == list(MAPS.values)
+    assert MAPS.search("", limit=2) == list(MAPS.values[:2])
+
+def test_allowed_and_limit():
+    allowed = {"nt_tetsujin_ctg", "nt_oilstain_ctg"}
+    # The alias prefix match on Tetsujin outranks the substring match in Oilstain
+    assert MAPS.search("t", allowed=allowed) == ["nt_tetsujin_ctg", "nt_oilstain_ctg"]
+    assert len(ChoiceIndex((f"map{i}", ()) for i in range(40)).search("map")) == 25
+
+def test_no_match():
+    assert MAPS.search("zzz") == []
+    assert static_choices().search("a") == []
+
+def test_cache_memoizes_per_channel_and_phase():
+    cache = AutocompleteCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ["a", "b"]
+
+    first = cache.get(1, "ban", "Oil", compute)
+    assert cache.get(1, "ban", " oil", compute) is first
+    cache.get(1, "pick", "oil", compute)
+    cache.get(2, "ban", "oil", compute)
+    assert [choice.value for choice in first] == ["a", "b"]
+    assert len(calls) == 3
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    cache.invalidate(1)
+    cache.get(1, "ban", "oil", compute)
+    assert len(calls) == 4
+
+def test_cache_evicts_least_recently_used_entries_and_channels():
+    cache = AutocompleteCache(max_entries=2, max_channels=2)
+    for query in ("a", "b", "c"):
+        cache.get(1, "ban", query, lambda: [query])
+    assert cache.get(1, "ban", "a", lambda: ["recomputed"])[0].value == "recomputed"
+
+    cache.get(2, "ban", "a", lambda: ["x"])
+    cache.get(1, "ban", "a", lambda: ["x"])
+    cache.get(3, "ban", "a", lambda: ["x"])
+    # Channel 2 was the least recently used
+    assert cache.get(2, "ban", "a", lambda: ["recomputed"])[0].value == "recomputed"
+    assert cache.get(3, "ban", "a", lambda: ["recomputed"])[0].value == "x"
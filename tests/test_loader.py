@@ -0,0 +1,122 @@
+import json
+import re
+
+import pytest
+
+from cogs.utils.loader import SnapshotCache, info_from_flat, records_from_flat
+from cogs.utils.tournament import TournamentError
+
+VALID_TOML = """
+[INFO]
+full_name = "Test Cup"
+start_date = "2026-01-01"
+equal_bans = true
+maps_per_match = 3
+max_bans = 1
+max_picks = 1
+map_pools = ["Standard"]
+
+[MAP_POOL.nt_a_ctg]
+base_name = ["A"]
+aliases = ["Ay"]
+map_pool = "Standard"
+
+[MAP_POOL.nt_b_ctg]
+base_name = ["B"]
+map_pool = "Standard"
+
+[TEAM_ROLES."[AAA] Alpha"]
+id = 1
+tag = "AAA"
+name = "Alpha"
+"""
+
+def valid_definition():
+    return {
+        "INFO": {
+            "full_name": "Test Cup", "start_date": "2026-01-01", "equal_bans": True,
+            "maps_per_match": 3, "max_bans": 1, "max_picks": 1, "map_pools": ["Standard"],
+        },
+        "MAP_POOL": {"nt_a_ctg": {"base_name": ["A"], "aliases": [], "map_pool": "Standard"}},
+        "TEAM_ROLES": {"[AAA] Alpha": {"id": 1, "tag": "AAA", "name": "Alpha"}},
+    }
+
+# Load a file through the snapshot cache, as the registry does
+def load(tmp_path, name: str, text: str, records: bool = True):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    cache = SnapshotCache(tmp_path / "snapshots")
+    data = path.read_bytes()
+    return cache.load(path.stem, path, cache.digest(data), data, records)
+
+def test_valid_toml(tmp_path):
+    flat_info, flat_records = load(tmp_path, "cup.toml", VALID_TOML)
+    info = info_from_flat(flat_info)
+    maps, teams = records_from_flat(flat_records)
+    assert info.full_name == "Test Cup"
+    assert (info.ban_sequence, info.pick_sequence) == ("AB", "BA")
+    assert [map_info.key for map_info in maps] == ["nt_a_ctg", "nt_b_ctg"]
+    assert maps[1].aliases == ()
+    assert teams[0].tag == "AAA"
+
+def test_valid_json(tmp_path):
+    flat_info, _ = load(tmp_path, "cup.json", json.dumps(valid_definition()))
+    assert info_from_flat(flat_info).full_name == "Test Cup"
+
+def test_snapshot_reused_without_reading_file(tmp_path):
+    path = tmp_path / "cup.toml"
+    path.write_text(VALID_TOML, encoding="utf-8")
+    cache = SnapshotCache(tmp_path / "snapshots")
+    digest = cache.digest(path.read_bytes())
+    first = cache.load("cup", path, digest, records=True)
+    path.unlink()
+    assert cache.load("cup", path, digest, records=True) == first
+
+@pytest.mark.parametrize("name, text", [
+    ("broken.toml", "[INFO\nfull_name = 1"),
+    ("broken.toml", "[INFO]\nfull_name = \"unterminated"),
+    ("broken.json", "{\"INFO\": {"),
+    ("broken.json", "[1, 2, 3]"),
+    ("broken.json", "\"just a string\""),
+])
+def test_rejects_unparsable_files(tmp_path, name, text):
+    with pytest.raises(TournamentError):
+        load(tmp_path, name, text)
+
+def without(table, field):
+    definition = valid_definition()
+    del definition[table][field]
+    return definition
+
+def with_value(table, field, value):
+    definition = valid_definition()
+    definition[table][field] = value
+    return definition
+
+@pytest.mark.parametrize("definition, message", [
+    ({}, "missing INFO"),
+    ({"INFO": {}, "MAP_POOL": {}, "TEAM_ROLES": []}, "TEAM_ROLES must be dict"),
+    (without("INFO", "full_name"), "INFO.full_name is required"),
+    (without("INFO", "map_pools"), "INFO.map_pools is required"),
+    (with_value("INFO", "max_bans", "1"), "INFO.max_bans must be int"),
+    (with_value("INFO", "max_bans", True), "INFO.max_bans must be int"),
+    (with_value("INFO", "start_date", "01/01/2026"), "INFO.start_date must be a YYYY-MM-DD date"),
+    (with_value("INFO", "ban_sequence", "AC"), "INFO.ban_sequence may only contain A"),
+    (with_value("INFO", "pacing", "warp"), "INFO.pacing must be one of"),
+    (with_value("INFO", "max_picks", -1), "INFO.max_picks must not be negative"),
+    (with_value("INFO", "maps_per_match", 5), "INFO.maps_per_match must be the number of picks"),
+    (with_value("INFO", "ban_sequence", "AAB"), "INFO.ban_sequence gives team A more than INFO.max_bans bans"),
+    (with_value("MAP_POOL", "nt_b_ctg", {"base_name": ["B"], "map_pool": "Elsewhere"}),
+     "MAP_POOL.nt_b_ctg.map_pool \"Elsewhere\" is not listed in INFO.map_pools"),
+    (with_value("MAP_POOL", "nt_b_ctg", {"base_name": "B", "map_pool": "Standard"}), "MAP_POOL.nt_b_ctg.base_name must be list"),
+    (with_value("TEAM_ROLES", "[BBB] Bravo", {"id": "102", "tag": "BBB", "name": "Bravo"}), "TEAM_ROLES.[BBB] Bravo.id must be int"),
+])
+def test_rejects_invalid_definitions(tmp_path, definition, message):
+    with pytest.raises(TournamentError, match="broken.json: .*" + re.escape(message)):
+        load(tmp_path, "broken.json", json.dumps(definition))
+
+def test_rejected_file_writes_no_snapshot(tmp_path):
+    with pytest.raises(TournamentError):
+        load(tmp_path, "broken.json", json.dumps(without("INFO", "full_name")))
+    snapshots = tmp_path / "snapshots"
+    assert not snapshots.exists() or not list(snapshots.glob("*.snap"))
@@ -0,0 +1,53 @@
+import random
+
+from cogs.utils.queue import PlayerQueue
+
+def test_join_leave_and_order():
+    queue = PlayerQueue()
+    assert queue.add(1, 10.0) and queue.add(2, 11.0) and queue.add(3)
+    assert not queue.add(2)
+    assert queue.remove(2) and not queue.remove(2)
+    assert list(queue) == [1, 3] and len(queue) == 2
+    assert 1 in queue and 2 not in queue
+    assert queue.joined_at(1) == 10.0
+    assert queue.first(1) == [1]
+
+def test_positions_match_a_list_under_churn():
+    rng = random.Random(1)
+    queue = PlayerQueue((i, 0.0) for i in range(5))
+    reference = list(range(5))
+    for _ in range(5000):
+        user_id = rng.randrange(200)
+        if rng.random() < 0.5:
+            if queue.add(user_id):
+                reference.append(user_id)
+        elif queue.remove(user_id):
+            reference.remove(user_id)
+        if rng.random() < 0.002:
+            queue.clear()
+            reference.clear()
+
+        probe = rng.randrange(200)
+        assert queue.position(probe) == (reference.index(probe) + 1 if probe in reference else None)
+    assert list(queue) == reference
+
+def test_every_change_bumps_the_version():
+    queue = PlayerQueue()
+    versions = [queue.version]
+    queue.add(1)
+    versions.append(queue.version)
+    queue.add(1)
+    versions.append(queue.version)
+    queue.remove(1)
+    versions.append(queue.version)
+    queue.clear()
+    versions.append(queue.version)
+    assert versions[1] > versions[0] and versions[2] == versions[1] and versions[4] > versions[3] > versions[2]
+
+def test_dump_and_load():
+    queue = PlayerQueue()
+    queue.add(5, 1.5)
+    queue.add(3, 2.5)
+    loaded = PlayerQueue.load(queue.dump())
+    assert loaded.dump() == [[5, 1.5], [3, 2.5]]
+    assert loaded.position(3) == 2
@@ -0,0 +1,124 @@
+from types import SimpleNamespace
+
+from conftest import build_tournament
+from cogs.utils.roles import ORGANIZER_ROLE, RoleIndex
+
+# Stand-ins for the few discord.py attributes the index reads
+def make_role(guild, role_id, name, administrator=False):
+    return SimpleNamespace(id=role_id, name=name, guild=guild, permissions=SimpleNamespace(administrator=administrator))
+
+def make_guild(guild_id=1):
+    guild = SimpleNamespace(id=guild_id, roles=[])
+    guild.roles = [
+        make_role(guild, 101, "[AAA] Alpha Squad"),
+        make_role(guild, 900, "[BBB] Bravo Crew"),
+        make_role(guild, 500, ORGANIZER_ROLE),
+        make_role(guild, 600, "Admins", administrator=True),
+        make_role(guild, 700, "Players"),
+    ]
+    return guild
+
+def make_member(guild, member_id, *role_ids):
+    roles = [role for role in guild.roles if role.id in role_ids]
+    return SimpleNamespace(id=member_id, guild=guild, roles=roles)
+
+def role(guild, role_id):
+    return next(role for role in guild.roles if role.id == role_id)
+
+def test_teams_by_role_id_and_name():
+    guild = make_guild()
+    tournament = build_tournament()
+    index = RoleIndex()
+    alpha = make_member(guild, 1, 101, 700)
+    bravo = make_member(guild, 2, 900)
+
+    assert index.access(alpha, tournament).teams == {"[AAA] Alpha Squad"}
+    # Bravo's role ID in the tournament does not exist, but a role has the team's name
+    assert index.access(bravo, tournament).teams == {"[BBB] Bravo Crew"}
+    assert index.audit(guild, tournament) == ([], ["[BBB] Bravo Crew"])
+    assert index.access(SimpleNamespace(id=3, guild=None), tournament) == (False, frozenset())
+
+def test_organizers():
+    guild = make_guild()
+    index = RoleIndex()
+    assert index.is_admin(make_member(guild, 1, 500))
+    assert index.is_admin(make_member(guild, 2, 600))
+    assert not index.is_admin(make_member(guild, 3, 101, 700))
+
+def test_member_cache_is_bounded():
+    guild = make_guild()
+    index = RoleIndex(max_members=2)
+    members = [make_member(guild, member_id, 700) for member_id in range(3)]
+    for member in members:
+        index.is_admin(member)
+    index.is_admin(members[2])
+    assert (index.hits, index.misses) == (1, 3)
+
+    # Member 0 was evicted, member 1 is still cached
+    index.is_admin(members[1])
+    index.is_admin(members[0])
+    assert (index.hits, index.misses) == (2, 4)
+
+def test_role_change_invalidates_only_its_holders():
+    guild = make_guild()
+    index = RoleIndex()
+    holder = make_member(guild, 1, 700)
+    other = make_member(guild, 2, 101)
+    index.index_guild(guild)
+    assert not index.is_admin(holder)
+    index.is_admin(other)
+
+    before = role(guild, 700)
+    after = make_role(guild, 700, "Players", administrator=True)
+    guild.roles = [after if guild_role is before else guild_role for guild_role in guild.roles]
+    index.role_updated(before, after)
+
+    misses = index.misses
+    assert index.is_admin(holder)
+    index.is_admin(other)
+    assert index.misses == misses + 1
+
+def test_renamed_role_moves_between_teams():
+    guild = make_guild()
+    tournament = build_tournament()
+    index = RoleIndex()
+    index.index_guild(guild)
+    member = make_member(guild, 1, 900)
+    assert index.access(member, tournament).teams == {"[BBB] Bravo Crew"}
+
+    before = role(guild, 900)
+    after = make_role(guild, 900, "Retired")
+    index.role_updated(before, after)
+    member.roles = [after]
+    assert index.access(member, tournament).teams == set()
+    assert index.audit(guild, tournament) == (["[BBB] Bravo Crew"], [])
+
+def test_deleted_role_and_member_updates():
+    guild = make_guild()
+    tournament = build_tournament()
+    index = RoleIndex()
+    index.index_guild(guild)
+    member = make_member(guild, 1, 101)
+    assert index.access(member, tournament).teams == {"[AAA] Alpha Squad"}
+
+    # Without an invalidation the cached access is kept
+    member.roles = []
+    assert index.access(member, tournament).teams == {"[AAA] Alpha Squad"}
+    index.invalidate_member(guild.id, member.id)
+    assert index.access(member, tournament).teams == set()
+
+    member.roles = [role(guild, 101)]
+    index.role_deleted(role(guild, 101))
+    assert index.audit(guild, tournament)[0] == ["[AAA] Alpha Squad"]
+
+def test_forget_guild_drops_its_members():
+    guild = make_guild()
+    other_guild = make_guild(2)
+    index = RoleIndex()
+    index.is_admin(make_member(guild, 1, 700))
+    index.is_admin(make_member(other_guild, 1, 700))
+    index.forget_guild(guild.id)
+
+    index.is_admin(make_member(guild, 1, 700))
+    index.is_admin(make_member(other_guild, 1, 700))
+    assert (index.hits, index.misses) == (1, 3)
@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+from cogs.utils.scheduler import DeadlineScheduler
+from cogs.utils.store import StateStore
+
+def test_deadlines_fire_in_order_and_once():
+    async def main():
+        fired = []
+        done = asyncio.Event()
+
+        async def handler(target):
+            fired.append(target)
+            if len(fired) == 3:
+                done.set()
+
+        scheduler = DeadlineScheduler()
+        scheduler.register("timeout", handler)
+        scheduler.start()
+        scheduler.schedule_in("timeout", "c", 0.06)
+        scheduler.schedule_in("timeout", "a", 0.02)
+        scheduler.schedule_in("timeout", "b", 0.04)
+        await asyncio.wait_for(done.wait(), 2)
+        await asyncio.sleep(0.05)
+        await scheduler.close()
+        assert fired == ["a", "b", "c"]
+        assert len(scheduler) == 0
+
+    asyncio.run(main())
+
+def test_reschedule_and_cancel():
+    async def main():
+        fired = []
+
+        async def handler(target):
+            fired.append((target, time.time()))
+
+        scheduler = DeadlineScheduler()
+        scheduler.register("timeout", handler)
+        scheduler.start()
+        scheduler.schedule_in("timeout", "kept", 0.02)
+        scheduler.schedule_in("timeout", "cancelled", 0.02)
+        scheduler.cancel("timeout", "cancelled")
+        # Rescheduling later supersedes the earlier deadline
+        scheduler.schedule_in("timeout", "kept", 0.1)
+        assert scheduler.get("timeout", "cancelled") is None
+        deadline = scheduler.get("timeout", "kept")
+
+        await asyncio.sleep(0.2)
+        await scheduler.close()
+        assert [target for target, _ in fired] == ["kept"]
+        assert fired[0][1] >= deadline
+
+    asyncio.run(main())
+
+def test_handler_errors_do_not_stop_the_scheduler():
+    async def main():
+        fired = asyncio.Event()
+
+        async def broken(target):
+            raise RuntimeError(target)
+
+        async def handler(target):
+            fired.set()
+
+        scheduler = DeadlineScheduler()
+        scheduler.register("broken", broken)
+        scheduler.register("timeout", handler)
+        scheduler.start()
+        scheduler.schedule_in("broken", 1, 0)
+        scheduler.schedule_in("unregistered", 1, 0)
+        scheduler.schedule_in("timeout", 1, 0.02)
+        await asyncio.wait_for(fired.wait(), 2)
+        await scheduler.close()
+
+    asyncio.run(main())
+
+def test_persistent_deadlines_are_restored(tmp_path):
+    async def main():
+        store = StateStore(tmp_path / "state.db")
+        store.open()
+        scheduler = DeadlineScheduler(store)
+        scheduler.register("timeout", None)
+        scheduler.register("reveal", None, persistent=False)
+        scheduler.schedule("timeout", 1, 100.0)
+        scheduler.schedule("timeout", 2, 200.0)
+        scheduler.schedule("reveal", 3, 300.0)
+        scheduler.cancel("timeout", 2)
+        await store.close()
+
+        store = StateStore(tmp_path / "state.db")
+        store.open()
+        fired = asyncio.Event()
+
+        async def handler(target):
+            fired.set()
+
+        scheduler = DeadlineScheduler(store)
+        scheduler.register("timeout", handler)
+        # The restored deadline is overdue, so it fires straight away
+        scheduler.start()
+        await asyncio.wait_for(fired.wait(), 2)
+        await scheduler.close()
+        assert store.load("deadline") == {}
+        assert scheduler.get("reveal", 3) is None
+        await store.close()
+
+    asyncio.run(main())
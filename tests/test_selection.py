@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+
+from conftest import build_tournament
+from cogs.utils.registry import TournamentRegistry
+from cogs.utils.selection import (
+    BAN, COIN_TOSS, DONE, EITHER, FINAL, FIRST, ORDER, PICK, SECOND, SelectionState, Turn,
+)
+
+TOURNAMENTS_DIR = Path(__file__).resolve().parent.parent / "cogs" / "tournaments"
+
+# Turn tables written out as (action, side): A bans first, B bans second
+A, B = FIRST, SECOND
+O = Turn(ORDER, COIN_TOSS)
+F = Turn(FINAL, EITHER)
+D = Turn(DONE, EITHER)
+
+FORMATS = {
+    # Summer Skirmish style: one ban each, one pick each, decider
+    "bo3_equal_bans": (
+        dict(equal_bans=True, maps_per_match=3, max_bans=1, max_picks=1),
+        (O, Turn(BAN, A), Turn(BAN, B), Turn(PICK, B), Turn(PICK, A), F, D)),
+    # Without equal bans the second team gets one ban less
+    "bo3_unequal_bans": (
+        dict(equal_bans=False, maps_per_match=3, max_bans=2, max_picks=1),
+        (O, Turn(BAN, A), Turn(BAN, B), Turn(BAN, A), Turn(PICK, B), Turn(PICK, A), F, D)),
+    # Every map picked by a team: no decider
+    "bo2_no_decider": (
+        dict(equal_bans=True, maps_per_match=2, max_bans=1, max_picks=1),
+        (O, Turn(BAN, A), Turn(BAN, B), Turn(PICK, B), Turn(PICK, A), D)),
+    "no_bans": (
+        dict(equal_bans=True, maps_per_match=3, max_bans=0, max_picks=1),
+        (O, Turn(PICK, B), Turn(PICK, A), F, D)),
+    # Bans only, the single map is drawn
+    "bo1_decider_only": (
+        dict(equal_bans=True, maps_per_match=1, max_bans=3, max_picks=0),
+        (O, Turn(BAN, A), Turn(BAN, B), Turn(BAN, A), Turn(BAN, B), Turn(BAN, A), Turn(BAN, B), F, D)),
+    "custom_sequences": (
+        dict(equal_bans=True, maps_per_match=2, max_bans=2, max_picks=1, ban_sequence="AABB", pick_sequence="AB"),
+        (O, Turn(BAN, A), Turn(BAN, A), Turn(BAN, B), Turn(BAN, B), Turn(PICK, A), Turn(PICK, B), D)),
+}
+
+# Play a selection to the end, checking the acting team of every turn and that the state survives
+# a store round trip at each step. Returns the finished state.
+def walk(tournament, first_to_ban_index=1):
+    team1, team2 = list(tournament.teams)[:2]
+    selection_state = SelectionState.start(tournament, team1, team2, team1, match_id=7, started_at=1.0)
+    assert selection_state.phase == ORDER
+    assert selection_state.acting_team == team1
+
+    selection_state.set_ban_order((team1, team2)[first_to_ban_index])
+    while selection_state.phase != DONE:
+        loaded = SelectionState.load(selection_state.dump(), tournament)
+        assert loaded.dump() == selection_state.dump()
+
+        turn = selection_state.current
+        map_key = next(iter(selection_state.remaining_maps))
+        if turn.action == BAN:
+            assert selection_state.acting_team == selection_state.ban_order[turn.side]
+            selection_state.ban(map_key)
+        elif turn.action == PICK:
+            assert selection_state.acting_team == selection_state.ban_order[turn.side]
+            selection_state.pick(map_key)
+        else:
+            assert turn.action == FINAL
+            assert selection_state.acting_team is None
+            selection_state.decide(map_key)
+
+    assert selection_state.next is None
+    return selection_state
+
+@pytest.mark.parametrize("format_name", FORMATS)
+def test_compiled_turn_table(format_name):
+    options, turns = FORMATS[format_name]
+    assert build_tournament(**options).turns == turns
+
+@pytest.mark.parametrize("format_name", FORMATS)
+def test_walk_to_completion(format_name):
+    options, turns = FORMATS[format_name]
+    tournament = build_tournament(**options)
+    selection_state = walk(tournament)
+
+    bans = [turn for turn in turns if turn.action == BAN]
+    picks = [turn for turn in turns if turn.action == PICK]
+    assert len(selection_state.bans) == len(bans)
+    assert len(selection_state.picks) == len(picks)
+    assert (selection_state.random_map is not None) == (F in turns)
+    assert len(selection_state.remaining_maps) == len(tournament.maps) - len(bans) - len(picks)
+    assert selection_state.teams_for(BAN) == [selection_state.ban_order[turn.side] for turn in bans]
+    assert selection_state.teams_for(PICK) == [selection_state.ban_order[turn.side] for turn in picks]
+    assert selection_state.after(PICK) and not selection_state.before(DONE)
+
+def test_ban_order_follows_the_choice(tournament):
+    for first_to_ban_index in (0, 1):
+        selection_state = walk(tournament, first_to_ban_index)
+        team1, team2 = selection_state.teams
+        first = (team1, team2)[first_to_ban_index]
+        assert selection_state.ban_order == (first, team2 if first == team1 else team1)
+        assert selection_state.teams_for(BAN)[0] == first
+
+def test_phase_checks_before_match():
+    selection_state = SelectionState()
+    assert selection_state.phase is None
+    assert selection_state.before(ORDER) and selection_state.before(DONE)
+    assert not selection_state.after(ORDER)
+
+def test_load_rejects_turn_outside_format(tournament):
+    selection_state = walk(tournament)
+    data = selection_state.dump()
+    shorter = build_tournament(maps_per_match=2)
+    assert SelectionState.load(data, shorter) is None
+
+def test_shipped_tournaments_play_to_completion(tmp_path):
+    registry = TournamentRegistry(TOURNAMENTS_DIR, tmp_path)
+    assert registry.entries
+    for key in registry.entries:
+        walk(registry.get(key))
@@ -0,0 +1,94 @@
+import asyncio
+import sqlite3
+
+from cogs.utils.store import StateStore
+
+def open_store(tmp_path) -> StateStore:
+    store = StateStore(tmp_path / "state.db")
+    store.open()
+    return store
+
+def test_values_survive_reopen(tmp_path):
+    async def main():
+        store = open_store(tmp_path)
+        store.put("channels", 1, {"phase": "ban"})
+        store.put("channels", 2, [1, 2])
+        store.put("queues", 1, [])
+        store.delete("channels", 2)
+        await store.close()
+
+        store = open_store(tmp_path)
+        assert store.load("channels") == {1: {"phase": "ban"}}
+        assert store.load("queues") == {1: []}
+        await store.close()
+
+    asyncio.run(main())
+
+def test_load_includes_pending_writes(tmp_path):
+    async def main():
+        store = open_store(tmp_path)
+        store.put("channels", 1, "flushed")
+        store.put("channels", 2, "deleted")
+        await store.flush()
+        store.put("channels", 1, "pending")
+        store.delete("channels", 2)
+        store.put("channels", 3, lambda: "deferred")
+        assert store.load("channels") == {1: "pending", 3: "deferred"}
+        await store.close()
+
+    asyncio.run(main())
+
+def test_values_are_serialized_when_put_and_callables_at_flush(tmp_path):
+    async def main():
+        store = open_store(tmp_path)
+        value = [1]
+        queue = [1]
+        store.put("state", "copied", value)
+        store.put("state", "deferred", lambda: queue)
+        value.append(2)
+        queue.append(2)
+        await store.close()
+
+        store = open_store(tmp_path)
+        assert store.load("state") == {"copied": [1], "deferred": [1, 2]}
+        await store.close()
+
+    asyncio.run(main())
+
+def test_concurrent_flushes_keep_the_last_write(tmp_path):
+    async def main():
+        store = open_store(tmp_path)
+        flushes = []
+        for i in range(20):
+            store.put("state", "key", i)
+            flushes.append(asyncio.create_task(store.flush()))
+        await asyncio.gather(*flushes)
+        await store.close()
+
+        store = open_store(tmp_path)
+        assert store.load("state") == {"key": 19}
+        await store.close()
+
+    asyncio.run(main())
+
+def test_failed_batch_is_retried_behind_newer_writes(tmp_path):
+    async def main():
+        store = open_store(tmp_path)
+        apply = store._apply
+
+        def fail(batch):
+            store._apply = apply
+            raise sqlite3.OperationalError("disk I/O error")
+
+        store._apply = fail
+        store.put("state", "old", 1)
+        store.put("state", "both", "old")
+        await store.flush()
+        store.put("state", "both", "new")
+        await store.close()
+
+        store = open_store(tmp_path)
+        assert store.load("state") == {"old": 1, "both": "new"}
+        await store.close()
+
+    asyncio.run(main())